@@ -3,15 +3,29 @@ Main simulation entry point for ABM digital governance framework
 """
 import os
 import json
+import random
 import logging
-from typing import Dict, Any, List, Optional
+import datetime
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Optional, Union, Callable
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
 
 # Import simulation components
-from simulation.agent import create_agents
+from simulation.agent import DecisionCache, ResponseCache, create_agents, decide_batch
 from simulation.environment import Environment
-from simulation.interaction import InteractionEngine
+from simulation.interaction import Interaction, InteractionEngine
 from simulation.policy_engine import PolicyEngine
-from simulation.logger import SimulationLogger, create_logger
+from simulation.semantic_cache import SemanticCache
+from simulation.logger import SimulationLogger, RecordStream, RoundRecord, create_logger
 from metrics import (
     calculate_efficiency,
     calculate_fairness,
@@ -19,6 +33,9 @@ from metrics import (
     calculate_agent_status,
     calculate_collaboration
 )
+from metrics.collaboration import CollaborationAccumulator
+from metrics.efficiency import interactions_to_array
+from metrics.fairness import RESIDENT_DTYPE
 
 # Setup logging
 logging.basicConfig(
@@ -28,27 +45,84 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+CONFIG_FILES = (
+    'config/agents.json',
+    'config/environments.json',
+    'config/rules.json',
+    'config/policies.json'
+)
+
+# Per-round state fields snapshotted for each agent group (field -> default)
+RESIDENT_TRACKED_FIELDS = {'satisfaction': 3.0, 'service_usage_frequency': 5}
+ENTERPRISE_TRACKED_FIELDS = {'innovation_level': 50, 'market_share': 0.1}
+
+# Default layout for save_results; compact unless started with --pretty
+PRETTY_JSON_OUTPUT = False
+
+
+def load_json_file(path: str) -> Any:
+    """
+    Parse a JSON file, using orjson when it is installed
+    
+    Args:
+        path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON content
+    """
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a JSON configuration file
+    
+    The modification time is part of the cache key, so an edited file is
+    re-read on the next call while unchanged files are parsed only once.
+    
+    Args:
+        path: Path to the JSON file
+        mtime_ns: File modification time in nanoseconds
+        
+    Returns:
+        Parsed configuration dictionary (shared, treat as read-only)
+    """
+    return load_json_file(path)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize round records, interactions and NumPy values the JSON encoders do not handle natively"""
+    if isinstance(obj, (RoundRecord, Interaction)):
+        return obj.to_dict()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def load_config() -> tuple:
     """
     Load configuration files
     
+    Parsed files are cached across calls, so repeated ``run_simulation``
+    invocations do not re-read unchanged configs. The returned dicts are
+    shared references; consumers (Environment, PolicyEngine, agents,
+    InteractionEngine) copy what they mutate.
+    
     Returns:
         Tuple of (agents_config, env_config, rules_config, policies_config)
     """
     try:
-        with open('config/agents.json', 'r', encoding='utf-8') as f:
-            agents_config = json.load(f)
-        
-        with open('config/environments.json', 'r', encoding='utf-8') as f:
-            env_config = json.load(f)
-        
-        with open('config/rules.json', 'r', encoding='utf-8') as f:
-            rules_config = json.load(f)
-        
-        with open('config/policies.json', 'r', encoding='utf-8') as f:
-            policies_config = json.load(f)
-        
-        return agents_config, env_config, rules_config, policies_config
+        return tuple(
+            _load_json_cached(path, os.stat(path).st_mtime_ns)
+            for path in CONFIG_FILES
+        )
     
     except FileNotFoundError as e:
         logger.error(f"Configuration file not found: {e}")
@@ -65,7 +139,15 @@ def run_simulation(
     num_enterprises: int = 10,
     num_residents: int = 100,
     enable_logging: bool = True,
-    log_file: str = None
+    log_file: str = None,
+    log_verbosity: str = 'decision',
+    stream_records: bool = False,
+    batch_llm: bool = False,
+    cache_decisions: bool = False,
+    concurrent_llm: bool = False,
+    cache_prompts: bool = False,
+    semantic_cache: bool = False,
+    seed: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Run ABM simulation for specified city
@@ -78,6 +160,24 @@ def run_simulation(
         num_residents: Number of resident agents to create
         enable_logging: Whether to enable dynamic logging
         log_file: Custom log file name
+        log_verbosity: Detail of the dynamic log: 'round', 'interaction'
+            or 'decision' (everything)
+        stream_records: Write each round record to an NDJSON file in output/
+            (named after log_file or the city, plus a timestamp and a unique
+            suffix) instead of keeping all rounds in memory
+        batch_llm: Batch enterprise and resident LLM calls into a few
+            requests per round instead of one request per agent
+        cache_decisions: Reuse an agent's earlier decision when its state
+            and the environment context are unchanged
+        concurrent_llm: Issue the enterprise and resident LLM calls of a
+            round concurrently instead of one after another
+        cache_prompts: Reuse the LLM response for byte-identical prompts
+            across agents of the same type
+        semantic_cache: Also reuse responses of near-identical prompts by
+            embedding similarity (requires sentence-transformers)
+        seed: Seed for a reproducible run; seeds the ``random`` module and
+            the environment and interaction generators. When None the
+            generators are seeded from the current ``random`` state
         
     Returns:
         Dictionary containing simulation results and metrics
@@ -91,14 +191,20 @@ def run_simulation(
     if city not in env_config:
         raise ValueError(f"Unknown city: {city}. Available cities: {list(env_config.keys())}")
     
+    # Seed all random streams of the run from one value
+    env_seed = engine_seed = None
+    if seed is not None:
+        random.seed(seed)
+        env_seed, engine_seed = np.random.SeedSequence(seed).generate_state(2).tolist()
+    
     # Initialize environment
-    env = Environment(env_config[city])
+    env = Environment(env_config[city], seed=env_seed)
     logger.info(f"Environment initialized for {city}")
     
     # Initialize dynamic logger
     sim_logger = None
     if enable_logging:
-        sim_logger = create_logger(city, log_file)
+        sim_logger = create_logger(city, log_file, log_verbosity)
 
     # Create agents
     agents = create_agents(agents_config, city, num_enterprises, num_residents)
@@ -124,79 +230,117 @@ def run_simulation(
         logger.info(f"Applied policy interventions: {policy_interventions}")
     
     # Initialize interaction engine
-    interaction_engine = InteractionEngine(rules_config)
+    interaction_engine = InteractionEngine(rules_config, seed=engine_seed)
     
     # Simulation records storage
-    simulation_records = []
+    if stream_records:
+        # Unique per run, so a later or concurrent run of the same city does
+        # not truncate the file behind an earlier result's raw_records
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        records_name = f"{log_file or city}_raw_{stamp}_{uuid.uuid4().hex[:8]}.ndjson"
+        simulation_records = RecordStream(os.path.join('output', records_name))
+    else:
+        simulation_records = []
+    
+    # Preallocated per-round snapshots of the tracked numeric agent state;
+    # agent state dicts are mutated in place, so records cannot hold them
+    res_fields = tuple(RESIDENT_TRACKED_FIELDS.items())
+    ent_fields = tuple(ENTERPRISE_TRACKED_FIELDS.items())
+    res_field_names = tuple(RESIDENT_TRACKED_FIELDS)
+    ent_field_names = tuple(ENTERPRISE_TRACKED_FIELDS)
+    res_history = np.empty((num_rounds, len(residents), len(res_fields)), dtype=np.float32)
+    ent_history = np.empty((num_rounds, len(enterprises), len(ent_fields)), dtype=np.float32)
+    recorded_rounds = 0
+    
+    # Per-round columnar views of the interactions for the efficiency metrics
+    interaction_chunks = []
+    
+    # Collaboration counters updated as each round is recorded
+    collaboration = CollaborationAccumulator()
+    
+    decision_cache = DecisionCache() if cache_decisions else None
+    
+    response_cache = ResponseCache() if cache_prompts else None
+    similar_cache = SemanticCache() if semantic_cache else None
+    if response_cache or similar_cache:
+        for agent in (government, *enterprises, *residents):
+            agent.response_cache = response_cache
+            agent.semantic_cache = similar_cache
+    
+    # Bind hot lookups once for the round loop
+    log_debug = logger.debug
+    log_err = logger.error
+    log_decision = sim_logger.log_agent_decision if sim_logger and sim_logger.logs_decisions else None
+    log_sim_error = sim_logger.log_error if sim_logger else None
+    get_context = env.get_context
+    process_interactions = interaction_engine.process
+    record_round = simulation_records.append
+    update_collaboration = collaboration.update
     
     # Run simulation rounds
     for round_num in range(num_rounds):
-        logger.debug(f"Running round {round_num + 1}/{num_rounds}")
+        log_debug(f"Running round {round_num + 1}/{num_rounds}")
         
         if sim_logger:
             sim_logger.log_round_start(round_num, agent_counts)
         
         try:
             # Get environment context
-            env_context = env.get_context()
+            env_context = get_context()
             
             # Agent decision making with error handling
-            gov_decision = government.decide(env_context)
-            if sim_logger:
-                sim_logger.log_agent_decision(
+            if decision_cache:
+                gov_decision = decision_cache.decide(government, env_context)
+            else:
+                gov_decision = government.decide(env_context)
+            if log_decision:
+                log_decision(
                     round_num, 'government', 'gov_0', gov_decision,
-                    is_fallback='fallback' in government.interaction_history[-1] if government.interaction_history else False
+                    is_fallback=government._last_is_fallback,
+                    error=government._last_error
                 )
 
-            ent_decisions = []
-            for i, enterprise in enumerate(enterprises):
-                try:
-                    decision = enterprise.decide(env_context)
-                    ent_decisions.append(decision)
-                    
-                    if sim_logger:
-                        is_fallback = ('fallback' in enterprise.interaction_history[-1] 
-                                     if enterprise.interaction_history else False)
-                        error_msg = (enterprise.interaction_history[-1].get('error') 
-                                   if enterprise.interaction_history and is_fallback else None)
-                        sim_logger.log_agent_decision(
-                            round_num, 'enterprise', f'ent_{i}', decision,
-                            is_fallback=is_fallback, error=error_msg
-                        )
-                except Exception as e:
-                    logger.error(f"Enterprise {i} decision failed: {e}")
-                    if sim_logger:
-                        sim_logger.log_error(round_num, str(e), "enterprise_decision")
-                    # Use default decision
-                    default_decision = enterprise._get_default_decision()
-                    ent_decisions.append(default_decision)
-
-            res_decisions = []
-            for i, resident in enumerate(residents):
-                try:
-                    decision = resident.decide(env_context)
-                    res_decisions.append(decision)
-                    
-                    # 只记录前10个居民的决策（避免日志过大）
-                    if sim_logger and i < 10:
-                        is_fallback = ('fallback' in resident.interaction_history[-1] 
-                                     if resident.interaction_history else False)
-                        error_msg = (resident.interaction_history[-1].get('error') 
-                                   if resident.interaction_history and is_fallback else None)
-                        sim_logger.log_agent_decision(
-                            round_num, 'resident', f'res_{i}', decision,
-                            is_fallback=is_fallback, error=error_msg
-                        )
-                except Exception as e:
-                    logger.error(f"Resident {i} decision failed: {e}")
-                    if sim_logger and i == 0:  # 只记录第一个错误
-                        sim_logger.log_error(round_num, str(e), "resident_decision")
-                    # Use default decision
-                    default_decision = resident._get_default_decision()
-                    res_decisions.append(default_decision)
+            ent_decisions, ent_errors = decide_batch(
+                enterprises, env_context, batch_llm, decision_cache, concurrent_llm
+            )
+            for i, e in ent_errors:
+                log_err(f"Enterprise {i} decision failed: {e}")
+                if log_sim_error:
+                    log_sim_error(round_num, str(e), "enterprise_decision")
+            
+            if log_decision:
+                failed = {i for i, _ in ent_errors}
+                for i, (enterprise, decision) in enumerate(zip(enterprises, ent_decisions)):
+                    if i in failed:
+                        continue
+                    log_decision(
+                        round_num, 'enterprise', f'ent_{i}', decision,
+                        is_fallback=enterprise._last_is_fallback,
+                        error=enterprise._last_error
+                    )
+
+            res_decisions, res_errors = decide_batch(
+                residents, env_context, batch_llm, decision_cache, concurrent_llm
+            )
+            for i, e in res_errors:
+                log_err(f"Resident {i} decision failed: {e}")
+                if log_sim_error and i == 0:  # 只记录第一个错误
+                    log_sim_error(round_num, str(e), "resident_decision")
+            
+            # 只记录前10个居民的决策（避免日志过大）
+            if log_decision:
+                failed = {i for i, _ in res_errors}
+                for i, (resident, decision) in enumerate(islice(zip(residents, res_decisions), 10)):
+                    if i in failed:
+                        continue
+                    log_decision(
+                        round_num, 'resident', f'res_{i}', decision,
+                        is_fallback=resident._last_is_fallback,
+                        error=resident._last_error
+                    )
             
             # Process interactions
-            interactions = interaction_engine.process(
+            interactions = process_interactions(
                 government, enterprises, residents,
                 gov_decision, ent_decisions, res_decisions
             )
@@ -206,28 +350,34 @@ def run_simulation(
             
             # Update environment
             env.update(interactions)
+            env_state = env.get_state()
             
             if sim_logger:
-                sim_logger.log_environment_update(round_num, env.get_state())
+                sim_logger.log_environment_update(round_num, env_state)
             
             # Record round data
-            round_record = {
-                'round': round_num,
-                'interactions': interactions,
-                'environment': env.get_state(),
-                'agents': {
-                    'government': government.state,
-                    'enterprises': [e.state for e in enterprises],
-                    'residents': [r.state for r in residents]
-                },
-                'decisions_sample': { # Store sample of decisions for quick review
-                    'government': gov_decision,
-                    'enterprises': ent_decisions[:5],  # Store sample for performance
-                    'residents': res_decisions[:10]   # Store sample for performance
-                }
-            }
-            
-            simulation_records.append(round_record)
+            res_history[recorded_rounds] = [
+                [r.state.get(k, d) for k, d in res_fields] for r in residents
+            ]
+            ent_history[recorded_rounds] = [
+                [e.state.get(k, d) for k, d in ent_fields] for e in enterprises
+            ]
+            round_record = RoundRecord(
+                round=round_num,
+                interactions=interactions,
+                env_state=env_state,
+                gov_state=government.state.copy(),
+                ent_states=ent_history[recorded_rounds],
+                res_states=res_history[recorded_rounds],
+                ent_fields=ent_field_names,
+                res_fields=res_field_names,
+                # Store sample of decisions for quick review
+                decisions_sample=(gov_decision, ent_decisions[:5], res_decisions[:10])
+            )
+            record_round(round_record)
+            update_collaboration(round_record)
+            interaction_chunks.append(interactions_to_array(interactions))
+            recorded_rounds += 1
             
             if sim_logger:
                 sim_logger.log_round_complete(round_num)
@@ -235,6 +385,8 @@ def run_simulation(
             # Log progress every 10 rounds
             if (round_num + 1) % 10 == 0:
                 logger.info(f"Completed round {round_num + 1}/{num_rounds}")
+                if decision_cache:
+                    logger.info(f"Decision cache hit rate: {decision_cache.stats()['hit_rate']:.1%}")
                 if sim_logger:
                     status = sim_logger.get_current_status()
                     logger.info(f"当前状态: {status['summary']}")
@@ -250,11 +402,40 @@ def run_simulation(
                 sim_logger.log_error(round_num, str(e), "simulation_round")
             continue
     
+    if stream_records:
+        simulation_records.close()
+    
+    if decision_cache:
+        cache_stats = decision_cache.stats()
+        logger.info(f"Decision cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                    f"({cache_stats['hit_rate']:.1%})")
+        if sim_logger:
+            sim_logger.log_decision_cache(cache_stats)
+    
+    if response_cache:
+        cache_stats = response_cache.stats()
+        logger.info(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                    f"({cache_stats['hit_rate']:.1%})")
+    if similar_cache:
+        cache_stats = similar_cache.stats()
+        logger.info(f"Semantic cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                    f"({cache_stats['hit_rate']:.1%})")
+    
+    agent_history = {
+        'resident_fields': list(RESIDENT_TRACKED_FIELDS),
+        'enterprise_fields': list(ENTERPRISE_TRACKED_FIELDS),
+        'residents': res_history[:recorded_rounds],
+        'enterprises': ent_history[:recorded_rounds]
+    }
+    
     logger.info("Simulation rounds completed, calculating metrics...")
     
     # Calculate evaluation metrics
     try:
-        metrics = calculate_metrics(simulation_records, government, enterprises, residents)
+        metrics = calculate_metrics(
+            simulation_records, government, enterprises, residents, agent_history,
+            interaction_chunks, collaboration
+        )
         logger.info("Metrics calculation completed")
         
         if sim_logger:
@@ -264,6 +445,7 @@ def run_simulation(
         metrics = {}
         if sim_logger:
             sim_logger.log_error(-1, str(e), "metrics_calculation")
+            sim_logger.close()
     
     # Compile results
     results = {
@@ -271,7 +453,8 @@ def run_simulation(
         'num_rounds': num_rounds,
         'policy_interventions': policy_interventions or [],
         'metrics': metrics,
-        'raw_records': simulation_records # Keep raw records for detailed analysis
+        'raw_records': simulation_records, # Keep raw records for detailed analysis
+        'agent_history': agent_history
     }
     
     logger.info(f"Simulation completed for {city}")
@@ -281,50 +464,76 @@ def run_simulation(
 
 
 def calculate_metrics(
-    simulation_records: List[Dict[str, Any]],
+    simulation_records: Union[List[Dict[str, Any]], RecordStream, str],
     government: Any,
     enterprises: List[Any],
-    residents: List[Any]
+    residents: List[Any],
+    agent_history: Optional[Dict[str, Any]] = None,
+    interaction_chunks: Optional[List[np.ndarray]] = None,
+    collaboration: Optional[CollaborationAccumulator] = None
 ) -> Dict[str, Any]:
     """
     Calculate all evaluation metrics
     
     Args:
-        simulation_records: List of simulation records
+        simulation_records: List of simulation records, a RecordStream, or
+            the path of an NDJSON records file
         government: Government agent
         enterprises: List of enterprise agents
         residents: List of resident agents
+        agent_history: Per-round agent state snapshots from run_simulation
+        interaction_chunks: Per-round INTERACTION_DTYPE arrays from
+            run_simulation; rebuilt from the records when omitted
+        collaboration: Accumulator already fed every record by
+            run_simulation; the records are re-scanned when omitted
         
     Returns:
         Dictionary containing all calculated metrics
     """
+    if isinstance(simulation_records, str):
+        simulation_records = RecordStream(simulation_records, mode='r')
+    
     # Extract interaction records for efficiency calculation
-    all_interactions = []
-    for record in simulation_records:
-        all_interactions.extend(record.get('interactions', []))
+    if interaction_chunks:
+        all_interactions = np.concatenate(interaction_chunks)
+    else:
+        all_interactions = []
+        for record in simulation_records:
+            all_interactions.extend(record.get('interactions', []))
+    
+    # Agent state snapshots shared by the fairness and agent status metrics
+    enterprise_states = [e.get_state() for e in enterprises]
+    resident_states = [r.get_state() for r in residents]
     
     # Extract resident data for fairness calculation
-    resident_data = []
-    for resident in residents:
-        resident_state = resident.get_state()
-        resident_data.append({
-            'area': getattr(resident, 'area', 'core_area'),
-            'digital_access': resident_state['state'].get('digital_access', True),
-            'service_usage_frequency': resident_state['state'].get('service_usage_frequency', 5),
-            'satisfaction': resident_state['state'].get('satisfaction', 3.0),
-            'income_level': resident_state['attributes'].get('income_level', 5000)
-        })
+    resident_data = np.fromiter((
+        (
+            getattr(resident, 'area', 'core_area'),
+            resident_state['state'].get('digital_access', True),
+            resident_state['state'].get('service_usage_frequency', 5),
+            resident_state['state'].get('satisfaction', 3.0),
+            resident_state['attributes'].get('income_level', 5000)
+        )
+        for resident, resident_state in zip(residents, resident_states)
+    ), dtype=RESIDENT_DTYPE, count=len(residents))
     
     # Calculate individual metric categories
     efficiency_metrics = calculate_efficiency(all_interactions)
     fairness_metrics = calculate_fairness(resident_data)
-    resilience_metrics = calculate_resilience(simulation_records)
+    resident_satisfaction = None
+    if agent_history is not None:
+        column = agent_history['resident_fields'].index('satisfaction')
+        resident_satisfaction = agent_history['residents'][:, :, column]
+    resilience_metrics = calculate_resilience(simulation_records, resident_satisfaction)
     agent_status_metrics = calculate_agent_status(
         government.get_state(), 
-        [e.get_state() for e in enterprises],
-        [r.get_state() for r in residents]
+        enterprise_states,
+        resident_states
     )
-    collaboration_metrics = calculate_collaboration(simulation_records)
+    if collaboration is not None:
+        collaboration_metrics = collaboration.metrics()
+    else:
+        collaboration_metrics = calculate_collaboration(simulation_records)
     
     return {
         'efficiency': efficiency_metrics,
@@ -335,12 +544,43 @@ def calculate_metrics(
     }
 
 
-def compare_cities(policy_interventions: Optional[List[str]] = None) -> Dict[str, Any]:
+def run_simulations_parallel(
+    jobs: Dict[str, Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    initializer: Optional[Callable[[], Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run independent simulations concurrently in worker processes
+    
+    Args:
+        jobs: Mapping of job name to ``run_simulation`` keyword arguments
+        max_workers: Number of worker processes (defaults to one per job)
+        initializer: Optional callable run once in each worker before any
+            job, e.g. to patch agent decisions for offline runs
+        
+    Returns:
+        Mapping of job name to simulation results
+    """
+    with ProcessPoolExecutor(max_workers=max_workers or len(jobs), initializer=initializer) as executor:
+        futures = {
+            name: executor.submit(run_simulation, **kwargs)
+            for name, kwargs in jobs.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def compare_cities(
+    policy_interventions: Optional[List[str]] = None,
+    parallel: bool = True,
+    num_rounds: int = 100
+) -> Dict[str, Any]:
     """
     Compare simulation results between Beijing and Shenzhen
     
     Args:
         policy_interventions: Policy interventions to apply to both cities
+        parallel: Run the two city simulations in separate processes
+        num_rounds: Number of simulation rounds per city
         
     Returns:
         Comparison results
@@ -348,39 +588,75 @@ def compare_cities(policy_interventions: Optional[List[str]] = None) -> Dict[str
     logger.info("Starting city comparison simulation")
     
     # Run simulations for both cities
-    beijing_results = run_simulation('beijing', policy_interventions)
-    shenzhen_results = run_simulation('shenzhen', policy_interventions)
+    jobs = {
+        city: {
+            'city': city,
+            'policy_interventions': policy_interventions,
+            'num_rounds': num_rounds
+        }
+        for city in ('beijing', 'shenzhen')
+    }
+    if parallel:
+        city_results = run_simulations_parallel(jobs)
+    else:
+        city_results = {name: run_simulation(**kwargs) for name, kwargs in jobs.items()}
+    
+    comparison = build_comparison(city_results['beijing'], city_results['shenzhen'])
+    
+    logger.info("City comparison completed")
+    return comparison
+
+
+def build_comparison(
+    beijing_results: Dict[str, Any],
+    shenzhen_results: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Build the comparison summary for a pair of city simulation results
     
-    # Calculate comparison metrics
-    comparison = {
+    Args:
+        beijing_results: Beijing simulation results
+        shenzhen_results: Shenzhen simulation results
+        
+    Returns:
+        Comparison results
+    """
+    beijing_efficiency = beijing_results['metrics']['efficiency']
+    shenzhen_efficiency = shenzhen_results['metrics']['efficiency']
+    beijing_fairness = beijing_results['metrics']['fairness']
+    shenzhen_fairness = shenzhen_results['metrics']['fairness']
+    
+    return {
         'beijing': beijing_results,
         'shenzhen': shenzhen_results,
         'comparison_summary': {
             'efficiency_comparison': {
-                'beijing_avg_response_time': beijing_results['metrics']['efficiency']['avg_response_time'],
-                'shenzhen_avg_response_time': shenzhen_results['metrics']['efficiency']['avg_response_time'],
-                'efficiency_winner': 'beijing' if beijing_results['metrics']['efficiency']['avg_response_time'] < shenzhen_results['metrics']['efficiency']['avg_response_time'] else 'shenzhen'
+                'beijing_avg_response_time': beijing_efficiency['avg_response_time'],
+                'shenzhen_avg_response_time': shenzhen_efficiency['avg_response_time'],
+                'efficiency_winner': 'beijing' if beijing_efficiency['avg_response_time'] < shenzhen_efficiency['avg_response_time'] else 'shenzhen'
             },
             'fairness_comparison': {
-                'beijing_gini': beijing_results['metrics']['fairness']['service_access_gini'],
-                'shenzhen_gini': shenzhen_results['metrics']['fairness']['service_access_gini'],
-                'fairness_winner': 'beijing' if beijing_results['metrics']['fairness']['service_access_gini'] < shenzhen_results['metrics']['fairness']['service_access_gini'] else 'shenzhen'
+                'beijing_gini': beijing_fairness['service_access_gini'],
+                'shenzhen_gini': shenzhen_fairness['service_access_gini'],
+                'fairness_winner': 'beijing' if beijing_fairness['service_access_gini'] < shenzhen_fairness['service_access_gini'] else 'shenzhen'
             }
         }
     }
-    
-    logger.info("City comparison completed")
-    return comparison
 
 
-def save_results(results: Dict[str, Any], filename: str):
+def save_results(results: Dict[str, Any], filename: str, indent: Optional[bool] = None):
     """
     Save simulation results to JSON file
     
     Args:
         results: Simulation results dictionary
         filename: Output filename
+        indent: Write indented JSON for human inspection; compact JSON
+            otherwise (defaults to PRETTY_JSON_OUTPUT)
     """
+    if indent is None:
+        indent = PRETTY_JSON_OUTPUT
+    
     try:
         # Create output directory if it doesn't exist
         os.makedirs('output', exist_ok=True)
@@ -389,10 +665,26 @@ def save_results(results: Dict[str, Any], filename: str):
         output_results = results.copy()
         if 'raw_records' in output_results:
             output_results['raw_records'] = f"Excluded {len(output_results['raw_records'])} records for file size"
+        if 'agent_history' in output_results:
+            history = output_results['agent_history']
+            output_results['agent_history'] = {
+                'resident_fields': history['resident_fields'],
+                'enterprise_fields': history['enterprise_fields'],
+                'residents_shape': list(history['residents'].shape),
+                'enterprises_shape': list(history['enterprises'].shape)
+            }
         
         filepath = f'output/{filename}'
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_results, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(output_results, default=_json_default, option=option))
+        else:
+            layout = {'indent': 2} if indent else {'separators': (',', ':')}
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(output_results, f, ensure_ascii=False, default=_json_default, **layout)
         
         logger.info(f"Results saved to {filepath}")
     except Exception as e:
@@ -494,29 +786,10 @@ def run_city_comparison_interactive():
     rounds = int(input("请输入模拟轮次 (默认20): ") or "20")
     
     try:
-        print("正在运行北京模拟...")
-        beijing_results = run_simulation('beijing', num_rounds=rounds)
-        
-        print("正在运行深圳模拟...")
-        shenzhen_results = run_simulation('shenzhen', num_rounds=rounds)
-        
-        # 对比分析
-        comparison = {
-            'beijing': beijing_results,
-            'shenzhen': shenzhen_results,
-            'comparison_summary': {
-                'efficiency_comparison': {
-                    'beijing_avg_response_time': beijing_results['metrics']['efficiency']['avg_response_time'],
-                    'shenzhen_avg_response_time': shenzhen_results['metrics']['efficiency']['avg_response_time'],
-                    'efficiency_winner': 'beijing' if beijing_results['metrics']['efficiency']['avg_response_time'] < shenzhen_results['metrics']['efficiency']['avg_response_time'] else 'shenzhen'
-                },
-                'fairness_comparison': {
-                    'beijing_gini': beijing_results['metrics']['fairness']['service_access_gini'],
-                    'shenzhen_gini': shenzhen_results['metrics']['fairness']['service_access_gini'],
-                    'fairness_winner': 'beijing' if beijing_results['metrics']['fairness']['service_access_gini'] < shenzhen_results['metrics']['fairness']['service_access_gini'] else 'shenzhen'
-                }
-            }
-        }
+        print("正在并行运行北京、深圳模拟...")
+        comparison = compare_cities(num_rounds=rounds)
+        beijing_results = comparison['beijing']
+        shenzhen_results = comparison['shenzhen']
         
         print("✅ 城市对比分析完成")
         print(f"\n📊 对比结果:")
@@ -614,41 +887,57 @@ def run_policy_intervention_interactive():
         print(f"❌ 政策干预模拟失败: {e}")
 
 
+def _print_summary(name: str, results: Dict[str, Any]):
+    """打印单次模拟的关键指标（只格式化标量，不输出完整的指标字典）"""
+    metrics = results.get('metrics') or {}
+    efficiency = metrics.get('efficiency', {})
+    fairness = metrics.get('fairness', {})
+    print(f"\n=== {name} ===")
+    print(f"- 治理效率: 平均响应时间 {efficiency.get('avg_response_time', 0.0):.3f}, "
+          f"解决率 {efficiency.get('resolution_rate', 0.0):.3f}")
+    print(f"- 治理公平: 服务可及基尼系数 {fairness.get('service_access_gini', 0.0):.3f}, "
+          f"数字鸿沟指数 {fairness.get('digital_divide_index', 0.0):.3f}")
+
+
 def run_all_simulations():
     """运行所有城市的完整模拟"""
     print("\n🚀 开始运行全自动模拟...")
     
     try:
-        # Run Beijing simulation
-        print("\n=== 运行北京模拟 ===")
-        beijing_metrics = run_simulation('beijing')
-        print("北京模拟结果:")
-        print(f"- 治理效率: {beijing_metrics['metrics']['efficiency']}")
-        print(f"- 治理公平: {beijing_metrics['metrics']['fairness']}")
-        save_results(beijing_metrics, 'beijing_simulation_results.json')
-        
-        # Run Shenzhen simulation
-        print("\n=== 运行深圳模拟 ===")
-        shenzhen_metrics = run_simulation('shenzhen')
-        print("深圳模拟结果:")
-        print(f"- 治理效率: {shenzhen_metrics['metrics']['efficiency']}")
-        print(f"- 治理公平: {shenzhen_metrics['metrics']['fairness']}")
-        save_results(shenzhen_metrics, 'shenzhen_simulation_results.json')
-        
-        # Run policy intervention simulation (Shenzhen + digital literacy training)
-        print("\n=== 运行政策干预模拟 ===")
-        shenzhen_policy_metrics = run_simulation(
-            'shenzhen',
-            policy_interventions=['digital_literacy_training']
-        )
-        print("深圳政策干预结果:")
-        print(f"- 治理效率: {shenzhen_policy_metrics['metrics']['efficiency']}")
-        print(f"- 治理公平: {shenzhen_policy_metrics['metrics']['fairness']}")
-        save_results(shenzhen_policy_metrics, 'shenzhen_policy_intervention_results.json')
-        
-        # City comparison
+        # 三个模拟相互独立，并行运行（各自使用独立的日志文件）
+        print("\n=== 并行运行北京、深圳及政策干预模拟 ===")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        all_results = run_simulations_parallel({
+            'beijing': {
+                'city': 'beijing',
+                'log_file': f"simulation_log_beijing_{timestamp}"
+            },
+            'shenzhen': {
+                'city': 'shenzhen',
+                'log_file': f"simulation_log_shenzhen_{timestamp}"
+            },
+            'shenzhen_policy': {
+                'city': 'shenzhen',
+                'policy_interventions': ['digital_literacy_training'],
+                'log_file': f"simulation_log_shenzhen_policy_{timestamp}"
+            }
+        })
+        beijing_metrics = all_results['beijing']
+        shenzhen_metrics = all_results['shenzhen']
+        shenzhen_policy_metrics = all_results['shenzhen_policy']
+        
+        for title, results, filename in (
+            ('北京模拟', beijing_metrics, 'beijing_simulation_results.json'),
+            ('深圳模拟', shenzhen_metrics, 'shenzhen_simulation_results.json'),
+            # Policy intervention simulation (Shenzhen + digital literacy training)
+            ('深圳政策干预', shenzhen_policy_metrics, 'shenzhen_policy_intervention_results.json')
+        ):
+            _print_summary(title, results)
+            save_results(results, filename)
+        
+        # City comparison (reuses the two baseline runs above)
         print("\n=== 城市对比分析 ===")
-        comparison_results = compare_cities()
+        comparison_results = build_comparison(beijing_metrics, shenzhen_metrics)
         print("对比结果:")
         print(f"- 效率优势: {comparison_results['comparison_summary']['efficiency_comparison']['efficiency_winner']}")
         print(f"- 公平优势: {comparison_results['comparison_summary']['fairness_comparison']['fairness_winner']}")
@@ -670,7 +959,11 @@ if __name__ == '__main__':
         logger.warning("ZAI_API_KEY environment variable not set. Using placeholder.")
     
     # 检查命令行参数
-    if len(sys.argv) > 1 and sys.argv[1] == '--auto':
+    if '--pretty' in sys.argv[1:]:
+        # 输出缩进格式的结果文件，便于人工查看
+        PRETTY_JSON_OUTPUT = True
+    
+    if '--auto' in sys.argv[1:]:
         # 自动运行所有模拟（原有功能）
         run_all_simulations()
     else:
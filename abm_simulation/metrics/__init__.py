@@ -1,17 +1,40 @@
 """
 Metrics module for evaluating digital governance simulation
+
+Metric calculators are imported lazily on first access (PEP 562), so
+importing the package does not load every submodule up front.
 """
+import importlib
 
-from .efficiency import calculate_efficiency
-from .fairness import calculate_fairness
-from .resilience import calculate_resilience
-from .agent_status import calculate_agent_status
-from .collaboration import calculate_collaboration
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    'calculate_efficiency': 'efficiency',
+    'calculate_fairness': 'fairness',
+    'calculate_resilience': 'resilience',
+    'calculate_agent_status': 'agent_status',
+    'calculate_collaboration': 'collaboration',
+    'compute_all_metrics_batch': 'parallel'
+}
 
 __all__ = [
     'calculate_efficiency',
-    'calculate_fairness', 
+    'calculate_fairness',
     'calculate_resilience',
     'calculate_agent_status',
-    'calculate_collaboration'
-]
\ No newline at end of file
+    'calculate_collaboration',
+    'compute_all_metrics_batch'
+]
+
+
+def __getattr__(name):
+    """Import a metric calculator on first access and cache it"""
+    submodule = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{submodule}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,41 @@
+"""
+Ahead-of-time build of the resilience kernels
+
+Compiles fused_metrics into the ``_resilience_c`` extension module next to
+this file, so demo runs do not pay the JIT compilation cost on first use.
+_resilience_kernels imports the extension when it has been built and falls
+back to the JIT kernel otherwise.
+
+Usage (from the abm_simulation directory):
+    python -m metrics._build_aot
+
+Note: numba.pycc is deprecated upstream; the JIT fallback keeps working
+once it is removed.
+"""
+import os
+
+from numba.pycc import CC
+
+from ._resilience_kernels import fused_metrics
+
+# (service_levels, satisfaction_levels, interaction_counts, success_counts,
+#  recovery_times) -> (recovery, disruption, adaptive, stability)
+FUSED_METRICS_SIGNATURE = 'UniTuple(f8, 4)(f8[:], f8[:], i8[:], i8[:], f8[:])'
+
+
+def build(output_dir: str = None) -> None:
+    """
+    Compile the resilience kernels into the _resilience_c extension
+
+    Args:
+        output_dir: Directory for the built module (defaults to this package)
+    """
+    cc = CC('_resilience_c')
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.verbose = True
+    cc.export('fused_metrics', FUSED_METRICS_SIGNATURE)(fused_metrics.py_func)
+    cc.compile()
+
+
+if __name__ == '__main__':
+    build()
@@ -0,0 +1,124 @@
+"""
+Compiled reduction kernels for the resilience metrics
+"""
+try:
+    from numba import njit
+except ImportError:  # optional: the kernels run as plain Python without numba
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _clamp01(x):
+    """Clamp a normalized score to [0, 1]"""
+    return 0.0 if x < 0.0 else (1.0 if x > 1.0 else x)
+
+
+@njit(cache=True)
+def _variance(values):
+    """Population variance, two-pass for numerical stability"""
+    n = values.size
+    if n < 2:
+        return 0.0
+    total = 0.0
+    for i in range(n):
+        total += values[i]
+    mean = total / n
+    squares = 0.0
+    for i in range(n):
+        delta = values[i] - mean
+        squares += delta * delta
+    return squares / n
+
+
+@njit(cache=True)
+def _period_efficiency(interaction_counts, success_counts, start, end):
+    """Mean success ratio over the rounds in [start, end) that had interactions"""
+    total = 0.0
+    active = 0
+    for i in range(start, end):
+        if interaction_counts[i] > 0:
+            total += success_counts[i] / interaction_counts[i]
+            active += 1
+    if active == 0:
+        return 0.0
+    return total / active
+
+
+@njit(cache=True)
+def recovery_speed(recovery_times):
+    """System recovery speed: inverse of the average recovery time, 0-1 scale"""
+    if recovery_times.size == 0:
+        return 0.8  # No emergencies occurred, assume good resilience
+    total = 0.0
+    for i in range(recovery_times.size):
+        total += recovery_times[i]
+    max_recovery_time = 10.0  # Assume max recovery time is 10 rounds
+    return _clamp01(1.0 - (total / recovery_times.size) / max_recovery_time)
+
+
+@njit(cache=True)
+def disruption_rate(service_levels):
+    """Share of rounds with service availability below 0.8"""
+    n = service_levels.size
+    if n == 0:
+        return 0.0
+    disrupted = 0
+    for i in range(n):
+        if service_levels[i] < 0.8:
+            disrupted += 1
+    return disrupted / n
+
+
+@njit(cache=True)
+def adaptive_capacity(interaction_counts, success_counts):
+    """Efficiency improvement from the first to the last third of the rounds"""
+    n = interaction_counts.size
+    if n < 10:
+        return 0.5  # Default value for short simulations
+    early = _period_efficiency(interaction_counts, success_counts, 0, n // 3)
+    late = _period_efficiency(interaction_counts, success_counts, n - (n + 2) // 3, n)
+    return _clamp01(0.5 + late - early)
+
+
+@njit(cache=True)
+def stability_index(service_levels, satisfaction_levels):
+    """Inverse of the averaged service and satisfaction variances"""
+    if service_levels.size < 2:
+        return 1.0
+    total_variance = (_variance(service_levels) + _variance(satisfaction_levels)) / 2
+    return _clamp01(1.0 - total_variance * 10)
+
+
+@njit(cache=True)
+def fused_metrics(service_levels, satisfaction_levels, interaction_counts,
+                  success_counts, recovery_times):
+    """
+    Compute all four resilience indicators from the per-round arrays
+    
+    Args:
+        service_levels: Per-round service availability
+        satisfaction_levels: Per-round normalized resident satisfaction
+        interaction_counts: Per-round number of interactions
+        success_counts: Per-round number of successful interactions
+        recovery_times: Recovery times of all emergency responses
+    
+    Returns:
+        Tuple of (recovery speed, disruption rate, adaptive capacity,
+        stability index)
+    """
+    return (
+        recovery_speed(recovery_times),
+        disruption_rate(service_levels),
+        adaptive_capacity(interaction_counts, success_counts),
+        stability_index(service_levels, satisfaction_levels)
+    )
+
+
+# Prefer the ahead-of-time build (see _build_aot) to skip JIT warm-up
+try:
+    from ._resilience_c import fused_metrics  # noqa: F811
+except ImportError:
+    pass
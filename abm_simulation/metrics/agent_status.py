@@ -1,9 +1,19 @@
 """
 Agent status metrics calculation
 """
+from functools import lru_cache
+
 import numpy as np
 from typing import List, Dict, Any, Union
 
+try:
+    from numba import njit
+except ImportError:  # optional: the kernel runs as plain Python without numba
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 
 def calculate_agent_status(
     government: Dict[str, Any], 
@@ -35,6 +45,56 @@ def calculate_agent_status(
     }
 
 
+def _residents_to_arrays(residents: List[Dict[str, Any]]):
+    """
+    Extract resident fields into contiguous arrays in a single pass
+    
+    Args:
+        residents: List of resident agents
+        
+    Returns:
+        Tuple of (satisfaction, trust, digital_access, usage_frequency) arrays
+    """
+    n = len(residents)
+    satisfaction = np.empty(n, dtype=np.float64)
+    trust = np.empty(n, dtype=np.float64)
+    digital = np.empty(n, dtype=np.bool_)
+    frequency = np.empty(n, dtype=np.float64)
+    
+    for i, r in enumerate(residents):
+        get = r.get
+        satisfaction[i] = get('satisfaction', 3.0)
+        trust[i] = get('trust_in_government', 50.0)
+        digital[i] = bool(get('digital_access', False))
+        frequency[i] = get('service_usage_frequency', 0)
+    
+    return satisfaction, trust, digital, frequency
+
+
+def _enterprises_to_arrays(enterprises: List[Dict[str, Any]]):
+    """
+    Extract enterprise fields into contiguous arrays in a single pass
+    
+    Args:
+        enterprises: List of enterprise agents
+        
+    Returns:
+        Tuple of (market_share, innovation_level, compliance_rate) arrays
+    """
+    n = len(enterprises)
+    market_shares = np.empty(n, dtype=np.float64)
+    innovation_levels = np.empty(n, dtype=np.float64)
+    compliance_rates = np.empty(n, dtype=np.float64)
+    
+    for i, e in enumerate(enterprises):
+        get = e.get
+        market_shares[i] = get('market_share', 0.1)
+        innovation_levels[i] = get('innovation_level', 50.0)
+        compliance_rates[i] = get('data_usage_compliance', 90.0)
+    
+    return market_shares, innovation_levels, compliance_rates
+
+
 def calculate_resident_metrics(residents: List[Dict[str, Any]]) -> Dict[str, float]:
     """
     Calculate resident-related metrics
@@ -54,26 +114,17 @@ def calculate_resident_metrics(residents: List[Dict[str, Any]]) -> Dict[str, flo
             'digital_adoption_rate': 0.0
         }
     
-    # Extract satisfaction and trust scores
-    satisfaction_scores = [
-        r.get('satisfaction', 3.0) for r in residents
-    ]
-    trust_scores = [
-        r.get('trust_in_government', 50.0) for r in residents
-    ]
+    # Extract satisfaction, trust and usage in one pass
+    satisfaction_scores, trust_scores, digital_access, usage_frequency = _residents_to_arrays(residents)
     
     # Calculate digital adoption
-    digital_users = [
-        r for r in residents 
-        if r.get('digital_access', False) and r.get('service_usage_frequency', 0) > 2
-    ]
-    digital_adoption_rate = len(digital_users) / len(residents)
+    digital_adoption_rate = (digital_access & (usage_frequency > 2)).mean()
     
     return {
-        'avg_satisfaction': float(np.mean(satisfaction_scores)),
-        'avg_trust': float(np.mean(trust_scores)),
-        'satisfaction_std': float(np.std(satisfaction_scores)),
-        'trust_std': float(np.std(trust_scores)),
+        'avg_satisfaction': float(satisfaction_scores.mean()),
+        'avg_trust': float(trust_scores.mean()),
+        'satisfaction_std': float(satisfaction_scores.std()),
+        'trust_std': float(trust_scores.std()),
         'digital_adoption_rate': float(digital_adoption_rate)
     }
 
@@ -97,23 +148,15 @@ def calculate_enterprise_metrics(enterprises: List[Dict[str, Any]]) -> Dict[str,
         }
     
     # Extract enterprise metrics
-    market_shares = [
-        e.get('market_share', 0.1) for e in enterprises
-    ]
-    innovation_levels = [
-        e.get('innovation_level', 50.0) for e in enterprises
-    ]
-    compliance_rates = [
-        e.get('data_usage_compliance', 90.0) for e in enterprises
-    ]
+    market_shares, innovation_levels, compliance_rates = _enterprises_to_arrays(enterprises)
     
     # Calculate market concentration (Herfindahl index)
     market_concentration = calculate_herfindahl_index(market_shares)
     
     return {
-        'avg_market_share': float(np.mean(market_shares)),
-        'avg_innovation_level': float(np.mean(innovation_levels)),
-        'avg_compliance_rate': float(np.mean(compliance_rates)),
+        'avg_market_share': float(market_shares.mean()),
+        'avg_innovation_level': float(innovation_levels.mean()),
+        'avg_compliance_rate': float(compliance_rates.mean()),
         'market_concentration': float(market_concentration)
     }
 
@@ -150,29 +193,30 @@ def calculate_government_metrics(government: Dict[str, Any]) -> Dict[str, float]
     }
 
 
-def calculate_herfindahl_index(market_shares: List[float]) -> float:
+def calculate_herfindahl_index(market_shares: Union[np.ndarray, List[float]]) -> float:
     """
     Calculate Herfindahl-Hirschman Index for market concentration
     
     Args:
-        market_shares: List of market shares (as decimals)
+        market_shares: Array or list of market shares (as decimals)
         
     Returns:
         HHI value (0-1, higher = more concentrated)
     """
-    if not market_shares:
+    shares = np.array(market_shares, dtype=np.float64)
+    if shares.size == 0:
         return 0.0
     
     # Normalize market shares to sum to 1
-    total_share = sum(market_shares)
+    total_share = shares.sum()
     if total_share == 0:
         return 0.0
     
-    normalized_shares = [share / total_share for share in market_shares]
+    shares /= total_share
     
     # Calculate HHI
-    hhi = sum(share ** 2 for share in normalized_shares)
-    return hhi
+    hhi = np.dot(shares, shares)
+    return float(hhi)
 
 
 def calculate_goal_achievement(government: Dict[str, Any]) -> float:
@@ -185,14 +229,17 @@ def calculate_goal_achievement(government: Dict[str, Any]) -> float:
     Returns:
         Goal achievement rate (0-1)
     """
-    state = government.get('state', {})
     attributes = government.get('attributes', {})
     
-    # Simulate goal achievement based on governance preference and resources
-    governance_preference = attributes.get('governance_preference', 'fairness')
-    financial_resources = attributes.get('financial_resources', 100)
-    technical_capability = attributes.get('technical_capability', 80)
-    
+    # Simulate goal achievement based on resources and capabilities
+    return _goal_achievement_cached(
+        attributes.get('financial_resources', 100),
+        attributes.get('technical_capability', 80)
+    )
+
+
+@lru_cache(maxsize=256)
+def _goal_achievement_cached(financial_resources: float, technical_capability: float) -> float:
     # Base achievement rate depends on resources and capabilities
     base_rate = (financial_resources + technical_capability) / 200
     
@@ -200,9 +247,7 @@ def calculate_goal_achievement(government: Dict[str, Any]) -> float:
     # This is a simplified calculation
     policy_alignment = 0.8  # Assume good policy alignment
     
-    goal_achievement = min(1.0, base_rate * policy_alignment)
-    
-    return goal_achievement
+    return min(1.0, base_rate * policy_alignment)
 
 
 def calculate_policy_effectiveness(government: Dict[str, Any]) -> float:
@@ -216,13 +261,21 @@ def calculate_policy_effectiveness(government: Dict[str, Any]) -> float:
         Policy effectiveness score (0-1)
     """
     attributes = government.get('attributes', {})
-    state = government.get('state', {})
     
     # Policy effectiveness based on multiple factors
-    policy_toolkit_size = len(attributes.get('policy_toolkit', []))
-    information_transparency = attributes.get('information_transparency', 70)
-    platform_regulation = attributes.get('platform_regulation', 90)
-    
+    return _policy_effectiveness_cached(
+        len(attributes.get('policy_toolkit', [])),
+        attributes.get('information_transparency', 70),
+        attributes.get('platform_regulation', 90)
+    )
+
+
+@lru_cache(maxsize=256)
+def _policy_effectiveness_cached(
+    policy_toolkit_size: int,
+    information_transparency: float,
+    platform_regulation: float
+) -> float:
     # Normalize and combine factors
     toolkit_score = min(1.0, policy_toolkit_size / 5)  # Assume max 5 tools
     transparency_score = information_transparency / 100
@@ -254,31 +307,39 @@ def calculate_overall_status(
     Returns:
         Overall status indicators
     """
-    # System health score (weighted average of key metrics)
-    system_health = (
-        resident_metrics.get('avg_satisfaction', 0.0) / 5 * 0.3 +  # Normalize to 0-1
-        enterprise_metrics.get('avg_innovation_level', 0.0) / 100 * 0.3 +
-        government_metrics.get('goal_achievement_rate', 0.0) * 0.4
-    )
-    
-    # Stakeholder balance (low variance = better balance)
-    stakeholder_scores = [
-        resident_metrics.get('avg_satisfaction', 0.0) / 5,
-        enterprise_metrics.get('avg_innovation_level', 0.0) / 100,
-        government_metrics.get('goal_achievement_rate', 0.0)
-    ]
-    
-    stakeholder_balance = 1.0 - min(1.0, np.std(stakeholder_scores))
-    
-    # Sustainability indicator
-    sustainability = (
-        government_metrics.get('resource_utilization', 0.0) * 0.4 +
-        enterprise_metrics.get('avg_compliance_rate', 0.0) / 100 * 0.3 +
-        resident_metrics.get('digital_adoption_rate', 0.0) * 0.3
+    # All inputs are scalars, so the arithmetic runs in one compiled call
+    system_health, stakeholder_balance, sustainability = _overall(
+        float(resident_metrics.get('avg_satisfaction', 0.0)),
+        float(enterprise_metrics.get('avg_innovation_level', 0.0)),
+        float(government_metrics.get('goal_achievement_rate', 0.0)),
+        float(government_metrics.get('resource_utilization', 0.0)),
+        float(enterprise_metrics.get('avg_compliance_rate', 0.0)),
+        float(resident_metrics.get('digital_adoption_rate', 0.0))
     )
     
     return {
         'system_health': float(system_health),
         'stakeholder_balance': float(stakeholder_balance),
         'sustainability': float(sustainability)
-    }
\ No newline at end of file
+    }
+
+
+@njit(cache=True)
+def _overall(satisfaction, innovation, goal, utilization, compliance, adoption):
+    """System health, stakeholder balance and sustainability from scalar metrics"""
+    # System health score (weighted average of key metrics, normalized to 0-1)
+    system_health = satisfaction / 5 * 0.3 + innovation / 100 * 0.3 + goal * 0.4
+    
+    # Stakeholder balance (low variance = better balance); population std
+    # of the three normalized scores
+    s0 = satisfaction / 5
+    s1 = innovation / 100
+    s2 = goal
+    mean = (s0 + s1 + s2) / 3.0
+    std = (((s0 - mean) ** 2 + (s1 - mean) ** 2 + (s2 - mean) ** 2) / 3.0) ** 0.5
+    stakeholder_balance = 1.0 - min(1.0, std)
+    
+    # Sustainability indicator
+    sustainability = utilization * 0.4 + compliance / 100 * 0.3 + adoption * 0.3
+    
+    return system_health, stakeholder_balance, sustainability
@@ -1,14 +1,247 @@
 """
 Governance collaboration metrics calculation
 """
+from enum import IntFlag
+
 import numpy as np
 from typing import List, Dict, Any
 
+class Outcome(IntFlag):
+    """Outcome classes; one outcome string may belong to several"""
+    SUCCESS = 1
+    PARTIAL = 2
+    NEUTRAL = 4
+    FAILED = 8
+    CONFLICT = 16
+
+
+class IType(IntFlag):
+    """Interaction type classes; one type string may belong to several"""
+    SHARING = 1
+    JOINT = 2
+    COOPERATIVE = 4
+    REGULATION = 8
+
+
+# String -> class bitmask, looked up once per interaction (0 = unclassified)
+_OUTCOME_CODES = {
+    'success': int(Outcome.SUCCESS),
+    'mutual_benefit': int(Outcome.SUCCESS),
+    'win_win': int(Outcome.SUCCESS),
+    'partial_success': int(Outcome.PARTIAL),
+    'compromise': int(Outcome.PARTIAL),
+    'neutral': int(Outcome.NEUTRAL),
+    'no_change': int(Outcome.NEUTRAL),
+    'failed': int(Outcome.FAILED),
+    'conflict': int(Outcome.FAILED | Outcome.CONFLICT),
+    'disagreement': int(Outcome.CONFLICT),
+    'failed_negotiation': int(Outcome.CONFLICT)
+}
+_TYPE_CODES = {
+    'data_sharing': int(IType.SHARING | IType.COOPERATIVE),
+    'information_exchange': int(IType.SHARING),
+    'coordination': int(IType.SHARING),
+    'joint_project': int(IType.JOINT | IType.COOPERATIVE),
+    'collaborative_service': int(IType.JOINT),
+    'multi_agency_response': int(IType.JOINT),
+    'partnership': int(IType.JOINT | IType.COOPERATIVE),
+    'collaboration': int(IType.COOPERATIVE),
+    'mutual_support': int(IType.COOPERATIVE),
+    'regulation': int(IType.REGULATION)
+}
+
+
+def _outcome_score(code: int) -> float:
+    """Cooperation score of an outcome class bitmask"""
+    if code & Outcome.SUCCESS:
+        return 1.0
+    if code & Outcome.PARTIAL:
+        return 0.7
+    if code & Outcome.NEUTRAL:
+        return 0.5
+    if code & Outcome.FAILED:
+        return 0.1
+    return 0.5
+
+
+# Cooperation score per outcome code, plain and with the cooperative-type bonus
+_SCORE_LUT = [_outcome_score(code) for code in range(2 * Outcome.CONFLICT)]
+_COOP_SCORE_LUT = [min(1.0, score + 0.2) for score in _SCORE_LUT]
+
+# Plain-int masks for the hot loop (IntFlag operators are slow)
+_SUCCESS = int(Outcome.SUCCESS)
+_CONFLICT = int(Outcome.CONFLICT)
+_SHARING = int(IType.SHARING)
+_JOINT = int(IType.JOINT)
+_COOPERATIVE = int(IType.COOPERATIVE)
+_REGULATION = int(IType.REGULATION)
+
+# Starting side of the trust adjacency matrix
+_INITIAL_AGENT_CAPACITY = 64
+
+
+class CollaborationAccumulator:
+    """
+    Streaming collaboration counters, updated one round record at a time
+    
+    Feeding records as the simulation produces them avoids re-scanning the
+    whole history each time the metrics are needed.
+    """
+    __slots__ = ('sharing', 'joint', 'conflicts', 'total_int', 'rounds',
+                 'coop_sum', 'coop_count', 'agent_ids', 'trust_adj')
+    
+    def __init__(self):
+        self.sharing = 0
+        self.joint = 0
+        self.conflicts = 0
+        self.total_int = 0
+        self.rounds = 0
+        self.coop_sum = 0.0
+        self.coop_count = 0
+        # Trust network: agent -> row/column index into a boolean adjacency
+        # matrix that doubles in size when full
+        self.agent_ids: Dict[Any, int] = {}
+        self.trust_adj = np.zeros((_INITIAL_AGENT_CAPACITY, _INITIAL_AGENT_CAPACITY), dtype=np.bool_)
+    
+    def update(self, record: Dict[str, Any]) -> None:
+        """
+        Add one simulation round record to the counters
+        
+        Args:
+            record: Simulation round record
+        """
+        interactions = record.get('interactions', [])
+        self.rounds += 1
+        self.total_int += len(interactions)
+        self.coop_count += 1
+        
+        if not interactions:
+            self.coop_sum += 0.5  # Neutral score
+            return
+        
+        sharing = 0
+        joint = 0
+        conflicts = 0
+        round_score = 0.0
+        agent_ids = self.agent_ids
+        agent_id = self._agent_id
+        outcome_codes = _OUTCOME_CODES
+        type_codes = _TYPE_CODES
+        
+        for interaction in interactions:
+            get = interaction.get
+            type_code = type_codes.get(get('type', ''), 0)
+            outcome_code = outcome_codes.get(get('outcome', 'neutral'), 0)
+            participants = get('participants', [])
+            
+            # Information sharing
+            if type_code & _SHARING:
+                sharing += 1
+            
+            # Multi-agent collaborative actions
+            if type_code & _JOINT and len(participants) > 1:
+                joint += 1
+            
+            # Conflictual interactions, including regulatory conflicts
+            if outcome_code & _CONFLICT:
+                conflicts += 1
+            if type_code & _REGULATION and get('compliance', True) == False:
+                conflicts += 1
+            
+            # Cooperation score based on outcome, with a bonus for
+            # cooperative interaction types
+            if type_code & _COOPERATIVE:
+                round_score += _COOP_SCORE_LUT[outcome_code]
+            else:
+                round_score += _SCORE_LUT[outcome_code]
+            
+            # Trust network: every participant is a node, positive
+            # two-party outcomes add a bidirectional edge
+            for participant in participants:
+                if participant not in agent_ids:
+                    agent_id(participant)
+            if outcome_code & _SUCCESS and len(participants) == 2:
+                i = agent_ids[participants[0]]
+                j = agent_ids[participants[1]]
+                adjacency = self.trust_adj
+                adjacency[i, j] = True
+                adjacency[j, i] = True
+        
+        self.sharing += sharing
+        self.joint += joint
+        self.conflicts += conflicts
+        # Average cooperation score for this round
+        self.coop_sum += round_score / len(interactions)
+    
+    def _agent_id(self, agent: Any) -> int:
+        """Assign the next adjacency index to a newly seen agent"""
+        index = len(self.agent_ids)
+        capacity = self.trust_adj.shape[0]
+        if index == capacity:
+            grown = np.zeros((capacity * 2, capacity * 2), dtype=np.bool_)
+            grown[:capacity, :capacity] = self.trust_adj
+            self.trust_adj = grown
+        self.agent_ids[agent] = index
+        return index
+    
+    def sharing_frequency(self) -> float:
+        # Average sharing events per round
+        return self.sharing / self.rounds if self.rounds > 0 else 0.0
+    
+    def joint_action_rate(self) -> float:
+        return self.joint / self.total_int if self.total_int > 0 else 0.0
+    
+    def conflict_rate(self) -> float:
+        return self.conflicts / self.total_int if self.total_int > 0 else 0.0
+    
+    def cooperation_index(self) -> float:
+        # Overall cooperation index
+        return self.coop_sum / self.coop_count if self.coop_count > 0 else 0.0
+    
+    def trust_network_density(self) -> float:
+        num_agents = len(self.agent_ids)
+        if num_agents < 2:
+            return 0.0
+        
+        # Maximum possible relationships (directed graph)
+        max_relationships = num_agents * (num_agents - 1)
+        
+        # Network density
+        trust_relationships = np.count_nonzero(self.trust_adj[:num_agents, :num_agents])
+        return trust_relationships / max_relationships
+    
+    def metrics(self) -> Dict[str, float]:
+        """
+        Collaboration indicators for the records seen so far
+        
+        Returns:
+            Dictionary containing collaboration metrics
+        """
+        return {
+            'cross_department_sharing_frequency': float(self.sharing_frequency()),
+            'joint_action_rate': float(self.joint_action_rate()),
+            'conflict_rate': float(self.conflict_rate()),
+            'cooperation_index': float(self.cooperation_index()),
+            'trust_network_density': float(self.trust_network_density())
+        }
+
+
+def _accumulate(simulation_records: List[Dict[str, Any]]) -> CollaborationAccumulator:
+    """Feed all records through a fresh accumulator in a single pass"""
+    accumulator = CollaborationAccumulator()
+    update = accumulator.update
+    for record in simulation_records:
+        update(record)
+    return accumulator
+
 
 def calculate_collaboration(simulation_records: List[Dict[str, Any]]) -> Dict[str, float]:
     """
     Calculate governance collaboration indicators
     
+    All indicators are derived from a single pass over the records; use
+    CollaborationAccumulator to update them round by round instead.
+    
     Args:
         simulation_records: List of simulation round records
         
@@ -24,19 +257,7 @@ def calculate_collaboration(simulation_records: List[Dict[str, Any]]) -> Dict[st
             'trust_network_density': 0.0
         }
     
-    sharing_frequency = calculate_information_sharing_frequency(simulation_records)
-    joint_action_rate = calculate_joint_action_rate(simulation_records)
-    conflict_rate = calculate_conflict_rate(simulation_records)
-    cooperation_index = calculate_cooperation_index(simulation_records)
-    trust_density = calculate_trust_network_density(simulation_records)
-    
-    return {
-        'cross_department_sharing_frequency': float(sharing_frequency),
-        'joint_action_rate': float(joint_action_rate),
-        'conflict_rate': float(conflict_rate),
-        'cooperation_index': float(cooperation_index),
-        'trust_network_density': float(trust_density)
-    }
+    return _accumulate(simulation_records).metrics()
 
 
 def calculate_information_sharing_frequency(simulation_records: List[Dict[str, Any]]) -> float:
@@ -51,25 +272,7 @@ def calculate_information_sharing_frequency(simulation_records: List[Dict[str, A
     """
     if not simulation_records:
         return 0.0
-    
-    total_sharing_events = 0
-    total_rounds = len(simulation_records)
-    
-    for record in simulation_records:
-        interactions = record.get('interactions', [])
-        
-        # Count information sharing interactions
-        sharing_events = [
-            i for i in interactions 
-            if i.get('type') in ['data_sharing', 'information_exchange', 'coordination']
-        ]
-        
-        total_sharing_events += len(sharing_events)
-    
-    # Average sharing events per round
-    sharing_frequency = total_sharing_events / total_rounds if total_rounds > 0 else 0.0
-    
-    return sharing_frequency
+    return _accumulate(simulation_records).sharing_frequency()
 
 
 def calculate_joint_action_rate(simulation_records: List[Dict[str, Any]]) -> float:
@@ -84,29 +287,7 @@ def calculate_joint_action_rate(simulation_records: List[Dict[str, Any]]) -> flo
     """
     if not simulation_records:
         return 0.0
-    
-    total_interactions = 0
-    joint_actions = 0
-    
-    for record in simulation_records:
-        interactions = record.get('interactions', [])
-        total_interactions += len(interactions)
-        
-        # Count multi-agent collaborative actions
-        for interaction in interactions:
-            participants = interaction.get('participants', [])
-            if len(participants) > 1:
-                # Check if it's a collaborative action
-                action_type = interaction.get('type', '')
-                if action_type in [
-                    'joint_project', 'collaborative_service', 
-                    'multi_agency_response', 'partnership'
-                ]:
-                    joint_actions += 1
-    
-    joint_action_rate = joint_actions / total_interactions if total_interactions > 0 else 0.0
-    
-    return joint_action_rate
+    return _accumulate(simulation_records).joint_action_rate()
 
 
 def calculate_conflict_rate(simulation_records: List[Dict[str, Any]]) -> float:
@@ -121,28 +302,7 @@ def calculate_conflict_rate(simulation_records: List[Dict[str, Any]]) -> float:
     """
     if not simulation_records:
         return 0.0
-    
-    total_interactions = 0
-    conflicts = 0
-    
-    for record in simulation_records:
-        interactions = record.get('interactions', [])
-        total_interactions += len(interactions)
-        
-        # Count conflictual interactions
-        for interaction in interactions:
-            outcome = interaction.get('outcome', 'neutral')
-            if outcome in ['conflict', 'disagreement', 'failed_negotiation']:
-                conflicts += 1
-            
-            # Also check for regulatory conflicts
-            if (interaction.get('type') == 'regulation' and 
-                interaction.get('compliance', True) == False):
-                conflicts += 1
-    
-    conflict_rate = conflicts / total_interactions if total_interactions > 0 else 0.0
-    
-    return conflict_rate
+    return _accumulate(simulation_records).conflict_rate()
 
 
 def calculate_cooperation_index(simulation_records: List[Dict[str, Any]]) -> float:
@@ -157,52 +317,7 @@ def calculate_cooperation_index(simulation_records: List[Dict[str, Any]]) -> flo
     """
     if not simulation_records:
         return 0.0
-    
-    cooperation_scores = []
-    
-    for record in simulation_records:
-        interactions = record.get('interactions', [])
-        
-        if not interactions:
-            cooperation_scores.append(0.5)  # Neutral score
-            continue
-        
-        # Score each interaction for cooperation level
-        interaction_scores = []
-        
-        for interaction in interactions:
-            outcome = interaction.get('outcome', 'neutral')
-            interaction_type = interaction.get('type', '')
-            
-            # Score based on outcome
-            if outcome in ['success', 'mutual_benefit', 'win_win']:
-                score = 1.0
-            elif outcome in ['partial_success', 'compromise']:
-                score = 0.7
-            elif outcome in ['neutral', 'no_change']:
-                score = 0.5
-            elif outcome in ['conflict', 'failed']:
-                score = 0.1
-            else:
-                score = 0.5
-            
-            # Bonus for cooperative interaction types
-            if interaction_type in [
-                'data_sharing', 'joint_project', 'collaboration',
-                'partnership', 'mutual_support'
-            ]:
-                score = min(1.0, score + 0.2)
-            
-            interaction_scores.append(score)
-        
-        # Average cooperation score for this round
-        round_cooperation = np.mean(interaction_scores)
-        cooperation_scores.append(round_cooperation)
-    
-    # Overall cooperation index
-    cooperation_index = np.mean(cooperation_scores)
-    
-    return cooperation_index
+    return _accumulate(simulation_records).cooperation_index()
 
 
 def calculate_trust_network_density(simulation_records: List[Dict[str, Any]]) -> float:
@@ -217,46 +332,21 @@ def calculate_trust_network_density(simulation_records: List[Dict[str, Any]]) ->
     """
     if not simulation_records:
         return 0.0
-    
-    # Build trust network from interactions
-    trust_relationships = set()
-    all_agents = set()
-    
-    for record in simulation_records:
-        interactions = record.get('interactions', [])
-        
-        for interaction in interactions:
-            participants = interaction.get('participants', [])
-            outcome = interaction.get('outcome', 'neutral')
-            
-            # Add agents to the set
-            for agent in participants:
-                all_agents.add(agent)
-            
-            # Add trust relationships for positive outcomes
-            if (len(participants) == 2 and 
-                outcome in ['success', 'mutual_benefit', 'win_win']):
-                
-                agent1, agent2 = participants[0], participants[1]
-                # Add bidirectional trust relationship
-                trust_relationships.add((agent1, agent2))
-                trust_relationships.add((agent2, agent1))
-    
-    # Calculate network density
-    num_agents = len(all_agents)
-    if num_agents < 2:
-        return 0.0
-    
-    # Maximum possible relationships (directed graph)
-    max_relationships = num_agents * (num_agents - 1)
-    
-    # Actual trust relationships
-    actual_relationships = len(trust_relationships)
-    
-    # Network density
-    density = actual_relationships / max_relationships if max_relationships > 0 else 0.0
-    
-    return density
+    return _accumulate(simulation_records).trust_network_density()
+
+
+class _StakeholderIndex(dict):
+    """Participant id -> stakeholder type index, split from the id on first use"""
+    
+    def __init__(self, stakeholder_types):
+        super().__init__()
+        self._type_index = {agent_type: i for i, agent_type in enumerate(stakeholder_types)}
+        self._other = len(stakeholder_types)
+    
+    def __missing__(self, participant):
+        agent_type = participant.partition('_')[0]  # Assume naming convention
+        idx = self[participant] = self._type_index.get(agent_type, self._other)
+        return idx
 
 
 def calculate_stakeholder_engagement(simulation_records: List[Dict[str, Any]]) -> Dict[str, float]:
@@ -276,37 +366,30 @@ def calculate_stakeholder_engagement(simulation_records: List[Dict[str, Any]]) -
             'resident_engagement': 0.0
         }
     
-    engagement_by_type = {
-        'government': [],
-        'enterprise': [],
-        'resident': []
-    }
+    stakeholder_types = ('government', 'enterprise', 'resident')
+    participant_index = _StakeholderIndex(stakeholder_types)
+    other = len(stakeholder_types)
+    
+    # One row of per-type engagement rates per round
+    round_rates = []
     
     for record in simulation_records:
         interactions = record.get('interactions', [])
         
         # Count active participation by agent type
-        type_counts = {'government': 0, 'enterprise': 0, 'resident': 0}
+        codes = np.fromiter(
+            (participant_index[p] for interaction in interactions
+             for p in interaction.get('participants', [])),
+            dtype=np.intp
+        )
+        type_counts = np.bincount(codes, minlength=other + 1)[:other]
         
-        for interaction in interactions:
-            participants = interaction.get('participants', [])
-            for participant in participants:
-                agent_type = participant.split('_')[0]  # Assume naming convention
-                if agent_type in type_counts:
-                    type_counts[agent_type] += 1
-        
-        # Calculate engagement rates for this round
-        total_interactions = len(interactions)
-        if total_interactions > 0:
-            for agent_type in type_counts:
-                engagement_rate = type_counts[agent_type] / total_interactions
-                engagement_by_type[agent_type].append(engagement_rate)
-        else:
-            for agent_type in type_counts:
-                engagement_by_type[agent_type].append(0.0)
+        # Engagement rates for this round (all zero without interactions)
+        round_rates.append(type_counts / max(len(interactions), 1))
     
     # Calculate average engagement rates
+    mean_rates = np.array(round_rates).mean(axis=0)
     return {
-        f'{agent_type}_engagement': float(np.mean(scores)) if scores else 0.0
-        for agent_type, scores in engagement_by_type.items()
-    }
\ No newline at end of file
+        f'{agent_type}_engagement': float(rate)
+        for agent_type, rate in zip(stakeholder_types, mean_rates)
+    }
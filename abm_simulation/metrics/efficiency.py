@@ -2,20 +2,128 @@
 Governance efficiency metrics calculation
 """
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple, Union
 
 
-def calculate_efficiency(interaction_records: List[Dict[str, Any]]) -> Dict[str, float]:
+# Per-interaction fields consumed by the efficiency metrics
+INTERACTION_DTYPE = np.dtype([
+    ('is_service_request', '?'),
+    ('response_time', 'f8'),
+    ('resolved', '?'),
+    ('active', '?'),
+    ('is_policy_implementation', '?'),
+    ('cost', 'f8')
+])
+
+
+def interactions_to_array(interaction_records: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Convert interaction dictionaries to an INTERACTION_DTYPE structured array
+    
+    Args:
+        interaction_records: List of interaction records
+        
+    Returns:
+        Structured array with one row per interaction
+    """
+    # Rows stream straight into the preallocated array, no intermediate list
+    return np.fromiter((
+        (
+            r.get('type') == 'service_request',
+            r.get('response_time', 1.0),
+            bool(r.get('resolved', False)),
+            r.get('status') == 'active',
+            r.get('type') == 'policy_implementation',
+            r.get('cost', 0.0)
+        )
+        for r in interaction_records
+    ), dtype=INTERACTION_DTYPE, count=len(interaction_records))
+
+
+class _EfficiencyTotals(NamedTuple):
+    """Scalar sums behind the efficiency metrics"""
+    count: int
+    service_requests: int
+    response_time_sum: float
+    resolved: int
+    active: int
+    policy_implementations: int
+    policy_cost_sum: float
+
+
+def _efficiency_totals(interaction_records: Union[np.ndarray, List[Dict[str, Any]]]) -> _EfficiencyTotals:
+    """
+    Gather every efficiency sum in a single traversal
+    
+    Args:
+        interaction_records: INTERACTION_DTYPE array or list of interaction records
+        
+    Returns:
+        Accumulated efficiency totals
+    """
+    if isinstance(interaction_records, np.ndarray):
+        service = interaction_records['is_service_request']
+        policy = interaction_records['is_policy_implementation']
+        return _EfficiencyTotals(
+            len(interaction_records),
+            int(service.sum()),
+            float(interaction_records['response_time'][service].sum()),
+            int(interaction_records['resolved'][service].sum()),
+            int(interaction_records['active'].sum()),
+            int(policy.sum()),
+            float(interaction_records['cost'][policy].sum())
+        )
+    
+    rt_sum = 0.0
+    rt_n = 0
+    resolved = 0
+    active = 0
+    pol_sum = 0.0
+    pol_n = 0
+    for r in interaction_records:
+        get = r.get
+        interaction_type = get('type')
+        if interaction_type == 'service_request':
+            rt_sum += get('response_time', 1.0)
+            rt_n += 1
+            if get('resolved', False):
+                resolved += 1
+        elif interaction_type == 'policy_implementation':
+            pol_sum += get('cost', 0.0)
+            pol_n += 1
+        if get('status') == 'active':
+            active += 1
+    
+    return _EfficiencyTotals(
+        len(interaction_records), rt_n, rt_sum, resolved, active, pol_n, pol_sum
+    )
+
+
+def _resource_usage(totals: _EfficiencyTotals) -> float:
+    # Calculate based on number of active interactions
+    if totals.count == 0:
+        return 0.0
+    return min(totals.active / totals.count, 1.0)
+
+
+def _policy_cost(totals: _EfficiencyTotals) -> float:
+    if totals.policy_implementations == 0:
+        return 0.0
+    return totals.policy_cost_sum / totals.policy_implementations
+
+
+def calculate_efficiency(interaction_records: Union[np.ndarray, List[Dict[str, Any]]]) -> Dict[str, float]:
     """
     Calculate governance efficiency indicators
     
     Args:
-        interaction_records: List of interaction records from simulation
+        interaction_records: INTERACTION_DTYPE structured array, or list of
+            interaction records from simulation
         
     Returns:
         Dictionary containing efficiency metrics
     """
-    if not interaction_records:
+    if not len(interaction_records):
         return {
             'avg_response_time': 0.0,
             'resolution_rate': 0.0,
@@ -23,90 +131,49 @@ def calculate_efficiency(interaction_records: List[Dict[str, Any]]) -> Dict[str,
             'policy_cost': 0.0
         }
     
-    # Filter service request interactions
-    service_requests = [
-        r for r in interaction_records 
-        if r.get('type') == 'service_request'
-    ]
+    totals = _efficiency_totals(interaction_records)
     
-    if not service_requests:
-        response_times = [1.0]  # Default value
-        resolution_rates = [0.5]  # Default value
+    # Service request interactions
+    if totals.service_requests == 0:
+        avg_response_time = 1.0  # Default value
+        resolution_rate = 0.5  # Default value
     else:
-        response_times = [
-            r.get('response_time', 1.0) 
-            for r in service_requests
-        ]
-        resolution_rates = [
-            1.0 if r.get('resolved', False) else 0.0 
-            for r in service_requests
-        ]
-    
-    # Calculate metrics
-    avg_response_time = np.mean(response_times)
-    resolution_rate = np.mean(resolution_rates)
-    resource_utilization = calculate_resource_usage(interaction_records)
-    policy_cost = calculate_policy_implementation_cost(interaction_records)
+        avg_response_time = totals.response_time_sum / totals.service_requests
+        resolution_rate = totals.resolved / totals.service_requests
     
     return {
         'avg_response_time': float(avg_response_time),
         'resolution_rate': float(resolution_rate),
-        'resource_utilization': float(resource_utilization),
-        'policy_cost': float(policy_cost)
+        'resource_utilization': float(_resource_usage(totals)),
+        'policy_cost': float(_policy_cost(totals))
     }
 
 
-def calculate_resource_usage(interaction_records: List[Dict[str, Any]]) -> float:
+def calculate_resource_usage(interaction_records: Union[np.ndarray, List[Dict[str, Any]]]) -> float:
     """
     Calculate resource utilization rate
     
     Args:
-        interaction_records: List of interaction records
+        interaction_records: INTERACTION_DTYPE array or list of interaction records
         
     Returns:
         Resource utilization rate (0-1)
     """
-    if not interaction_records:
+    if not len(interaction_records):
         return 0.0
-    
-    # Calculate based on number of active interactions
-    active_interactions = len([
-        r for r in interaction_records 
-        if r.get('status') == 'active'
-    ])
-    
-    total_capacity = len(interaction_records)
-    if total_capacity == 0:
-        return 0.0
-    
-    utilization = min(active_interactions / total_capacity, 1.0)
-    return utilization
+    return _resource_usage(_efficiency_totals(interaction_records))
 
 
-def calculate_policy_implementation_cost(interaction_records: List[Dict[str, Any]]) -> float:
+def calculate_policy_implementation_cost(interaction_records: Union[np.ndarray, List[Dict[str, Any]]]) -> float:
     """
     Calculate policy implementation cost
     
     Args:
-        interaction_records: List of interaction records
+        interaction_records: INTERACTION_DTYPE array or list of interaction records
         
     Returns:
         Average policy implementation cost
     """
-    if not interaction_records:
+    if not len(interaction_records):
         return 0.0
-    
-    policy_interactions = [
-        r for r in interaction_records 
-        if r.get('type') == 'policy_implementation'
-    ]
-    
-    if not policy_interactions:
-        return 0.0
-    
-    costs = [
-        r.get('cost', 0.0) 
-        for r in policy_interactions
-    ]
-    
-    return float(np.mean(costs)) if costs else 0.0
\ No newline at end of file
+    return float(_policy_cost(_efficiency_totals(interaction_records)))
@@ -2,20 +2,67 @@
 Governance fairness metrics calculation
 """
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
+try:
+    from numba import njit
+except ImportError:  # optional: the kernel runs as plain Python without numba
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
 
-def calculate_fairness(residents: List[Dict[str, Any]]) -> Dict[str, float]:
+
+# Structured layout of the per-resident fields used by the fairness metrics
+RESIDENT_DTYPE = np.dtype([
+    ('area', 'U24'),
+    ('digital_access', '?'),
+    ('service_usage_frequency', 'f4'),
+    ('satisfaction', 'f4'),
+    ('income_level', 'f4')
+])
+
+AREAS = ('core_area', 'urban_rural_fringe', 'rural')
+_AREA_IDX = {area: i for i, area in enumerate(AREAS)}
+
+# Above this many values calculate_gini switches to the compiled kernel
+_SMALL_GINI_SIZE = 16
+
+
+def residents_to_array(residents: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Convert resident dictionaries to a RESIDENT_DTYPE structured array
+    
+    Args:
+        residents: List of resident dictionaries
+        
+    Returns:
+        Structured array with one row per resident
+    """
+    return np.fromiter((
+        (
+            r.get('area', 'core_area'),
+            bool(r.get('digital_access', False)),
+            r.get('service_usage_frequency', 0),
+            r.get('satisfaction', 3.0),
+            r.get('income_level', 0)
+        )
+        for r in residents
+    ), dtype=RESIDENT_DTYPE, count=len(residents))
+
+
+def calculate_fairness(residents: Union[np.ndarray, List[Dict[str, Any]]]) -> Dict[str, float]:
     """
     Calculate governance fairness indicators
     
     Args:
-        residents: List of resident agents with their attributes
+        residents: RESIDENT_DTYPE structured array, or list of resident
+            dictionaries with their attributes
         
     Returns:
         Dictionary containing fairness metrics
     """
-    if not residents:
+    if not len(residents):
         return {
             'service_access_gini': 0.0,
             'usage_depth_gini': 0.0,
@@ -23,51 +70,27 @@ def calculate_fairness(residents: List[Dict[str, Any]]) -> Dict[str, float]:
             'digital_divide_index': 0.0
         }
     
-    # Group residents by area
-    area_groups = {}
-    for resident in residents:
-        area = resident.get('area', 'core_area')
-        if area not in area_groups:
-            area_groups[area] = []
-        area_groups[area].append(resident)
-    
-    # Calculate access and usage metrics by area
-    access_gaps = []
-    usage_gaps = []
-    satisfaction_scores = []
-    
-    areas = ['core_area', 'urban_rural_fringe', 'rural']
+    if not isinstance(residents, np.ndarray):
+        residents = residents_to_array(residents)
+    
+    # Area id per resident; residents outside AREAS go to an overflow bucket
+    area_column = residents['area']
+    num_areas = len(AREAS)
+    area_ids = np.full(len(residents), num_areas, dtype=np.intp)
+    for area, idx in _AREA_IDX.items():
+        area_ids[area_column == area] = idx
+    
+    # Grouped sums and counts in one bincount per column
+    counts = np.bincount(area_ids, minlength=num_areas + 1)[:num_areas]
+    sums = np.stack([
+        np.bincount(area_ids, weights=residents[field], minlength=num_areas + 1)[:num_areas]
+        for field in ('digital_access', 'service_usage_frequency', 'satisfaction')
+    ])
     
-    for area in areas:
-        area_residents = area_groups.get(area, [])
-        
-        if area_residents:
-            # Digital access rate
-            access_rate = np.mean([
-                1.0 if r.get('digital_access', False) else 0.0 
-                for r in area_residents
-            ])
-            
-            # Service usage depth
-            usage_depth = np.mean([
-                r.get('service_usage_frequency', 0) 
-                for r in area_residents
-            ])
-            
-            # Satisfaction scores
-            satisfaction = np.mean([
-                r.get('satisfaction', 3.0) 
-                for r in area_residents
-            ])
-            
-            access_gaps.append(access_rate)
-            usage_gaps.append(usage_depth)
-            satisfaction_scores.append(satisfaction)
-        else:
-            # Default values for areas with no residents
-            access_gaps.append(0.0)
-            usage_gaps.append(0.0)
-            satisfaction_scores.append(0.0)
+    # Digital access rate, service usage depth and satisfaction per area;
+    # areas with no residents default to 0
+    means = np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+    access_gaps, usage_gaps, satisfaction_scores = means
     
     # Calculate Gini coefficients
     service_access_gini = calculate_gini(access_gaps)
@@ -85,68 +108,105 @@ def calculate_fairness(residents: List[Dict[str, Any]]) -> Dict[str, float]:
     }
 
 
-def calculate_gini(values: List[float]) -> float:
+@njit(cache=True)
+def _gini_numba(values: np.ndarray) -> float:
+    """Sort, cumulative sum and Gini formula fused into a single loop"""
+    n = values.size
+    if n < 2:
+        return 0.0
+    
+    # Remove negative values and sort
+    values = np.sort(np.maximum(values, 0.0))
+    
+    if values[0] == values[-1]:
+        return 0.0  # Perfect equality
+    
+    cumulative = 0.0
+    weighted = 0.0
+    for i in range(n):
+        cumulative += values[i]
+        weighted += cumulative
+    
+    if cumulative == 0.0:
+        return 0.0
+    
+    gini = (n + 1 - 2.0 * weighted / cumulative) / n
+    return max(0.0, min(1.0, gini))
+
+
+def calculate_gini(values: Union[np.ndarray, List[float]]) -> float:
     """
     Calculate Gini coefficient
     
     Args:
-        values: List of values to calculate Gini coefficient for
+        values: Values to calculate Gini coefficient for
         
     Returns:
         Gini coefficient (0 = perfect equality, 1 = perfect inequality)
     """
-    if not values or len(values) < 2:
+    if len(values) < 2:
         return 0.0
     
-    # Remove negative values and sort
-    values = sorted([max(0, v) for v in values])
+    if len(values) > _SMALL_GINI_SIZE:
+        return float(_gini_numba(np.asarray(values, dtype=np.float64)))
+    
+    # Few values (e.g. one per area): plain Python beats array dispatch
+    values = sorted(max(float(v), 0.0) for v in values)
     n = len(values)
     
-    if all(v == values[0] for v in values):
+    if values[0] == values[-1]:
         return 0.0  # Perfect equality
     
-    # Calculate Gini coefficient
-    cumsum = np.cumsum(values)
-    total = cumsum[-1]
+    cumulative = 0.0
+    weighted = 0.0
+    for value in values:
+        cumulative += value
+        weighted += cumulative
     
-    if total == 0:
+    if cumulative == 0.0:
         return 0.0
     
-    gini = (n + 1 - 2 * np.sum(cumsum) / total) / n
+    gini = (n + 1 - 2.0 * weighted / cumulative) / n
     return max(0.0, min(1.0, gini))
 
 
-def calculate_digital_divide(residents: List[Dict[str, Any]]) -> float:
+def calculate_digital_divide(residents: Union[np.ndarray, List[Dict[str, Any]]]) -> float:
     """
     Calculate digital divide index
     
     Args:
-        residents: List of resident agents
+        residents: RESIDENT_DTYPE structured array or list of resident dictionaries
         
     Returns:
         Digital divide index (higher = more divided)
     """
-    if not residents:
+    if not len(residents):
         return 0.0
     
+    if isinstance(residents, np.ndarray):
+        income = residents['income_level']
+        access = residents['digital_access']
+    else:
+        # Only the two columns needed here, filled in one pass
+        n = len(residents)
+        income = np.empty(n, dtype=np.float32)
+        access = np.empty(n, dtype=np.bool_)
+        for i, r in enumerate(residents):
+            get = r.get
+            income[i] = get('income_level', 0)
+            access[i] = bool(get('digital_access', False))
+    
     # Group by income level
-    high_income = [r for r in residents if r.get('income_level', 0) > 6000]
-    low_income = [r for r in residents if r.get('income_level', 0) <= 6000]
+    high_income = income > 6000
+    low_income = ~high_income
     
-    if not high_income or not low_income:
+    if not (high_income.any() and low_income.any()):
         return 0.0
     
     # Calculate digital access rates
-    high_income_access = np.mean([
-        1.0 if r.get('digital_access', False) else 0.0 
-        for r in high_income
-    ])
-    
-    low_income_access = np.mean([
-        1.0 if r.get('digital_access', False) else 0.0 
-        for r in low_income
-    ])
+    high_income_access = access[high_income].mean(dtype=np.float64)
+    low_income_access = access[low_income].mean(dtype=np.float64)
     
     # Digital divide is the difference in access rates
     divide = abs(high_income_access - low_income_access)
-    return float(divide)
\ No newline at end of file
+    return float(divide)
@@ -0,0 +1,66 @@
+"""
+Concurrent metric calculation for ensembles of independent simulation replicas
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from .agent_status import calculate_agent_status
+from .collaboration import calculate_collaboration
+from .efficiency import calculate_efficiency
+from .fairness import calculate_fairness
+from .resilience import calculate_resilience
+
+
+def _compute_one(replica: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Calculate every metric category for one replica
+    
+    Args:
+        replica: Replica data with 'records' (simulation round records),
+            'government' (state dict), 'enterprises' and 'residents'
+            (lists of state dicts)
+    
+    Returns:
+        Dictionary of metric categories, keyed like calculate_metrics
+    """
+    records = replica.get('records', [])
+    residents = replica.get('residents', [])
+    
+    interactions = []
+    for record in records:
+        interactions.extend(record.get('interactions', []))
+    
+    return {
+        'efficiency': calculate_efficiency(interactions),
+        'fairness': calculate_fairness(residents),
+        'resilience': calculate_resilience(records),
+        'agent_status': calculate_agent_status(
+            replica.get('government', {}),
+            replica.get('enterprises', []),
+            residents
+        ),
+        'collaboration': calculate_collaboration(records)
+    }
+
+
+def compute_all_metrics_batch(
+    replicas: List[Dict[str, Any]],
+    max_workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Calculate metrics for independent replicas concurrently in worker processes
+    
+    Replicas share no state, so each one is handled by a separate process.
+    
+    Args:
+        replicas: List of replica data dictionaries (see _compute_one)
+        max_workers: Number of worker processes (defaults to the CPU count)
+    
+    Returns:
+        List of metric dictionaries, in replica order
+    """
+    if not replicas:
+        return []
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_compute_one, replicas))
@@ -2,15 +2,104 @@
 Governance resilience metrics calculation
 """
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, NamedTuple, Optional
 
+from ._resilience_kernels import (
+    adaptive_capacity, disruption_rate, fused_metrics, recovery_speed, stability_index
+)
 
-def calculate_resilience(simulation_records: List[Dict[str, Any]]) -> Dict[str, float]:
+
+class _ResilienceArrays(NamedTuple):
+    """Per-round columns shared by the resilience metrics"""
+    service_levels: np.ndarray
+    satisfaction_levels: np.ndarray
+    interaction_counts: np.ndarray
+    success_counts: np.ndarray
+    recovery_times: np.ndarray
+
+
+def _mean_satisfaction(residents: List[Dict[str, Any]]) -> float:
+    """Mean resident satisfaction, read straight into a float64 buffer"""
+    return float(np.fromiter(
+        (r.get('satisfaction', 3.0) for r in residents),
+        dtype=np.float64, count=len(residents)
+    ).mean())
+
+
+def _extract_soa(
+    simulation_records: List[Dict[str, Any]],
+    resident_satisfaction: Optional[np.ndarray] = None
+) -> _ResilienceArrays:
+    """
+    Walk the records once and collect every resilience input as arrays
+    
+    Args:
+        simulation_records: List of simulation records
+        resident_satisfaction: Optional (rounds, residents) array of
+            per-round resident satisfaction; falls back to the resident
+            states stored in each record when omitted
+        
+    Returns:
+        Per-round service levels, normalized satisfaction, interaction and
+        success counts, plus the recovery times of all emergency responses
+    """
+    n = len(simulation_records)
+    service_levels = np.empty(n, dtype=np.float64)
+    interaction_counts = np.empty(n, dtype=np.int64)
+    success_counts = np.empty(n, dtype=np.int64)
+    recovery_times = []
+    
+    if resident_satisfaction is not None:
+        if resident_satisfaction.shape[1]:
+            # Normalize to 0-1
+            satisfaction_levels = resident_satisfaction.mean(axis=1, dtype=np.float64) / 5.0
+        else:
+            satisfaction_levels = np.full(len(resident_satisfaction), 0.6)  # Default
+    else:
+        satisfaction_levels = np.empty(n, dtype=np.float64)
+    
+    for i, record in enumerate(simulation_records):
+        service_levels[i] = record.get('environment', {}).get('service_availability', 1.0)
+        
+        interactions = record.get('interactions', [])
+        interaction_counts[i] = len(interactions)
+        successes = 0
+        for interaction in interactions:
+            get = interaction.get
+            if get('outcome') == 'success':
+                successes += 1
+            # Emergency-related interactions
+            if get('type') == 'emergency_response':
+                recovery_times.append(get('recovery_time', 5.0))
+        success_counts[i] = successes
+        
+        if resident_satisfaction is not None:
+            continue
+        
+        # Calculate average resident satisfaction
+        residents = record.get('agents', {}).get('residents', [])
+        if residents:
+            satisfaction_levels[i] = _mean_satisfaction(residents) / 5.0  # Normalize to 0-1
+        else:
+            satisfaction_levels[i] = 0.6  # Default
+    
+    return _ResilienceArrays(
+        service_levels, satisfaction_levels, interaction_counts, success_counts,
+        np.array(recovery_times, dtype=np.float64)
+    )
+
+
+def calculate_resilience(
+    simulation_records: List[Dict[str, Any]],
+    resident_satisfaction: Optional[np.ndarray] = None
+) -> Dict[str, float]:
     """
     Calculate governance resilience indicators
     
     Args:
         simulation_records: List of simulation round records
+        resident_satisfaction: Optional (rounds, residents) array of
+            per-round resident satisfaction snapshots
         
     Returns:
         Dictionary containing resilience metrics
@@ -23,19 +112,26 @@ def calculate_resilience(simulation_records: List[Dict[str, Any]]) -> Dict[str,
             'stability_index': 0.0
         }
     
-    recovery_speed = calculate_system_recovery_speed(simulation_records)
-    disruption_rate = calculate_service_disruption_rate(simulation_records)
-    adaptive_capacity = calculate_adaptive_capacity(simulation_records)
-    stability_index = calculate_stability_index(simulation_records)
+    arrays = _extract_soa(simulation_records, resident_satisfaction)
+    recovery, disruption, adaptive, stability = fused_metrics(*arrays)
     
     return {
-        'system_recovery_speed': float(recovery_speed),
-        'service_disruption_rate': float(disruption_rate),
-        'adaptive_capacity': float(adaptive_capacity),
-        'stability_index': float(stability_index)
+        'system_recovery_speed': float(recovery),
+        'service_disruption_rate': float(disruption),
+        'adaptive_capacity': float(adaptive),
+        'stability_index': float(stability)
     }
 
 
+def _service_levels(simulation_records: List[Dict[str, Any]]) -> np.ndarray:
+    """Per-round service availability only, without the other resilience columns"""
+    return np.fromiter(
+        (record.get('environment', {}).get('service_availability', 1.0)
+         for record in simulation_records),
+        dtype=np.float64, count=len(simulation_records)
+    )
+
+
 def calculate_system_recovery_speed(simulation_records: List[Dict[str, Any]]) -> float:
     """
     Calculate system recovery speed during emergencies
@@ -49,33 +145,14 @@ def calculate_system_recovery_speed(simulation_records: List[Dict[str, Any]]) ->
     if not simulation_records:
         return 0.0
     
-    emergency_events = []
-    
-    for i, record in enumerate(simulation_records):
-        interactions = record.get('interactions', [])
-        
-        # Look for emergency-related interactions
-        for interaction in interactions:
-            if interaction.get('type') == 'emergency_response':
-                emergency_events.append({
-                    'round': i,
-                    'response_time': interaction.get('response_time', 1.0),
-                    'recovery_time': interaction.get('recovery_time', 5.0)
-                })
-    
-    if not emergency_events:
-        # No emergencies occurred, assume good resilience
-        return 0.8
-    
-    # Calculate average recovery speed (inverse of recovery time)
-    recovery_times = [event['recovery_time'] for event in emergency_events]
-    avg_recovery_time = np.mean(recovery_times)
-    
-    # Convert to speed metric (0-1 scale)
-    max_recovery_time = 10.0  # Assume max recovery time is 10 rounds
-    recovery_speed = max(0.0, 1.0 - (avg_recovery_time / max_recovery_time))
-    
-    return recovery_speed
+    # Only the emergency responses matter here, so skip the full record scan
+    recovery_times = [
+        interaction.get('recovery_time', 5.0)
+        for record in simulation_records
+        for interaction in record.get('interactions', ())
+        if interaction.get('type') == 'emergency_response'
+    ]
+    return float(recovery_speed(np.array(recovery_times, dtype=np.float64)))
 
 
 def calculate_service_disruption_rate(simulation_records: List[Dict[str, Any]]) -> float:
@@ -90,20 +167,7 @@ def calculate_service_disruption_rate(simulation_records: List[Dict[str, Any]])
     """
     if not simulation_records:
         return 0.0
-    
-    total_rounds = len(simulation_records)
-    disrupted_rounds = 0
-    
-    for record in simulation_records:
-        environment = record.get('environment', {})
-        service_level = environment.get('service_availability', 1.0)
-        
-        # Consider service disrupted if availability < 0.8
-        if service_level < 0.8:
-            disrupted_rounds += 1
-    
-    disruption_rate = disrupted_rounds / total_rounds if total_rounds > 0 else 0.0
-    return disruption_rate
+    return float(disruption_rate(_service_levels(simulation_records)))
 
 
 def calculate_adaptive_capacity(simulation_records: List[Dict[str, Any]]) -> float:
@@ -118,22 +182,8 @@ def calculate_adaptive_capacity(simulation_records: List[Dict[str, Any]]) -> flo
     """
     if len(simulation_records) < 10:
         return 0.5  # Default value for short simulations
-    
-    # Measure system's ability to improve over time
-    early_records = simulation_records[:len(simulation_records)//3]
-    late_records = simulation_records[-len(simulation_records)//3:]
-    
-    # Calculate average efficiency in early vs late periods
-    early_efficiency = calculate_period_efficiency(early_records)
-    late_efficiency = calculate_period_efficiency(late_records)
-    
-    # Adaptive capacity is the improvement over time
-    improvement = late_efficiency - early_efficiency
-    
-    # Normalize to 0-1 scale
-    adaptive_capacity = max(0.0, min(1.0, 0.5 + improvement))
-    
-    return adaptive_capacity
+    arrays = _extract_soa(simulation_records)
+    return float(adaptive_capacity(arrays.interaction_counts, arrays.success_counts))
 
 
 def calculate_period_efficiency(records: List[Dict[str, Any]]) -> float:
@@ -149,65 +199,36 @@ def calculate_period_efficiency(records: List[Dict[str, Any]]) -> float:
     if not records:
         return 0.0
     
-    efficiency_scores = []
-    
+    # Efficiency based on successful interactions, over rounds that had any
+    total_efficiency = 0.0
+    active_rounds = 0
     for record in records:
         interactions = record.get('interactions', [])
-        
-        # Calculate efficiency based on successful interactions
-        total_interactions = len(interactions)
-        successful_interactions = len([
-            i for i in interactions 
-            if i.get('outcome') == 'success'
-        ])
-        
-        if total_interactions > 0:
-            efficiency = successful_interactions / total_interactions
-            efficiency_scores.append(efficiency)
+        if interactions:
+            successes = sum(1 for i in interactions if i.get('outcome') == 'success')
+            total_efficiency += successes / len(interactions)
+            active_rounds += 1
     
-    return np.mean(efficiency_scores) if efficiency_scores else 0.0
+    return total_efficiency / active_rounds if active_rounds else 0.0
 
 
-def calculate_stability_index(simulation_records: List[Dict[str, Any]]) -> float:
+def calculate_stability_index(
+    simulation_records: List[Dict[str, Any]],
+    resident_satisfaction: Optional[np.ndarray] = None
+) -> float:
     """
     Calculate system stability index
     
     Args:
         simulation_records: List of simulation records
+        resident_satisfaction: Optional (rounds, residents) array of
+            per-round resident satisfaction; falls back to the resident
+            states stored in each record when omitted
         
     Returns:
         Stability index (higher = more stable)
     """
     if len(simulation_records) < 2:
         return 1.0
-    
-    # Calculate variance in key system metrics over time
-    service_levels = []
-    satisfaction_levels = []
-    
-    for record in simulation_records:
-        environment = record.get('environment', {})
-        agents = record.get('agents', {})
-        
-        service_level = environment.get('service_availability', 1.0)
-        service_levels.append(service_level)
-        
-        # Calculate average resident satisfaction
-        residents = agents.get('residents', [])
-        if residents:
-            avg_satisfaction = np.mean([
-                r.get('satisfaction', 3.0) for r in residents
-            ])
-            satisfaction_levels.append(avg_satisfaction / 5.0)  # Normalize to 0-1
-        else:
-            satisfaction_levels.append(0.6)  # Default
-    
-    # Stability is inverse of variance (lower variance = higher stability)
-    service_variance = np.var(service_levels) if len(service_levels) > 1 else 0.0
-    satisfaction_variance = np.var(satisfaction_levels) if len(satisfaction_levels) > 1 else 0.0
-    
-    # Combine variances and convert to stability index
-    total_variance = (service_variance + satisfaction_variance) / 2
-    stability_index = max(0.0, 1.0 - total_variance * 10)  # Scale factor
-    
-    return min(1.0, stability_index)
\ No newline at end of file
+    arrays = _extract_soa(simulation_records, resident_satisfaction)
+    return float(stability_index(arrays.service_levels, arrays.satisfaction_levels))
@@ -3,22 +3,28 @@ Demo script for ABM digital governance simulation
 快速演示脚本
 """
 import os
+import re
 import sys
-from main import run_simulation, compare_cities, save_results
+import datetime
+from functools import lru_cache
+from pathlib import Path
+from main import run_simulations_parallel, compare_cities, save_results, load_json_file
 
 
+# api_key=... line of the env file (first match wins)
+_API_KEY_RE = re.compile(r'^[^\S\n]*api_key=(.*)$', re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
 def check_api_key():
-    """检查API密钥（从env文件或环境变量）"""
+    """检查API密钥（从env文件或环境变量），结果在进程内缓存"""
     # 首先尝试从env文件读取
     try:
-        env_path = os.path.join('..', 'env')
-        if os.path.exists(env_path):
-            with open(env_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('api_key='):
-                        api_key = line.split('=', 1)[1].strip('"\'')
-                        return api_key
+        env_path = Path('..', 'env')
+        if env_path.exists():
+            match = _API_KEY_RE.search(env_path.read_text(encoding='utf-8'))
+            if match:
+                return match.group(1).rstrip().strip('"\'')
     except Exception:
         pass
     
@@ -45,29 +51,44 @@ def run_quick_demo():
         # 快速演示：只运行10轮
         num_rounds = 10
         
-        print(f"1. 运行北京仿真（{num_rounds}轮）...")
-        beijing_results = run_simulation('beijing', num_rounds=num_rounds)
+        # 三个仿真相互独立，并行运行（各自使用独立的日志文件）
+        print(f"1. 并行运行北京、深圳及政策干预仿真（{num_rounds}轮）...")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        all_results = run_simulations_parallel({
+            'beijing': {
+                'city': 'beijing',
+                'num_rounds': num_rounds,
+                'log_file': f"simulation_log_beijing_{timestamp}"
+            },
+            'shenzhen': {
+                'city': 'shenzhen',
+                'num_rounds': num_rounds,
+                'log_file': f"simulation_log_shenzhen_{timestamp}"
+            },
+            'shenzhen_policy': {
+                'city': 'shenzhen',
+                'policy_interventions': ['digital_literacy_training'],
+                'num_rounds': num_rounds,
+                'log_file': f"simulation_log_shenzhen_policy_{timestamp}"
+            }
+        })
+        beijing_results = all_results['beijing']
+        shenzhen_results = all_results['shenzhen']
+        policy_results = all_results['shenzhen_policy']
+        
         print("✅ 北京仿真完成")
         print(f"   - 平均响应时间: {beijing_results['metrics']['efficiency']['avg_response_time']:.2f}")
         print(f"   - 服务公平性: {1-beijing_results['metrics']['fairness']['service_access_gini']:.2f}")
         
-        print(f"\n2. 运行深圳仿真（{num_rounds}轮）...")
-        shenzhen_results = run_simulation('shenzhen', num_rounds=num_rounds)
         print("✅ 深圳仿真完成")
         print(f"   - 平均响应时间: {shenzhen_results['metrics']['efficiency']['avg_response_time']:.2f}")
         print(f"   - 服务公平性: {1-shenzhen_results['metrics']['fairness']['service_access_gini']:.2f}")
         
-        print(f"\n3. 运行政策干预仿真（{num_rounds}轮）...")
-        policy_results = run_simulation(
-            'shenzhen', 
-            policy_interventions=['digital_literacy_training'],
-            num_rounds=num_rounds
-        )
         print("✅ 政策干预仿真完成")
         print(f"   - 数字鸿沟指数: {policy_results['metrics']['fairness']['digital_divide_index']:.3f}")
         
         # 保存结果
-        print("\n4. 保存结果...")
+        print("\n2. 保存结果...")
         save_results(beijing_results, 'demo_beijing_results.json')
         save_results(shenzhen_results, 'demo_shenzhen_results.json')  
         save_results(policy_results, 'demo_policy_results.json')
@@ -103,6 +124,10 @@ def run_quick_demo():
         print("3. 配置文件是否完整")
 
 
+# Interaction fixture for the metric smoke test, built once at import
+_DUMMY_INTERACTIONS = ({'type': 'service_request', 'outcome': 'success', 'response_time': 1.0},)
+
+
 def run_simple_test():
     """运行简单功能测试"""
     print("=== 系统功能测试 ===\n")
@@ -111,14 +136,11 @@ def run_simple_test():
         from simulation.agent import create_agents
         from simulation.environment import Environment
         from metrics import calculate_efficiency, calculate_fairness
-        import json
         
         # 测试配置加载
         print("1. 测试配置加载...")
-        with open('config/agents.json', 'r', encoding='utf-8') as f:
-            agents_config = json.load(f)
-        with open('config/environments.json', 'r', encoding='utf-8') as f:
-            env_config = json.load(f)
+        agents_config = load_json_file('config/agents.json')
+        env_config = load_json_file('config/environments.json')
         print("✅ 配置文件加载成功")
         
         # 测试环境创建
@@ -133,8 +155,7 @@ def run_simple_test():
         
         # 测试指标计算
         print("4. 测试指标计算...")
-        dummy_interactions = [{'type': 'service_request', 'outcome': 'success', 'response_time': 1.0}]
-        efficiency = calculate_efficiency(dummy_interactions)
+        efficiency = calculate_efficiency(_DUMMY_INTERACTIONS)
         print(f"✅ 效率指标计算成功: {efficiency}")
         
         print("\n✅ 所有功能测试通过！")
@@ -4,33 +4,72 @@ Offline demo script for ABM digital governance simulation
 """
 import os
 import sys
-import json
-from main import run_simulation, save_results
+import datetime
+import weakref
+from collections import deque
+from main import run_simulations_parallel, save_results, load_json_file
+
+
+# Default per-agent cap on mock decisions kept in interaction_history
+MOCK_HISTORY_CAP = 10_000
 
 
 def mock_llm_response():
-    """Mock LLM to avoid API calls"""
+    """
+    Mock LLM to avoid API calls
+    
+    Environment flags:
+        CITYSIM_SKIP_HISTORY=1: do not append mock decisions to the agents'
+            interaction_history (only the metrics are needed downstream)
+        CITYSIM_MOCK_CACHE=1: reuse one default decision per agent and
+            context bucket instead of drawing a new one every round
+        CITYSIM_HISTORY_CAP: maximum mock entries kept per agent
+            (default 10000); older entries are dropped
+    """
     from simulation.agent import Agent
     
-    # Override the decide method to return default decisions
+    # Override the decide methods to return default decisions
     original_decide = Agent.decide
+    original_adecide = Agent.adecide
+    skip_history = os.getenv('CITYSIM_SKIP_HISTORY') == '1'
+    cache_decisions = os.getenv('CITYSIM_MOCK_CACHE') == '1'
+    history_cap = int(os.getenv('CITYSIM_HISTORY_CAP', MOCK_HISTORY_CAP))
+    # Per-agent mock decisions, dropped together with their agents
+    decision_caches = weakref.WeakKeyDictionary()
     
     def mock_decide(self, context):
         """Mock decision without LLM call"""
-        decision = self._get_default_decision()
+        if cache_decisions:
+            # Bucket the context on the fields that shape agent behaviour
+            key = (
+                context.get('emergency_status'),
+                round(context.get('service_availability', 1.0), 1)
+            )
+            cache = decision_caches.setdefault(self, {})
+            decision = cache.get(key)
+            if decision is None:
+                decision = cache[key] = self._get_default_decision()
+        else:
+            decision = self._get_default_decision()
         
-        # Store interaction
-        self.interaction_history.append({
-            'context': context,
-            'decision': decision,
-            'timestamp': len(self.interaction_history),
-            'mock': True
-        })
+        if skip_history:
+            return decision
+        
+        # Store interaction in a bounded ring buffer
+        history = self.interaction_history
+        if history.maxlen != history_cap:
+            self.interaction_history = deque(history, maxlen=history_cap)
+        self._remember(context, decision, mock=True)
         
         return decision
     
+    async def mock_adecide(self, context):
+        """Async variant used for concurrent rounds"""
+        return mock_decide(self, context)
+    
     Agent.decide = mock_decide
-    return original_decide
+    Agent.adecide = mock_adecide
+    return original_decide, original_adecide
 
 
 def run_offline_demo():
@@ -40,35 +79,50 @@ def run_offline_demo():
     print("注意：此模式使用预设决策逻辑，不调用LLM\n")
     
     # Mock LLM to avoid API calls
-    original_decide = mock_llm_response()
+    original_decide, original_adecide = mock_llm_response()
     
     try:
         # 快速演示：只运行5轮
         num_rounds = 5
         
-        print(f"1. 运行北京仿真（{num_rounds}轮）...")
-        beijing_results = run_simulation('beijing', num_rounds=num_rounds)
+        # 三个仿真相互独立，并行运行（各自使用独立的日志文件）
+        print(f"1. 并行运行北京、深圳及政策干预仿真（{num_rounds}轮）...")
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        all_results = run_simulations_parallel({
+            'beijing': {
+                'city': 'beijing',
+                'num_rounds': num_rounds,
+                'log_file': f"simulation_log_beijing_{timestamp}"
+            },
+            'shenzhen': {
+                'city': 'shenzhen',
+                'num_rounds': num_rounds,
+                'log_file': f"simulation_log_shenzhen_{timestamp}"
+            },
+            'shenzhen_policy': {
+                'city': 'shenzhen',
+                'policy_interventions': ['digital_literacy_training'],
+                'num_rounds': num_rounds,
+                'log_file': f"simulation_log_shenzhen_policy_{timestamp}"
+            }
+        }, initializer=mock_llm_response)
+        beijing_results = all_results['beijing']
+        shenzhen_results = all_results['shenzhen']
+        policy_results = all_results['shenzhen_policy']
+        
         print("✅ 北京仿真完成")
         print(f"   - 平均响应时间: {beijing_results['metrics']['efficiency']['avg_response_time']:.2f}")
         print(f"   - 服务公平性: {1-beijing_results['metrics']['fairness']['service_access_gini']:.2f}")
         
-        print(f"\n2. 运行深圳仿真（{num_rounds}轮）...")
-        shenzhen_results = run_simulation('shenzhen', num_rounds=num_rounds)
         print("✅ 深圳仿真完成")
         print(f"   - 平均响应时间: {shenzhen_results['metrics']['efficiency']['avg_response_time']:.2f}")
         print(f"   - 服务公平性: {1-shenzhen_results['metrics']['fairness']['service_access_gini']:.2f}")
         
-        print(f"\n3. 运行政策干预仿真（{num_rounds}轮）...")
-        policy_results = run_simulation(
-            'shenzhen', 
-            policy_interventions=['digital_literacy_training'],
-            num_rounds=num_rounds
-        )
         print("✅ 政策干预仿真完成")
         print(f"   - 数字鸿沟指数: {policy_results['metrics']['fairness']['digital_divide_index']:.3f}")
         
         # 保存结果
-        print("\n4. 保存结果...")
+        print("\n2. 保存结果...")
         save_results(beijing_results, 'offline_beijing_results.json')
         save_results(shenzhen_results, 'offline_shenzhen_results.json')  
         save_results(policy_results, 'offline_policy_results.json')
@@ -102,9 +156,10 @@ def run_offline_demo():
         print("请检查系统基础功能")
     
     finally:
-        # Restore original method
+        # Restore original methods
         from simulation.agent import Agent
         Agent.decide = original_decide
+        Agent.adecide = original_adecide
 
 
 def show_system_status():
@@ -117,8 +172,7 @@ def show_system_status():
         config_files = ['agents.json', 'environments.json', 'rules.json', 'policies.json']
         for config_file in config_files:
             try:
-                with open(f'config/{config_file}', 'r', encoding='utf-8') as f:
-                    json.load(f)
+                load_json_file(f'config/{config_file}')
                 print(f"   ✅ {config_file}")
             except Exception as e:
                 print(f"   ❌ {config_file}: {e}")
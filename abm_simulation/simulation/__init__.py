@@ -1,11 +1,23 @@
 """
 Simulation module for ABM digital governance framework
+
+Simulation classes are imported lazily on first access (PEP 562), so
+importing the package does not pull in the agent and LLM dependencies
+until they are actually used.
 """
+import importlib
 
-from .agent import Agent, GovernmentAgent, EnterpriseAgent, ResidentAgent
-from .environment import Environment
-from .interaction import InteractionEngine
-from .policy_engine import PolicyEngine
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    'Agent': 'agent',
+    'GovernmentAgent': 'agent',
+    'EnterpriseAgent': 'agent',
+    'ResidentAgent': 'agent',
+    'Environment': 'environment',
+    'InteractionEngine': 'interaction',
+    'Interaction': 'interaction',
+    'PolicyEngine': 'policy_engine'
+}
 
 __all__ = [
     'Agent',
@@ -14,5 +26,20 @@ __all__ = [
     'ResidentAgent',
     'Environment',
     'InteractionEngine',
+    'Interaction',
     'PolicyEngine'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import a simulation class on first access and cache it"""
+    submodule = _LAZY_ATTRS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{submodule}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,23 +2,261 @@
 Agent classes for ABM digital governance simulation
 """
 import os
+import re
 import json
 import random
+import asyncio
+import hashlib
+import string
 import logging
-from typing import Dict, Any, List, Optional
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage, SystemMessage
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import ChainMap, OrderedDict, deque
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Hashable
+import openai
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
+from .agent_state import (
+    GovernmentAttributes, GovernmentState,
+    EnterpriseAttributes, EnterpriseState,
+    ResidentAttributes, ResidentState
+)
 
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of agent prompts packed into one batched LLM request
+BATCH_DECISION_SIZE = 20
+
+# Maximum number of LLM requests in flight at once in ``run_round``
+LLM_CONCURRENCY = 32
+
+# Number of recent decisions kept in each agent's interaction_history
+INTERACTION_HISTORY_SIZE = 64
+
+# Share of DecisionCache hits re-queried anyway to avoid permanent stasis
+DECISION_REFRESH_PROBABILITY = 0.05
+
+# Prompt template line separating the static instructions (sent first, so
+# provider-side prompt caching can reuse them) from the per-round context
+DYNAMIC_MARKER = '{{DYNAMIC}}'
+
+# Fenced JSON block in an LLM response; an unclosed fence runs to the end
+_JSON_BLOCK_RE = re.compile(r'```json(.*?)(?:```|\Z)', re.DOTALL)
+
+# Values for prompt variables that neither the agent nor the context provide
+_PROMPT_DEFAULTS = {
+    'environment_context': 'Normal operating conditions',
+    'recent_interactions': 'No recent interactions',
+    'service_quality': 3.5,
+    'privacy_level': 'Medium',
+    'infrastructure_level': 70,
+    'available_services': 'Basic digital services',
+    'usage_frequency': 5,
+    'regulation_intensity': 'Medium',
+    'available_data': 'Limited public data',
+    'market_conditions': 'Stable',
+    'competition_level': 'Medium'
+}
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # let json decide on input orjson is stricter about (NaN etc.)
+    return json.loads(text)
+
+
+class CompiledTemplate:
+    """
+    ``str.format`` template parsed once into literal text and field lookups
+    
+    Rendering joins the pre-split segments instead of rescanning the braces
+    on every call. Templates using attribute/index access, conversions or
+    nested format specs fall back to ``str.format_map``.
+    """
+    
+    __slots__ = ('text', '_segments')
+    
+    def __init__(self, text: str):
+        self.text = text
+        segments = []
+        for literal, name, spec, conversion in string.Formatter().parse(text):
+            if name is not None and (
+                not name.isidentifier() or conversion or (spec and '{' in spec)
+            ):
+                segments = None
+                break
+            segments.append((literal, name, spec))
+        self._segments = segments
+    
+    def render(self, variables: Mapping) -> str:
+        """
+        Fill in the template fields
+        
+        Args:
+            variables: Mapping of field name to value
+            
+        Returns:
+            Formatted text (KeyError for a missing field, as ``str.format``)
+        """
+        if self._segments is None:
+            return self.text.format_map(variables)
+        parts = []
+        for literal, name, spec in self._segments:
+            parts.append(literal)
+            if name is not None:
+                parts.append(format(variables[name], spec))
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=1)
+def _api_config() -> Dict[str, str]:
+    """Load API configuration from env file (read once per process)"""
+    config = {}
+    try:
+        # Try to read from ../env file (relative to project root)
+        env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'env')
+        if os.path.exists(env_path):
+            with open(env_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if '=' in line and not line.startswith('#'):
+                        key, value = line.split('=', 1)
+                        # Remove quotes if present
+                        value = value.strip('"\'')
+                        config[key.strip()] = value
+            logger.info(f"Loaded API config from {env_path}")
+        else:
+            # Fallback to environment variables
+            config = {
+                "model": os.getenv("MODEL", "glm-4"),
+                "api_key": os.getenv("ZAI_API_KEY", "your-zhipuai-api-key"),
+                "openai_api_base": os.getenv("OPENAI_API_BASE", "https://open.bigmodel.cn/api/paas/v4/")
+            }
+            logger.info("Using environment variables for API config")
+    except Exception as e:
+        logger.warning(f"Failed to load API config: {e}, using defaults")
+        config = {
+            "model": "glm-4",
+            "api_key": "your-zhipuai-api-key", 
+            "openai_api_base": "https://open.bigmodel.cn/api/paas/v4/"
+        }
+    
+    return config
+
+
+@lru_cache(maxsize=8)
+def _prompt_template(agent_type: str) -> Optional[str]:
+    """Read the prompt template of an agent type once; None if the file is missing"""
+    try:
+        with open(f'prompts/{agent_type}_prompt.txt', 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+class ChatClient:
+    """
+    Minimal client for OpenAI-compatible chat completion APIs (e.g. GLM-4)
+    
+    Sends plain ``{"role", "content"}`` messages and returns the reply
+    text, without a framework layer around each call. The async client is
+    created per event loop, since its connection pool cannot outlive the
+    loop that opened it (``decide_batch`` starts one loop per round);
+    ``aclose`` closes it before that loop ends.
+    """
+    
+    def __init__(self, model: str, api_key: str, base_url: str, temperature: float = 0.6):
+        """
+        Initialize ChatClient
+        
+        Args:
+            model: Model name
+            api_key: API key
+            base_url: Base URL of the OpenAI-compatible endpoint
+            temperature: Sampling temperature
+        """
+        self.model = model
+        self.temperature = temperature
+        self._api_key = api_key
+        self._base_url = base_url
+        self._client = openai.OpenAI(api_key=api_key, base_url=base_url)
+        self._async_client = None
+        self._async_loop = None
+    
+    def invoke(self, messages: List[Dict[str, str]]) -> str:
+        """Send one chat request and return the reply text"""
+        response = self._client.chat.completions.create(
+            model=self.model, messages=messages, temperature=self.temperature
+        )
+        return response.choices[0].message.content or ''
+    
+    async def ainvoke(self, messages: List[Dict[str, str]]) -> str:
+        """Async variant of ``invoke``"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_client = openai.AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+            self._async_loop = loop
+        response = await self._async_client.chat.completions.create(
+            model=self.model, messages=messages, temperature=self.temperature
+        )
+        return response.choices[0].message.content or ''
+    
+    async def aclose(self):
+        """Close the async client opened on the running event loop, if any"""
+        client = self._async_client
+        if client is None or self._async_loop is not asyncio.get_running_loop():
+            return
+        self._async_client = None
+        self._async_loop = None
+        await client.close()
+
+
+@lru_cache(maxsize=8)
+def _shared_llm(agent_type: str) -> ChatClient:
+    """One LLM client (and connection pool) shared by all agents of a type"""
+    api_config = _api_config()
+    return ChatClient(
+        model=api_config.get("model", "glm-4"),
+        api_key=api_config.get("api_key", "your-zhipuai-api-key"),
+        base_url=api_config.get("openai_api_base", "https://open.bigmodel.cn/api/paas/v4/"),
+        temperature=0.6
+    )
+
 
 class Agent:
     """Base Agent class for ABM simulation"""
     
+    # Fixed instance layout; attributes set later by create_agents and the
+    # policy engine (agent_id, *_modifiers) have slots as well
+    __slots__ = (
+        'type', 'config', 'city', 'state', 'attributes',
+        'interaction_history', 'decision_count',
+        '_last_is_fallback', '_last_error', 'response_cache', 'semantic_cache',
+        'llm', 'prompt_template', '_static_template', '_dynamic_template',
+        'agent_id', 'behavior_modifiers', 'policy_modifiers', '__weakref__'
+    )
+    
+    # Slotted record types for attributes/state; plain dicts when None
+    ATTRIBUTES_RECORD: Optional[type] = None
+    STATE_RECORD: Optional[type] = None
+    
+    # City-specific attribute values applied on top of the configuration
+    CITY_ADJUSTMENTS: Dict[str, Dict[str, Any]] = {}
+    
     def __init__(self, agent_type: str, config: Dict[str, Any], city: str):
         """
         Initialize Agent
@@ -31,65 +269,55 @@ class Agent:
         self.type = agent_type
         self.config = config
         self.city = city
-        self.state = config.get('initial_state', {}).copy()
-        self.attributes = config.get('attributes', {}).copy()
-        self.interaction_history = []
-        
-        # Initialize LLM with GLM-4
-        api_config = self._load_api_config()
-        self.llm = ChatOpenAI(
-            model=api_config.get("model", "glm-4"),
-            openai_api_key=api_config.get("api_key", "your-zhipuai-api-key"),
-            openai_api_base=api_config.get("openai_api_base", "https://open.bigmodel.cn/api/paas/v4/"),
-            temperature=0.6
-        )
+        self.state = self._new_record(self.STATE_RECORD, config.get('initial_state', {}))
+        self.attributes = self._new_record(self.ATTRIBUTES_RECORD, config.get('attributes', {}))
+        self.attributes.update(self.CITY_ADJUSTMENTS.get(city, {}))
+        # Recent decisions only (context digest + action), oldest dropped first
+        self.interaction_history = deque(maxlen=INTERACTION_HISTORY_SIZE)
+        self.decision_count = 0
+        # Outcome of the most recent decide() call, read by the round logger
+        self._last_is_fallback = False
+        self._last_error = None
+        # Optional caches of raw LLM responses shared across agents
+        self.response_cache = None
+        self.semantic_cache = None
+        
+        # Initialize LLM with GLM-4 (client shared by all agents of this type)
+        self.llm = _shared_llm(agent_type)
         
         # Load prompt template
         self.prompt_template = self._load_prompt_template()
+        static, dynamic = self._split_template(self.prompt_template)
+        self._static_template = CompiledTemplate(static)
+        self._dynamic_template = CompiledTemplate(dynamic)
     
     def _load_api_config(self) -> Dict[str, str]:
         """Load API configuration from env file"""
-        config = {}
-        try:
-            # Try to read from ../env file (relative to project root)
-            env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '..', 'env')
-            if os.path.exists(env_path):
-                with open(env_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if '=' in line and not line.startswith('#'):
-                            key, value = line.split('=', 1)
-                            # Remove quotes if present
-                            value = value.strip('"\'')
-                            config[key.strip()] = value
-                logger.info(f"Loaded API config from {env_path}")
-            else:
-                # Fallback to environment variables
-                config = {
-                    "model": os.getenv("MODEL", "glm-4"),
-                    "api_key": os.getenv("ZAI_API_KEY", "your-zhipuai-api-key"),
-                    "openai_api_base": os.getenv("OPENAI_API_BASE", "https://open.bigmodel.cn/api/paas/v4/")
-                }
-                logger.info("Using environment variables for API config")
-        except Exception as e:
-            logger.warning(f"Failed to load API config: {e}, using defaults")
-            config = {
-                "model": "glm-4",
-                "api_key": "your-zhipuai-api-key", 
-                "openai_api_base": "https://open.bigmodel.cn/api/paas/v4/"
-            }
-        
-        return config
+        return dict(_api_config())
     
     def _load_prompt_template(self) -> str:
         """Load prompt template from file"""
-        try:
-            template_path = f'prompts/{self.type}_prompt.txt'
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except FileNotFoundError:
+        template = _prompt_template(self.type)
+        if template is None:
             logger.warning(f"Prompt template not found for {self.type}, using default")
             return self._get_default_prompt()
+        return template
+    
+    @staticmethod
+    def _new_record(record_type: Optional[type], data: Dict[str, Any]) -> Any:
+        """Copy configuration values into a record (or a plain dict)"""
+        if record_type is None:
+            return data.copy()
+        return record_type.from_mapping(data)
+    
+    @staticmethod
+    def _split_template(template: str) -> Tuple[str, str]:
+        """Split a prompt template into its static prefix and dynamic suffix"""
+        static, marker, dynamic = template.partition(DYNAMIC_MARKER)
+        if not marker:
+            # No marker: the whole template is treated as per-round context
+            return '', template
+        return static.strip(), dynamic.strip()
     
     def _get_default_prompt(self) -> str:
         """Get default prompt if template file not found"""
@@ -97,30 +325,140 @@ class Agent:
         Please make decisions based on the current context.
         Output your decision in JSON format."""
     
-    def _add_missing_variables(self, context: Dict[str, Any]) -> Dict[str, Any]:
-        """Add missing variables with default values for prompt formatting"""
-        # Common variables for all agents
-        defaults = {
-            'environment_context': context.get('environment_context', 'Normal operating conditions'),
-            'recent_interactions': context.get('recent_interactions', 'No recent interactions'),
-            'service_quality': context.get('service_quality', 3.5),
-            'privacy_level': context.get('privacy_level', 'Medium'),
-            'infrastructure_level': context.get('infrastructure_level', 70),
-            'available_services': context.get('available_services', 'Basic digital services'),
-            'usage_frequency': context.get('usage_frequency', 5),
-            'regulation_intensity': context.get('regulation_intensity', 'Medium'),
-            'available_data': context.get('available_data', 'Limited public data'),
-            'market_conditions': context.get('market_conditions', 'Stable'),
-            'competition_level': context.get('competition_level', 'Medium'),
-            'area_type': getattr(self, 'area_type', getattr(self, 'area', 'core_area'))
-        }
+    def _prompt_variables(self, context: Dict[str, Any]) -> ChainMap:
+        """Layered view of the prompt variables; earlier maps take precedence"""
+        return ChainMap(
+            context,
+            self.state,
+            self.attributes,
+            {
+                'city': self.city,
+                'area_type': getattr(self, 'area_type', getattr(self, 'area', 'core_area'))
+            },
+            _PROMPT_DEFAULTS
+        )
+    
+    def build_prompt(self, context: Dict[str, Any]) -> str:
+        """
+        Format the decision prompt for the given context
+        
+        Args:
+            context: Current simulation context
+            
+        Returns:
+            Formatted prompt text
+        """
+        return "\n\n".join(part for part in self.build_prompt_parts(context) if part)
+    
+    def build_prompt_parts(self, context: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Format the static and dynamic sections of the decision prompt
+        
+        Args:
+            context: Current simulation context
+            
+        Returns:
+            Tuple of (static instructions and agent profile, per-round context)
+        """
+        # Context overrides state, state overrides attributes, then defaults
+        variables = self._prompt_variables(context)
+        
+        return (
+            self._static_template.render(variables),
+            self._dynamic_template.render(variables)
+        )
+    
+    def _build_messages(self, context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for one decision request
+        
+        The rarely changing instructions and agent profile go into the
+        system message so consecutive requests share a byte-stable prefix;
+        only the per-round context follows in the user message.
+        """
+        static, dynamic = self.build_prompt_parts(context)
+        system = f"You are a {self.type} agent in digital governance simulation."
+        if static:
+            system = f"{system}\n\n{static}"
+        return [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': dynamic}
+        ]
+    
+    def _lookup_response(self, messages: List[Dict[str, str]]) -> Tuple[Optional[Tuple[Any, Any]], Optional[str]]:
+        """
+        Look up a cached LLM response for these messages
+        
+        The exact-match cache is tried first, then the semantic cache.
+        
+        Returns:
+            Tuple of (cache key for ``_handle_response`` or None when there
+            is nothing to store, cached content or None on a miss)
+        """
+        prompt = "\n\n".join(message['content'] for message in messages)
+        key = embedding = None
+        
+        if self.response_cache is not None:
+            key = ResponseCache.key(self.type, self.city, prompt)
+            content = self.response_cache.get(key)
+            if content is not None:
+                return None, content
+        
+        if self.semantic_cache is not None:
+            embedding, content = self.semantic_cache.lookup(self.type, self.city, prompt)
+            if content is not None:
+                return None, content
+        
+        if key is None and embedding is None:
+            return None, None
+        return (key, embedding), None
+    
+    def _handle_response(
+        self,
+        context: Dict[str, Any],
+        content: str,
+        cache_key: Optional[Tuple[Any, Any]] = None
+    ) -> Dict[str, Any]:
+        """Parse an LLM response, cache it if it parsed, and record the decision"""
+        # Log the LLM response for debugging
+        logger.info(f"{self.type} agent LLM response: {content[:200]}...")
+        
+        # Parse JSON response
+        try:
+            decision = self._extract_json(content)
+        except Exception as e:
+            logger.warning(f"Failed to parse LLM response: {e}")
+            decision = self._get_default_decision()
+        else:
+            if cache_key is not None:
+                key, embedding = cache_key
+                if key is not None:
+                    self.response_cache.put(key, content)
+                if embedding is not None:
+                    self.semantic_cache.put(self.type, self.city, embedding, content)
         
-        # Update context with defaults for missing keys
-        for key, value in defaults.items():
-            if key not in context:
-                context[key] = value
+        self._record_decision(context, decision)
         
-        return context
+        return decision
+    
+    def _handle_failure(self, context: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+        """Log a failed LLM call and record the fallback decision"""
+        error_msg = str(e)
+        if "500 Internal Server Error" in error_msg:
+            logger.warning(f"{self.type} agent: API server error, using fallback decision")
+        elif "timeout" in error_msg.lower():
+            logger.warning(f"{self.type} agent: API timeout, using fallback decision")
+        else:
+            logger.warning(f"LLM call failed for {self.type} agent, using fallback decision: {e}")
+        
+        decision = self._get_default_decision()
+        
+        # Store fallback interaction with error info
+        self._remember(context, decision, fallback=True, error=error_msg)
+        self._last_is_fallback = True
+        self._last_error = error_msg
+        
+        return decision
     
     def decide(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -133,86 +471,91 @@ class Agent:
             Decision dictionary
         """
         try:
-            # Prepare context data with all required variables
-            prompt_context = {
-                'city': self.city,
-                **self.attributes,
-                **self.state,
-                **context
-            }
-            
-            # Add missing variables with default values
-            prompt_context = self._add_missing_variables(prompt_context)
-            
-            # Format prompt
-            formatted_prompt = self.prompt_template.format(**prompt_context)
-            
-            # Create messages
-            messages = [
-                SystemMessage(content=f"You are a {self.type} agent in digital governance simulation."),
-                HumanMessage(content=formatted_prompt)
-            ]
+            messages = self._build_messages(context)
+            key, content = self._lookup_response(messages)
+            if content is not None:
+                return self._handle_response(context, content)
             
             # Call LLM
-            response = self.llm(messages)
-            
-            # Log the LLM response for debugging
-            logger.info(f"{self.type} agent LLM response: {response.content[:200]}...")
-            
-            # Parse JSON response
-            decision = self._parse_response(response.content)
-            
-            # Store interaction
-            self.interaction_history.append({
-                'context': context,
-                'decision': decision,
-                'timestamp': len(self.interaction_history)
-            })
+            content = self.llm.invoke(messages)
             
-            return decision
+            return self._handle_response(context, content, key)
             
         except Exception as e:
-            error_msg = str(e)
-            if "500 Internal Server Error" in error_msg:
-                logger.warning(f"{self.type} agent: API server error, using fallback decision")
-            elif "timeout" in error_msg.lower():
-                logger.warning(f"{self.type} agent: API timeout, using fallback decision")
-            else:
-                logger.warning(f"LLM call failed for {self.type} agent, using fallback decision: {e}")
+            return self._handle_failure(context, e)
+    
+    async def adecide(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Make decision using the async LLM client (see ``run_round``)
+        
+        Args:
+            context: Current simulation context
             
-            decision = self._get_default_decision()
+        Returns:
+            Decision dictionary
+        """
+        try:
+            messages = self._build_messages(context)
+            key, content = self._lookup_response(messages)
+            if content is not None:
+                return self._handle_response(context, content)
             
-            # Store fallback interaction with error info
-            self.interaction_history.append({
-                'context': context,
-                'decision': decision,
-                'timestamp': len(self.interaction_history),
-                'fallback': True,
-                'error': error_msg
-            })
+            # Call LLM without blocking the event loop
+            content = await self.llm.ainvoke(messages)
             
-            return decision
+            return self._handle_response(context, content, key)
+            
+        except Exception as e:
+            return self._handle_failure(context, e)
+    
+    def _remember(self, context: Dict[str, Any], decision: Dict[str, Any], **flags: Any):
+        """
+        Append a compact entry to the interaction history
+        
+        Only a digest of the context is kept, so old environment snapshots
+        are not held alive by the history.
+        
+        Args:
+            context: Context the decision was made in
+            decision: Decision taken
+            **flags: Extra entry fields (e.g. ``fallback``, ``error``)
+        """
+        ctx_hash = hashlib.blake2b(
+            repr(sorted(context.items())).encode('utf-8'), digest_size=8
+        ).hexdigest()
+        self.interaction_history.append({
+            'ctx_hash': ctx_hash,
+            'action': decision.get('action'),
+            'timestamp': self.decision_count,
+            **flags
+        })
+        self.decision_count += 1
+    
+    def _record_decision(self, context: Dict[str, Any], decision: Dict[str, Any]):
+        """Store a successful (non-fallback) decision in the interaction history"""
+        self._remember(context, decision)
+        self._last_is_fallback = False
+        self._last_error = None
+    
+    def _extract_json(self, response: str) -> Dict[str, Any]:
+        """Extract the JSON decision from an LLM response, raising on failure"""
+        # Find JSON block
+        match = _JSON_BLOCK_RE.search(response)
+        if match is not None:
+            json_str = match.group(1).strip()
+        else:
+            start = response.find('{')
+            end = response.rfind('}') + 1
+            if start < 0 or end == 0:
+                raise ValueError("No JSON found in response")
+            json_str = response[start:end]
+        
+        return _loads(json_str)
     
     def _parse_response(self, response: str) -> Dict[str, Any]:
         """Parse LLM response to JSON"""
         try:
-            # Try to extract JSON from response
-            response = response.strip()
-            
-            # Find JSON block
-            if '```json' in response:
-                start = response.find('```json') + 7
-                end = response.find('```', start)
-                json_str = response[start:end].strip()
-            elif '{' in response and '}' in response:
-                start = response.find('{')
-                end = response.rfind('}') + 1
-                json_str = response[start:end]
-            else:
-                raise ValueError("No JSON found in response")
-            
-            return json.loads(json_str)
-            
+            return self._extract_json(response)
         except Exception as e:
             logger.warning(f"Failed to parse LLM response: {e}")
             return self._get_default_decision()
@@ -260,23 +603,25 @@ class Agent:
             'type': self.type,
             'attributes': self.attributes.copy(),
             'state': self.state.copy(),
-            'interaction_count': len(self.interaction_history)
+            'interaction_count': self.decision_count
         }
 
 
 class GovernmentAgent(Agent):
     """Government agent with specific governance behaviors"""
     
+    __slots__ = ()
+    
+    ATTRIBUTES_RECORD = GovernmentAttributes
+    STATE_RECORD = GovernmentState
+    
+    CITY_ADJUSTMENTS = {
+        'beijing': {'governance_preference': 'fairness', 'platform_regulation': 95},
+        'shenzhen': {'governance_preference': 'efficiency', 'information_transparency': 85}
+    }
+    
     def __init__(self, config: Dict[str, Any], city: str):
         super().__init__('government', config, city)
-        
-        # City-specific adjustments
-        if city == 'beijing':
-            self.attributes['governance_preference'] = 'fairness'
-            self.attributes['platform_regulation'] = 95
-        elif city == 'shenzhen':
-            self.attributes['governance_preference'] = 'efficiency'  
-            self.attributes['information_transparency'] = 85
     
     def _get_default_decision(self) -> Dict[str, Any]:
         """Government-specific default decision"""
@@ -292,16 +637,18 @@ class GovernmentAgent(Agent):
 class EnterpriseAgent(Agent):
     """Enterprise agent with business-oriented behaviors"""
     
+    __slots__ = ()
+    
+    ATTRIBUTES_RECORD = EnterpriseAttributes
+    STATE_RECORD = EnterpriseState
+    
+    CITY_ADJUSTMENTS = {
+        'beijing': {'technology_type': 'government_project', 'data_collection_strategy': 'compliant'},
+        'shenzhen': {'technology_type': 'market_driven', 'data_collection_strategy': 'flexible'}
+    }
+    
     def __init__(self, config: Dict[str, Any], city: str):
         super().__init__('enterprise', config, city)
-        
-        # City-specific adjustments
-        if city == 'beijing':
-            self.attributes['technology_type'] = 'government_project'
-            self.attributes['data_collection_strategy'] = 'compliant'
-        elif city == 'shenzhen':
-            self.attributes['technology_type'] = 'market_driven'
-            self.attributes['data_collection_strategy'] = 'flexible'
     
     def _get_default_decision(self) -> Dict[str, Any]:
         """Enterprise-specific default decision"""
@@ -317,22 +664,26 @@ class EnterpriseAgent(Agent):
 class ResidentAgent(Agent):
     """Resident agent with citizen behaviors"""
     
+    __slots__ = ('area_type', 'area')
+    
+    ATTRIBUTES_RECORD = ResidentAttributes
+    STATE_RECORD = ResidentState
+    
+    # Area-specific attribute changes: attribute -> (delta, floor)
+    AREA_ADJUSTMENTS = {
+        'urban_rural_fringe': {'information_literacy': (-20, 30), 'income_level': (-1500, 3000)},
+        'rural': {'information_literacy': (-30, 20), 'income_level': (-2500, 2000)}
+    }
+    
     def __init__(self, config: Dict[str, Any], city: str, area_type: str = 'core_area'):
         super().__init__('resident', config, city)
         self.area_type = area_type
         self.area = area_type  # Ensure both attributes exist
         
         # Area-specific adjustments
-        if area_type == 'urban_rural_fringe':
-            self.attributes['information_literacy'] = max(30,
-                self.attributes.get('information_literacy', 60) - 20)
-            self.attributes['income_level'] = max(3000,
-                self.attributes.get('income_level', 5000) - 1500)
-        elif area_type == 'rural':
-            self.attributes['information_literacy'] = max(20,
-                self.attributes.get('information_literacy', 60) - 30)
-            self.attributes['income_level'] = max(2000,
-                self.attributes.get('income_level', 5000) - 2500)
+        attributes = self.attributes
+        for name, (delta, floor) in self.AREA_ADJUSTMENTS.get(area_type, {}).items():
+            attributes[name] = max(floor, attributes[name] + delta)
     
     def _get_default_decision(self) -> Dict[str, Any]:
         """Resident-specific default decision"""
@@ -345,6 +696,421 @@ class ResidentAgent(Agent):
         }
 
 
+def _parse_batch_response(response: str, count: int) -> List[Optional[Dict[str, Any]]]:
+    """
+    Parse a batched LLM response into per-agent decisions
+    
+    Args:
+        response: Raw LLM response expected to contain a JSON array
+        count: Number of agents in the batch
+        
+    Returns:
+        Decisions aligned with the batch; None where no usable decision was returned
+    """
+    parsed = [None] * count
+    try:
+        match = _JSON_BLOCK_RE.search(response)
+        if match is not None:
+            json_str = match.group(1).strip()
+        else:
+            start = response.find('[')
+            end = response.rfind(']') + 1
+            if start < 0 or end <= start:
+                raise ValueError("No JSON array found in response")
+            json_str = response[start:end]
+        
+        items = _loads(json_str)
+        if not isinstance(items, list):
+            raise ValueError("Batched response is not a JSON array")
+        
+        for i, item in enumerate(items[:count]):
+            if isinstance(item, dict):
+                parsed[i] = item
+    except Exception as e:
+        logger.warning(f"Failed to parse batched LLM response: {e}")
+    
+    return parsed
+
+
+def batch_decide(agents: List[Agent], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Make decisions for agents of one type with batched LLM requests
+    
+    Up to BATCH_DECISION_SIZE agent prompts are packed into one request
+    that asks for a JSON array of decisions in agent order. Agents missing
+    from the response are retried individually through ``decide``, which
+    keeps its own fallback handling.
+    
+    Args:
+        agents: Agents of the same type sharing one LLM configuration
+        context: Current simulation context shared by the group
+        
+    Returns:
+        Decisions aligned index-for-index with ``agents``
+    """
+    decisions = [None] * len(agents)
+    
+    for offset in range(0, len(agents), BATCH_DECISION_SIZE):
+        chunk = agents[offset:offset + BATCH_DECISION_SIZE]
+        try:
+            sections = [
+                f"=== Agent {i} ===\n{agent.build_prompt(context)}"
+                for i, agent in enumerate(chunk)
+            ]
+            messages = [
+                {'role': 'system', 'content': (
+                    f"You are {len(chunk)} {chunk[0].type} agents in digital governance simulation. "
+                    f"Decide for each agent independently and reply with one JSON array of exactly "
+                    f"{len(chunk)} decision objects, in agent order."
+                )},
+                {'role': 'user', 'content': "\n\n".join(sections)}
+            ]
+            content = chunk[0].llm.invoke(messages)
+            parsed = _parse_batch_response(content, len(chunk))
+        except Exception as e:
+            logger.warning(f"Batched LLM call failed for {chunk[0].type} agents, retrying individually: {e}")
+            parsed = [None] * len(chunk)
+        
+        for i, (agent, decision) in enumerate(zip(chunk, parsed)):
+            if decision is not None:
+                agent._record_decision(context, decision)
+                decisions[offset + i] = decision
+    
+    # Retry pass for agents without a usable batched decision
+    for i, agent in enumerate(agents):
+        if decisions[i] is None:
+            decisions[i] = agent.decide(context)
+    
+    return decisions
+
+
+async def run_round(
+    agents: List[Agent],
+    contexts: List[Dict[str, Any]],
+    concurrency: int = LLM_CONCURRENCY
+) -> List[Any]:
+    """
+    Run ``adecide`` for many agents concurrently
+    
+    At most ``concurrency`` requests are in flight at once to stay within
+    the API rate limits.
+    
+    Args:
+        agents: Agents to query
+        contexts: Context for each agent, aligned with ``agents``
+        concurrency: Maximum number of concurrent LLM requests
+        
+    Returns:
+        Decisions aligned with ``agents``; an exception raised by an
+        agent's ``adecide`` is returned in its place
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def bounded(agent: Agent, context: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await agent.adecide(context)
+    
+    return await asyncio.gather(
+        *(bounded(agent, context) for agent, context in zip(agents, contexts)),
+        return_exceptions=True
+    )
+
+
+def run_round_threaded(
+    agents: List[Agent],
+    contexts: List[Dict[str, Any]],
+    concurrency: int = LLM_CONCURRENCY
+) -> List[Any]:
+    """
+    Run the blocking ``decide`` for many agents on a thread pool
+    
+    Same contract as ``run_round``, for callers that cannot start an event
+    loop (e.g. when one is already running in notebooks or web servers).
+    The HTTP calls release the GIL, so the requests overlap like the async
+    version.
+    
+    Args:
+        agents: Agents to query
+        contexts: Context for each agent, aligned with ``agents``
+        concurrency: Maximum number of worker threads
+        
+    Returns:
+        Decisions aligned with ``agents``; an exception raised by an
+        agent's ``decide`` is returned in its place
+    """
+    def guarded(agent: Agent, context: Dict[str, Any]) -> Any:
+        try:
+            return agent.decide(context)
+        except Exception as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(agents)))) as executor:
+        return list(executor.map(guarded, agents, contexts))
+
+
+async def _run_round_and_close(agents: List[Agent], contexts: List[Dict[str, Any]]) -> List[Any]:
+    """``run_round``, then close the async LLM clients it opened on this loop"""
+    try:
+        return await run_round(agents, contexts)
+    finally:
+        clients = {id(agent.llm): agent.llm for agent in agents if isinstance(agent.llm, ChatClient)}
+        for client in clients.values():
+            await client.aclose()
+
+
+def _run_concurrent(agents: List[Agent], contexts: List[Dict[str, Any]]) -> List[Any]:
+    """Run a round with ``run_round``, or on threads inside a running event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_run_round_and_close(agents, contexts))
+    return run_round_threaded(agents, contexts)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of raw LLM responses keyed on the formatted prompt
+    
+    Agents of the same type and city that build a byte-identical prompt
+    reuse the earlier response instead of calling the LLM again. Responses
+    are re-parsed on every hit, so callers always get a fresh decision dict;
+    responses that failed to parse are never cached.
+    """
+    
+    def __init__(self, maxsize: int = 4096):
+        """
+        Initialize ResponseCache
+        
+        Args:
+            maxsize: Maximum number of cached responses
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(agent_type: str, city: str, prompt: str) -> str:
+        """Digest of the agent type, city and formatted prompt"""
+        return hashlib.blake2b(
+            f"{agent_type}|{city}|{prompt}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response content, or None on a miss"""
+        with self._lock:
+            content = self._entries.get(key)
+            if content is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return content
+    
+    def put(self, key: str, content: str):
+        """Cache a response, evicting the least recently used entry"""
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss statistics"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries)
+            }
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert nested dicts/lists into a hashable fingerprint"""
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class DecisionCache:
+    """
+    LRU memo of agent decisions keyed on the environment context and the
+    agent's own state
+    
+    An agent whose state, attributes and environment context are unchanged
+    since an earlier call reuses that decision instead of querying the LLM
+    again. Fallback decisions are never cached. A small share of hits can
+    be re-queried anyway so agents in a steady state do not repeat one
+    decision forever.
+    """
+    
+    def __init__(self, maxsize: int = 4096, refresh_probability: float = DECISION_REFRESH_PROBABILITY):
+        """
+        Initialize DecisionCache
+        
+        Args:
+            maxsize: Maximum number of cached decisions
+            refresh_probability: Chance that a hit is treated as a miss and
+                the agent queries the LLM again (0 disables refreshes)
+        """
+        self.maxsize = maxsize
+        self.refresh_probability = refresh_probability
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries = OrderedDict()
+        self._context = None
+        self._context_key = None
+    
+    def _key(self, agent: Agent, context: Dict[str, Any]) -> Hashable:
+        # One context object is shared by every agent in a round, so its
+        # fingerprint is computed once per round
+        if context is not self._context:
+            self._context = context
+            self._context_key = _freeze(context)
+        return (
+            agent.type,
+            getattr(agent, 'agent_id', None),
+            self._context_key,
+            _freeze(agent.state),
+            _freeze(agent.attributes)
+        )
+    
+    def lookup(self, agent: Agent, context: Dict[str, Any]) -> Tuple[Hashable, Optional[Dict[str, Any]]]:
+        """
+        Look up a cached decision, recording it in the agent history on a hit
+        
+        Returns:
+            Tuple of (cache key, decision or None on a miss)
+        """
+        key = self._key(agent, context)
+        decision = self._entries.get(key)
+        if decision is None:
+            self.misses += 1
+            return key, None
+        
+        if self.refresh_probability and random.random() < self.refresh_probability:
+            # Re-query; the fresh decision replaces this entry in ``store``
+            self.refreshes += 1
+            self.misses += 1
+            return key, None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        decision = dict(decision)
+        agent._record_decision(context, decision)
+        return key, decision
+    
+    def store(self, agent: Agent, key: Hashable, decision: Dict[str, Any]):
+        """Cache a decision unless the agent fell back to its default"""
+        if agent._last_is_fallback:
+            return
+        self._entries[key] = dict(decision)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def decide(self, agent: Agent, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a cached decision or call ``agent.decide`` on a miss"""
+        key, decision = self.lookup(agent, context)
+        if decision is None:
+            decision = agent.decide(context)
+            self.store(agent, key, decision)
+        return decision
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss statistics"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'refreshes': self.refreshes,
+            'size': len(self._entries)
+        }
+
+
+def decide_batch(
+    agents: List[Agent],
+    context: Dict[str, Any],
+    batched: bool = False,
+    cache: Optional[DecisionCache] = None,
+    concurrent: bool = False
+) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Exception]]]:
+    """
+    Collect decisions for a group of agents sharing one environment context
+    
+    Agents whose ``decide`` raises fall back to their default decision, so
+    the returned decisions always line up index-for-index with ``agents``.
+    
+    Args:
+        agents: Agents to query (typically all agents of one type)
+        context: Current simulation context shared by the group
+        batched: Pack the group's prompts into batched LLM requests
+            (see ``batch_decide``) instead of one request per agent
+        cache: Optional decision cache; only cache misses are queried
+        concurrent: Issue the per-agent requests concurrently with
+            ``run_round``, or ``run_round_threaded`` when an event loop is
+            already running (ignored when ``batched`` is set)
+        
+    Returns:
+        Tuple of (decisions aligned with agents, list of (index, error)
+        for agents that fell back after an exception)
+    """
+    decisions = [None] * len(agents)
+    errors = []
+    keys = {}
+    
+    if cache is not None:
+        for i, agent in enumerate(agents):
+            keys[i], decisions[i] = cache.lookup(agent, context)
+        pending = [i for i, decision in enumerate(decisions) if decision is None]
+    else:
+        pending = range(len(agents))
+    
+    if batched and pending:
+        batch = batch_decide([agents[i] for i in pending], context)
+        for i, decision in zip(pending, batch):
+            decisions[i] = decision
+    elif concurrent and pending:
+        results = _run_concurrent(
+            [agents[i] for i in pending], [context] * len(pending)
+        )
+        for i, result in zip(pending, results):
+            if isinstance(result, Exception):
+                errors.append((i, result))
+                decisions[i] = agents[i]._get_default_decision()
+                keys.pop(i, None)
+            else:
+                decisions[i] = result
+    else:
+        for i in pending:
+            agent = agents[i]
+            try:
+                decisions[i] = agent.decide(context)
+            except Exception as e:
+                errors.append((i, e))
+                decisions[i] = agent._get_default_decision()
+                keys.pop(i, None)
+    
+    if cache is not None:
+        for i in pending:
+            if i in keys:
+                cache.store(agents[i], keys[i], decisions[i])
+    
+    return decisions, errors
+
+
 def create_agents(agents_config: Dict[str, Any], city: str, num_enterprises: int = 10, num_residents: int = 100) -> Dict[str, Any]:
     """
     Create agent instances based on configuration
@@ -361,11 +1127,12 @@ def create_agents(agents_config: Dict[str, Any], city: str, num_enterprises: int
     # Create government agent
     government = GovernmentAgent(agents_config['government'], city)
     
-    # Create enterprise agents (configurable number)
+    # Create enterprise agents (configurable number); ids are interned since
+    # they key the per-round interaction routing
     enterprises = []
     for i in range(num_enterprises):
         enterprise = EnterpriseAgent(agents_config['enterprise'], city)
-        enterprise.agent_id = f"enterprise_{i}"
+        enterprise.agent_id = sys.intern(f"enterprise_{i}")
         enterprises.append(enterprise)
     
     # Create resident agents (configurable number)
@@ -373,11 +1140,12 @@ def create_agents(agents_config: Dict[str, Any], city: str, num_enterprises: int
     area_types = ['core_area', 'urban_rural_fringe', 'rural']
     area_weights = [0.5, 0.3, 0.2]  # Distribution weights
     
-    for i in range(num_residents):
-        # Randomly assign area type based on weights
-        area_type = random.choices(area_types, weights=area_weights)[0]
+    # Randomly assign area types based on weights, all in one draw
+    resident_areas = random.choices(area_types, weights=area_weights, k=num_residents)
+    
+    for i, area_type in enumerate(resident_areas):
         resident = ResidentAgent(agents_config['resident'], city, area_type)
-        resident.agent_id = f"resident_{i}"
+        resident.agent_id = sys.intern(f"resident_{i}")
         resident.area = area_type
         residents.append(resident)
     
@@ -0,0 +1,311 @@
+"""
+Slotted state and attribute records for the simulation agents
+"""
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, fields
+from typing import Dict, Any, ClassVar, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(slots=True, eq=False)
+class AgentRecord(MutableMapping):
+    """
+    Base record with typed, slotted fields and a dict-compatible interface
+    
+    Keys known from the agent configuration are stored in slots, so they
+    can be read as plain attributes (``state.satisfaction``). Every other
+    key, e.g. attributes added later by policies, lives in ``extra``. The
+    record behaves like a dict for ``get``, ``[]``, ``in``, iteration and
+    ``**`` unpacking, and ``copy`` returns a plain dict.
+    """
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    # Names of the slotted fields, filled in by ``_record``
+    _FIELDS: ClassVar[frozenset] = frozenset()
+    _FIELD_NAMES: ClassVar[Tuple[str, ...]] = ()
+    
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> 'AgentRecord':
+        """
+        Build a record from a configuration mapping
+        
+        Args:
+            data: Configuration values (e.g. ``initial_state``)
+        
+        Returns:
+            Record with known keys in fields and the rest in ``extra``
+        """
+        known = cls._FIELDS
+        return cls(
+            extra={key: value for key, value in data.items() if key not in known},
+            **{key: value for key, value in data.items() if key in known}
+        )
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+    
+    def __setitem__(self, key: str, value: Any):
+        if key in self._FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+    
+    def __delitem__(self, key: str):
+        if key in self._FIELDS:
+            raise KeyError(f"cannot remove record field {key!r}")
+        del self.extra[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        yield from self._FIELD_NAMES
+        yield from self.extra
+    
+    def __len__(self) -> int:
+        return len(self._FIELD_NAMES) + len(self.extra)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._FIELDS or key in self.extra
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+    
+    def copy(self) -> Dict[str, Any]:
+        """Shallow copy as a plain dict"""
+        result = {name: getattr(self, name) for name in self._FIELD_NAMES}
+        result.update(self.extra)
+        return result
+
+
+def _record(cls):
+    """Make ``cls`` a slotted record dataclass and index its fields"""
+    cls = dataclass(slots=True, eq=False)(cls)
+    cls._FIELD_NAMES = tuple(f.name for f in fields(cls) if f.name != 'extra')
+    cls._FIELDS = frozenset(cls._FIELD_NAMES)
+    return cls
+
+
+@_record
+class GovernmentAttributes(AgentRecord):
+    governance_preference: str = 'fairness'
+    financial_resources: int = 100
+    technical_capability: int = 80
+    policy_toolkit: List[str] = field(default_factory=list)
+    information_transparency: int = 70
+    platform_regulation: int = 90
+
+
+@_record
+class GovernmentState(AgentRecord):
+    policy_goals: List[str] = field(default_factory=list)
+    data_sharing_level: int = 30
+    resource_utilization: float = 0.7
+
+
+@_record
+class EnterpriseAttributes(AgentRecord):
+    technology_type: str = 'government_project'
+    data_collection_strategy: str = 'compliant'
+    market_coverage: str = 'local'
+
+
+@_record
+class EnterpriseState(AgentRecord):
+    innovation_level: int = 50
+    data_usage_compliance: int = 90
+    market_share: float = 0.1
+
+
+@_record
+class ResidentAttributes(AgentRecord):
+    information_literacy: int = 60
+    income_level: int = 5000
+    trust_in_government: int = 80
+    technology_acceptance: int = 70
+
+
+@_record
+class ResidentState(AgentRecord):
+    digital_access: bool = True
+    service_usage_frequency: int = 5
+    satisfaction: float = 3.0
+
+
+# Interaction codes understood by ResidentPool/EnterprisePool.apply_results
+RESULT_OTHER, RESULT_SUCCESS, RESULT_FAILURE = 0, 1, 2
+KIND_OTHER, KIND_SERVICE, KIND_DEMAND = 0, 1, 2
+KIND_PROCUREMENT, KIND_SUPPLY = 3, 4
+
+
+def _occurrences(rows: np.ndarray) -> np.ndarray:
+    """Occurrence number of each event within its row, in event order"""
+    order = np.argsort(rows, kind='stable')
+    sorted_rows = rows[order]
+    starts = np.flatnonzero(np.r_[True, sorted_rows[1:] != sorted_rows[:-1]])
+    group_start = np.repeat(starts, np.diff(np.r_[starts, rows.size]))
+    occurrence = np.empty_like(order)
+    occurrence[order] = np.arange(rows.size) - group_start
+    return occurrence
+
+
+class ResidentPool:
+    """
+    Columnar (structure-of-arrays) view of the residents' mutable numbers
+    
+    Satisfaction and trust are gathered into parallel NumPy arrays so one
+    round of interaction results is applied with masked vectorized updates
+    instead of per-resident ``min``/``max`` calls, then written back to the
+    residents' records.
+    """
+    
+    __slots__ = ('residents', 'satisfaction', 'trust')
+    
+    def __init__(self, residents: Sequence[Any]):
+        """
+        Initialize ResidentPool
+        
+        Args:
+            residents: Resident agents; pool rows follow this order
+        """
+        self.residents = residents
+        n = len(residents)
+        self.satisfaction = np.fromiter(
+            (r.state.get('satisfaction', 3.0) for r in residents), dtype=np.float64, count=n
+        )
+        # Let NumPy infer the dtype so integer trust levels stay integers
+        self.trust = np.array([r.attributes.get('trust_in_government', 80) for r in residents])
+    
+    def apply_results(self, rows: np.ndarray, kinds: np.ndarray, results: np.ndarray):
+        """
+        Apply interaction results to the pooled values
+        
+        Events are given in interaction order. A resident's events are
+        applied in that order (one vectorized pass per occurrence), so the
+        clamping matches sequential per-interaction updates exactly.
+        
+        Args:
+            rows: Pool row of the resident in each event
+            kinds: KIND_* code of each event's interaction type
+            results: RESULT_* code of each event's outcome
+        """
+        if rows.size == 0:
+            return
+        
+        occurrence = _occurrences(rows)
+        
+        satisfaction = self.satisfaction
+        trust = self.trust
+        for k in range(int(occurrence.max()) + 1):
+            step = occurrence == k
+            step_rows = rows[step]
+            step_kinds = kinds[step]
+            step_results = results[step]
+            
+            success = step_results == RESULT_SUCCESS
+            failure = step_results == RESULT_FAILURE
+            demand = step_kinds == KIND_DEMAND
+            
+            # Service provided: satisfaction up
+            r = step_rows[success & (step_kinds == KIND_SERVICE)]
+            satisfaction[r] = np.minimum(5.0, satisfaction[r] + 0.1)
+            # Demand answered: trust up
+            r = step_rows[success & demand]
+            trust[r] = np.minimum(100, trust[r] + 1)
+            # Failed or ignored: satisfaction down, and trust for demands
+            r = step_rows[failure]
+            satisfaction[r] = np.maximum(1.0, satisfaction[r] - 0.05)
+            r = step_rows[failure & demand]
+            trust[r] = np.maximum(0, trust[r] - 2)
+    
+    def write_back(self, rows: np.ndarray):
+        """
+        Store the pooled values of the given rows in the residents' records
+        
+        Args:
+            rows: Pool rows to write (typically those touched this round)
+        """
+        rows = np.unique(rows)
+        residents = self.residents
+        for i, satisfaction, trust in zip(
+            rows.tolist(), self.satisfaction[rows].tolist(), self.trust[rows].tolist()
+        ):
+            resident = residents[i]
+            resident.state['satisfaction'] = satisfaction
+            resident.attributes['trust_in_government'] = trust
+
+
+class EnterprisePool:
+    """
+    Columnar view of the enterprises' innovation level and market share
+    
+    Counterpart of ResidentPool for the enterprise side of a round: the
+    results are applied as masked vectorized updates, then written back to
+    the enterprises' records.
+    """
+    
+    __slots__ = ('enterprises', 'innovation_level', 'market_share')
+    
+    def __init__(self, enterprises: Sequence[Any]):
+        """
+        Initialize EnterprisePool
+        
+        Args:
+            enterprises: Enterprise agents; pool rows follow this order
+        """
+        self.enterprises = enterprises
+        # Let NumPy infer the dtype so integer innovation levels stay integers
+        self.innovation_level = np.array([e.state.get('innovation_level', 50) for e in enterprises])
+        self.market_share = np.fromiter(
+            (e.state.get('market_share', 0.1) for e in enterprises), dtype=np.float64, count=len(enterprises)
+        )
+    
+    def apply_results(self, rows: np.ndarray, kinds: np.ndarray, results: np.ndarray):
+        """
+        Apply interaction results to the pooled values
+        
+        Events are applied in order per enterprise, one vectorized pass per
+        occurrence, so the capped float increments match sequential updates.
+        
+        Args:
+            rows: Pool row of the enterprise in each event
+            kinds: KIND_* code of each event's interaction type
+            results: RESULT_* code of each event's outcome
+        """
+        if rows.size == 0:
+            return
+        
+        occurrence = _occurrences(rows)
+        
+        innovation_level = self.innovation_level
+        market_share = self.market_share
+        for k in range(int(occurrence.max()) + 1):
+            step = occurrence == k
+            success = results[step] == RESULT_SUCCESS
+            step_rows = rows[step]
+            step_kinds = kinds[step]
+            
+            # Procurement won: innovation up
+            r = step_rows[success & (step_kinds == KIND_PROCUREMENT)]
+            innovation_level[r] = np.minimum(100, innovation_level[r] + 2)
+            # Service supplied: market share up
+            r = step_rows[success & (step_kinds == KIND_SUPPLY)]
+            market_share[r] = np.minimum(1.0, market_share[r] + 0.01)
+    
+    def write_back(self, rows: np.ndarray):
+        """
+        Store the pooled values of the given rows in the enterprises' records
+        
+        Args:
+            rows: Pool rows to write (typically those touched this round)
+        """
+        rows = np.unique(rows)
+        enterprises = self.enterprises
+        for i, innovation_level, market_share in zip(
+            rows.tolist(), self.innovation_level[rows].tolist(), self.market_share[rows].tolist()
+        ):
+            state = enterprises[i].state
+            state['innovation_level'] = innovation_level
+            state['market_share'] = market_share
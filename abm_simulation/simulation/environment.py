@@ -2,23 +2,80 @@
 Environment class for ABM digital governance simulation
 """
 import random
-from typing import Dict, Any, List
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, NamedTuple, Optional
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Interaction types that count as service requests for the system load
+SERVICE_REQUEST_TYPES = ('service_request', 'data_request', 'service_use')
+
+# Areas whose service quality is tracked
+SERVICE_AREAS = ('core_area', 'urban_rural_fringe', 'rural')
+
+
+class _RoundTally(NamedTuple):
+    """Counts from one pass over a round's interactions"""
+    types: Counter
+    failures: int
+    digital_usage: int
+    physical_usage: int
+    total: int
+    # area -> [interactions, successful interactions]
+    area_counts: Dict[str, List[int]]
+
+
+def _tally_interactions(interactions: List[Dict[str, Any]]) -> _RoundTally:
+    """Count everything Environment.update needs in a single pass"""
+    types = Counter()
+    failures = digital_usage = physical_usage = 0
+    area_counts = {area: [0, 0] for area in SERVICE_AREAS}
+    
+    for interaction in interactions:
+        get = interaction.get
+        types[get('type')] += 1
+        
+        outcome = get('outcome')
+        if outcome == 'system_failure':
+            failures += 1
+        
+        service_type = get('service_type')
+        if service_type == 'digital':
+            digital_usage += 1
+        elif service_type == 'physical':
+            physical_usage += 1
+        
+        counts = area_counts.get(get('area', 'core_area'))
+        if counts is not None:
+            counts[0] += 1
+            if outcome == 'success':
+                counts[1] += 1
+    
+    return _RoundTally(types, failures, digital_usage, physical_usage, len(interactions), area_counts)
+
 
 class Environment:
     """Environment class managing infrastructure and policy context"""
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], seed: Optional[int] = None):
         """
         Initialize Environment
         
         Args:
             config: Environment configuration from JSON
+            seed: Seed of the environment's random generator; drawn from
+                the ``random`` module when None, so ``random.seed`` still
+                makes whole runs reproducible
         """
-        self.config = config.copy()
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.rng = np.random.default_rng(seed)
+        
+        self.config = config
         self.digital_infrastructure = config.get('digital_infrastructure', {}).copy()
         self.physical_infrastructure = config.get('physical_infrastructure', {}).copy()
         self.policy_environment = config.get('policy_environment', {}).copy()
@@ -41,14 +98,26 @@ class Environment:
             'digital': 0.6,
             'physical': 0.7
         }
+        
+        # Context of the current round, rebuilt after the environment changes
+        self._context_cache = None
     
-    def get_context(self) -> Dict[str, Any]:
+    def get_context(self) -> Mapping[str, Any]:
         """
         Get current environment context for agents
         
+        The context is built once per round and shared by all callers until
+        the next ``update`` or policy intervention.
+        
         Returns:
-            Environment context dictionary
+            Read-only environment context mapping
         """
+        if self._context_cache is None:
+            self._context_cache = MappingProxyType(self._build_context())
+        return self._context_cache
+    
+    def _build_context(self) -> Dict[str, Any]:
+        """Assemble the environment context dictionary"""
         # Calculate average infrastructure level
         avg_digital = sum(self.digital_infrastructure.values()) / len(self.digital_infrastructure)
         avg_physical = sum(self.physical_infrastructure.values()) / len(self.physical_infrastructure)
@@ -95,32 +164,33 @@ class Environment:
             interactions: List of interactions from this round
         """
         self.update_count += 1
+        self._context_cache = None
+        
+        # Count the round's interactions once for all updates below
+        tally = _tally_interactions(interactions)
         
         # Update system load based on interactions
-        self._update_system_load(interactions)
+        self._update_system_load(tally)
         
         # Update service availability
-        self._update_service_availability(interactions)
+        self._update_service_availability(tally)
         
         # Check for emergency events
         self._check_emergency_events()
         
         # Update infrastructure utilization
-        self._update_infrastructure_utilization(interactions)
+        self._update_infrastructure_utilization(tally)
         
         # Update service quality by area
-        self._update_service_quality(interactions)
+        self._update_service_quality(tally)
         
         # Random environmental changes
         self._apply_random_changes()
     
-    def _update_system_load(self, interactions: List[Dict[str, Any]]):
+    def _update_system_load(self, tally: _RoundTally):
         """Update system load based on interactions"""
         # Count service requests
-        service_requests = len([
-            i for i in interactions 
-            if i.get('type') in ['service_request', 'data_request', 'service_use']
-        ])
+        service_requests = sum(tally.types[t] for t in SERVICE_REQUEST_TYPES)
         
         # Calculate load factor
         load_factor = min(1.0, service_requests / 50)  # Assume capacity of 50 requests
@@ -129,7 +199,7 @@ class Environment:
         self.system_load = 0.7 * self.system_load + 0.3 * load_factor
         self.system_load = max(0.0, min(1.0, self.system_load))
     
-    def _update_service_availability(self, interactions: List[Dict[str, Any]]):
+    def _update_service_availability(self, tally: _RoundTally):
         """Update service availability based on system load"""
         # Service availability decreases with high load
         if self.system_load > 0.8:
@@ -140,13 +210,8 @@ class Environment:
             availability_change = 0.0
         
         # Check for system failures in interactions
-        failures = [
-            i for i in interactions 
-            if i.get('outcome') == 'system_failure'
-        ]
-        
-        if failures:
-            availability_change -= 0.1 * len(failures)
+        if tally.failures:
+            availability_change -= 0.1 * tally.failures
         
         # Update availability
         self.service_availability += availability_change
@@ -154,34 +219,26 @@ class Environment:
     
     def _check_emergency_events(self):
         """Check for random emergency events"""
+        trigger_draw, resolve_draw = self.rng.random(2)
+        
         # 2% chance of emergency event per round
-        if random.random() < 0.02:
+        if trigger_draw < 0.02:
             self.emergency_status = True
             self.service_availability *= 0.7  # Reduce service availability
             logger.info(f"Emergency event triggered at round {self.update_count}")
         elif self.emergency_status:
             # 30% chance to resolve emergency each round
-            if random.random() < 0.3:
+            if resolve_draw < 0.3:
                 self.emergency_status = False
                 logger.info(f"Emergency resolved at round {self.update_count}")
     
-    def _update_infrastructure_utilization(self, interactions: List[Dict[str, Any]]):
+    def _update_infrastructure_utilization(self, tally: _RoundTally):
         """Update infrastructure utilization"""
-        # Count digital vs physical service usage
-        digital_usage = len([
-            i for i in interactions 
-            if i.get('service_type') == 'digital'
-        ])
-        
-        physical_usage = len([
-            i for i in interactions 
-            if i.get('service_type') == 'physical'
-        ])
-        
-        total_interactions = len(interactions)
+        total_interactions = tally.total
         if total_interactions > 0:
-            digital_ratio = digital_usage / total_interactions
-            physical_ratio = physical_usage / total_interactions
+            # Share of digital vs physical service usage
+            digital_ratio = tally.digital_usage / total_interactions
+            physical_ratio = tally.physical_usage / total_interactions
             
             # Update utilization (smooth changes)
             self.infrastructure_utilization['digital'] = (
@@ -193,27 +250,12 @@ class Environment:
                 0.2 * physical_ratio
             )
     
-    def _update_service_quality(self, interactions: List[Dict[str, Any]]):
+    def _update_service_quality(self, tally: _RoundTally):
         """Update service quality by area"""
-        # Group interactions by area
-        area_interactions = {
-            'core_area': [],
-            'urban_rural_fringe': [],
-            'rural': []
-        }
-        
-        for interaction in interactions:
-            area = interaction.get('area', 'core_area')
-            if area in area_interactions:
-                area_interactions[area].append(interaction)
-        
         # Update quality based on successful interactions
-        for area, area_interactions_list in area_interactions.items():
-            if area_interactions_list:
-                success_rate = len([
-                    i for i in area_interactions_list 
-                    if i.get('outcome') == 'success'
-                ]) / len(area_interactions_list)
+        for area, (count, successes) in tally.area_counts.items():
+            if count:
+                success_rate = successes / count
                 
                 # Update service quality (smooth changes)
                 quality_change = (success_rate - 0.7) * 0.05  # Target 70% success rate
@@ -222,11 +264,11 @@ class Environment:
     
     def _apply_random_changes(self):
         """Apply small random changes to environment"""
-        # Small random changes to infrastructure (±1%)
-        for area in self.digital_infrastructure:
-            change = random.uniform(-1, 1)
-            self.digital_infrastructure[area] = max(0, min(100, 
-                self.digital_infrastructure[area] + change))
+        # Small random changes to infrastructure (±1%), drawn for all areas at once
+        infrastructure = self.digital_infrastructure
+        changes = self.rng.uniform(-1, 1, size=len(infrastructure))
+        for area, change in zip(infrastructure, changes.tolist()):
+            infrastructure[area] = max(0, min(100, infrastructure[area] + change))
         
         # Emergency events can degrade infrastructure
         if self.emergency_status:
@@ -244,6 +286,7 @@ class Environment:
         target = policy_config.get('target', '')
         
         if target == 'environment':
+            self._context_cache = None
             attribute_changes = policy_config.get('attribute_change', {})
             
             # Apply infrastructure improvements
@@ -1,25 +1,357 @@
 """
 Interaction engine for ABM digital governance simulation
 """
+import sys
 import random
 import logging
-from typing import Dict, Any, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: the kernel runs as plain NumPy without numba
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+from .agent_state import (
+    EnterprisePool, ResidentPool,
+    RESULT_OTHER, RESULT_SUCCESS, RESULT_FAILURE,
+    KIND_OTHER, KIND_SERVICE, KIND_DEMAND, KIND_PROCUREMENT, KIND_SUPPLY
+)
 
 logger = logging.getLogger(__name__)
 
+# Integer codes for the decision fields that drive interaction matching
+TARGET_CODES = {
+    'government': 1, 'gov': 2,
+    'enterprises': 3, 'enterprise': 3
+}
+ACTION_CODES = {
+    'provide_feedback': 1, 'request_service': 2,
+    'service_development': 3, 'service_promotion': 4
+}
+
+# Interaction type/outcome codes for the bulk resident state update
+RESIDENT_KIND_CODES = {'service_provision': KIND_SERVICE, 'demand_response': KIND_DEMAND}
+RESIDENT_RESULT_CODES = {'success': RESULT_SUCCESS, 'failed': RESULT_FAILURE, 'ignored': RESULT_FAILURE}
+
+# Interaction types that change enterprise state when successful
+ENTERPRISE_KIND_CODES = {'procurement_cooperation': KIND_PROCUREMENT, 'service_supply': KIND_SUPPLY}
+
+# Government decision targets that address all enterprises
+GOV_ENT_TARGETS = ('enterprises', 'enterprise')
+
+# Outcome -> direction of the government resource utilization step
+GOV_STEP_CODES = {'success': 1, 'failed': -1, 'violation': -1}
+
+# Default number of recent interactions kept by the engine; the logger
+# persists the full history
+INTERACTION_HISTORY_WINDOW = 10_000
+
+# Rounds with at least this many enterprises + residents process the four
+# interaction channels on worker threads
+PARALLEL_INTERACTION_THRESHOLD = 5_000
+
+# Integer area codes; areas outside the table share AREA_OTHER
+AREA_CODES = {'core_area': 0, 'urban_rural_fringe': 1, 'rural': 2}
+AREA_OTHER = 3
+
+# Simulated infrastructure quality for government service provision, indexed by area code
+SERVICE_INFRASTRUCTURE_QUALITY = np.array([0.9, 0.7, 0.5, 0.7], dtype=np.float64)
+
+
+def _encode_decisions(decisions: List[Dict[str, Any]], field: str, codes: Dict[str, int]) -> np.ndarray:
+    """Encode one categorical decision field as int8 codes (0 = unmatched)"""
+    return np.fromiter(
+        (codes.get(v, 0) if isinstance(v, str) else 0
+         for v in (d.get(field) for d in decisions)),
+        dtype=np.int8, count=len(decisions)
+    )
+
+
+def _float_column(agents: List[Any], mapping: str, key: str, default: float) -> np.ndarray:
+    """Gather one numeric field of the agents' state or attributes dicts"""
+    return np.fromiter(
+        (getattr(agent, mapping).get(key, default) for agent in agents),
+        dtype=np.float64, count=len(agents)
+    )
+
+
+@njit(cache=True)
+def _match_kernel(ent_targets, ent_actions, res_targets, res_actions):
+    """
+    Match encoded decisions to the interaction channels they open
+    
+    Returns:
+        Boolean masks (enterprise -> government, enterprise -> resident
+        service supply, resident -> government)
+    """
+    ent_to_gov = (ent_targets == 1) | (ent_targets == 2)
+    ent_service = (ent_actions == 3) | (ent_actions == 4)
+    res_to_gov = (res_targets == 1) & ((res_actions == 1) | (res_actions == 2))
+    return ent_to_gov, ent_service, res_to_gov
+
+
+@njit(cache=True)
+def _sample_outcomes(success_prob, draws):
+    """Success mask of independent Bernoulli trials from pre-drawn uniforms"""
+    n = success_prob.shape[0]
+    out = np.empty(n, np.bool_)
+    for i in range(n):
+        out[i] = draws[i] < success_prob[i]
+    return out
+
+
+@njit(cache=True)
+def _clamped_walk(value, steps, step, lo, hi):
+    """
+    Apply unit steps (+1 up, -1 down, 0 none) of size ``step`` in order
+    
+    Upward steps are capped at ``hi`` and downward steps floored at ``lo``,
+    matching sequential ``min(hi, v + step)`` / ``max(lo, v - step)``.
+    """
+    for i in range(steps.shape[0]):
+        if steps[i] > 0:
+            value = value + step
+            if value > hi:
+                value = hi
+        elif steps[i] < 0:
+            value = value - step
+            if value < lo:
+                value = lo
+    return value
+
+
+class _AreaBuckets:
+    """
+    Residents grouped by area for stratified pair sampling
+    
+    Drawing "same area or not" first and then a pair from the matching
+    strata gives the same pair distribution as drawing uniformly random
+    pairs and checking their areas.
+    """
+    
+    __slots__ = ('buckets', 'same_weights', 'cross_pairs', 'cross_weights', 'p_same')
+    
+    def __init__(self, areas: List[str]):
+        groups = {}
+        for i, area in enumerate(areas):
+            groups.setdefault(area, []).append(i)
+        self.buckets = [np.array(rows, dtype=np.int64) for rows in groups.values()]
+        
+        sizes = np.array([rows.size for rows in self.buckets], dtype=np.int64)
+        same = sizes * (sizes - 1)  # ordered same-area pairs per area
+        cross = np.outer(sizes, sizes)  # ordered cross-area pairs per area pair
+        np.fill_diagonal(cross, 0)
+        self.cross_pairs = np.argwhere(cross > 0)
+        
+        n = int(sizes.sum())
+        self.p_same = int(same.sum()) / (n * (n - 1))
+        self.same_weights = same / same.sum() if same.sum() else same.astype(np.float64)
+        cross_weights = cross[cross > 0]
+        self.cross_weights = cross_weights / cross_weights.sum() if cross_weights.size else cross_weights
+    
+    def sample_pair(self, rng: np.random.Generator, same_area: bool) -> Tuple[int, int]:
+        """Random ordered pair of distinct residents, from one area or from two"""
+        buckets = self.buckets
+        if same_area:
+            bucket = buckets[rng.choice(len(buckets), p=self.same_weights)]
+            first, second = rng.choice(bucket.size, size=2, replace=False).tolist()
+            return int(bucket[first]), int(bucket[second])
+        
+        a, b = self.cross_pairs[rng.choice(len(self.cross_pairs), p=self.cross_weights)].tolist()
+        return int(rng.choice(buckets[a])), int(rng.choice(buckets[b]))
+
+
+@dataclass(slots=True)
+class Interaction:
+    """
+    One interaction result
+    
+    Slotted record in place of the former interaction dict; ``get``/``[]``/
+    ``in`` keep dict-style reads working, with unset optional fields (None)
+    treated as missing keys. ``to_dict`` gives the JSON form.
+    """
+    type: str
+    participants: Tuple[str, ...]
+    outcome: str
+    effect: str
+    area: Optional[str] = None
+    service_type: Optional[str] = None
+    compliance: Optional[bool] = None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style read of a field"""
+        value = getattr(self, key) if key in _INTERACTION_FIELDS else None
+        return default if value is None else value
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the JSON-serializable interaction dict"""
+        record = {
+            'type': self.type,
+            'participants': self.participants,
+            'outcome': self.outcome,
+            'effect': self.effect
+        }
+        if self.area is not None:
+            record['area'] = self.area
+        if self.service_type is not None:
+            record['service_type'] = self.service_type
+        if self.compliance is not None:
+            record['compliance'] = self.compliance
+        return record
+
+
+_INTERACTION_FIELDS = frozenset(Interaction.__slots__)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRules:
+    """Interaction rule probabilities and effects with their defaults resolved"""
+    procurement_probability: float
+    procurement_effect: str
+    regulation_effect: str
+    data_sharing_probability: float
+    data_sharing_effect: str
+    service_provision_probability: float
+    service_provision_effect: str
+    demand_response_probability: float
+    demand_response_effect: str
+    service_supply_probability: float
+    service_supply_effect: str
+    
+    @classmethod
+    def from_config(cls, rules_config: Dict[str, Any]) -> 'CompiledRules':
+        """Resolve the rules configuration once, interning the effect strings"""
+        gov_ent = rules_config.get('government_enterprise', {})
+        gov_res = rules_config.get('government_resident', {})
+        ent_res = rules_config.get('enterprise_resident', {})
+        procurement = gov_ent.get('procurement_cooperation', {})
+        regulation = gov_ent.get('regulation', {})
+        data_sharing = gov_ent.get('data_sharing', {})
+        service_provision = gov_res.get('service_provision', {})
+        demand_response = gov_res.get('demand_response', {})
+        service_supply = ent_res.get('service_supply', {})
+        return cls(
+            procurement_probability=procurement.get('probability', 0.7),
+            procurement_effect=sys.intern(procurement.get('effect', '')),
+            regulation_effect=sys.intern(regulation.get('effect', '')),
+            data_sharing_probability=data_sharing.get('probability', 0.3),
+            data_sharing_effect=sys.intern(data_sharing.get('effect', '')),
+            service_provision_probability=service_provision.get('probability', 0.8),
+            service_provision_effect=sys.intern(service_provision.get('effect', '')),
+            demand_response_probability=demand_response.get('probability', 0.7),
+            demand_response_effect=sys.intern(demand_response.get('effect', '')),
+            service_supply_probability=service_supply.get('probability', 0.8),
+            service_supply_effect=sys.intern(service_supply.get('effect', ''))
+        )
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable snapshot of a JSON-like configuration value"""
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((str(k), _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ('list', tuple(_freeze(v) for v in value))
+    return value
+
+
+class _RulesKey:
+    """Cache key comparing rules configurations by content"""
+    
+    __slots__ = ('rules', 'frozen', '_hash')
+    
+    def __init__(self, rules_config: Dict[str, Any]):
+        self.rules = rules_config
+        self.frozen = _freeze(rules_config)
+        self._hash = hash(self.frozen)
+    
+    def __hash__(self) -> int:
+        return self._hash
+    
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _RulesKey) and self.frozen == other.frozen
+
+
+@lru_cache(maxsize=4)
+def _compile_rules(key: _RulesKey) -> CompiledRules:
+    """Compile a rules configuration, shared by engines with equal rules"""
+    return CompiledRules.from_config(key.rules)
+
 
 class InteractionEngine:
     """Engine for processing agent interactions based on rules"""
     
-    def __init__(self, rules_config: Dict[str, Any]):
+    def __init__(self, rules_config: Dict[str, Any], seed: Optional[int] = None):
         """
         Initialize InteractionEngine
         
         Args:
-            rules_config: Interaction rules configuration
+            rules_config: Interaction rules configuration; an optional
+                ``history_window`` sets how many recent interactions are kept
+            seed: Seed of the generator for interaction outcomes; drawn from
+                the ``random`` module when None, so ``random.seed`` still
+                makes whole runs reproducible
         """
-        self.rules = rules_config.copy()
-        self.interaction_history = []
+        self.rules = rules_config
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.rng = np.random.default_rng(seed)
+        # One independent stream per interaction channel, so outcomes are the
+        # same whether the channels run serially or on worker threads
+        self._channel_rngs = [
+            np.random.default_rng(channel_seed)
+            for channel_seed in self.rng.integers(2**63, size=4).tolist()
+        ]
+        self._executor = None
+        # Government action -> batch creator of its enterprise interactions
+        self._gov_ent_handlers = {
+            'procurement_cooperation': self._procurement_batch,
+            'regulation': self._regulation_batch,
+            'data_sharing': self._data_sharing_batch
+        }
+        self.interaction_history = deque(
+            maxlen=self.rules.get('history_window', INTERACTION_HISTORY_WINDOW)
+        )
+        # (residents list, its length, _AreaBuckets) of the last round
+        self._area_buckets = None
+    
+    @property
+    def rules(self) -> Dict[str, Any]:
+        """Interaction rules configuration"""
+        return self._rules
+    
+    @rules.setter
+    def rules(self, rules_config: Dict[str, Any]):
+        # Assigning new rules recompiles them; edit a copy and assign it back
+        self._rules = rules_config.copy()
+        self.compiled = _compile_rules(_RulesKey(self._rules))
+    
+    def reload_rules(self, rules_config: Dict[str, Any]):
+        """
+        Replace the interaction rules, e.g. after editing the configuration
+        
+        Args:
+            rules_config: New interaction rules configuration
+        """
+        self.rules = rules_config
     
     def process(
         self, 
@@ -29,7 +361,7 @@ class InteractionEngine:
         gov_decision: Dict[str, Any],
         ent_decisions: List[Dict[str, Any]],
         res_decisions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Interaction]:
         """
         Process all agent interactions for one round
         
@@ -46,106 +378,140 @@ class InteractionEngine:
         """
         interactions = []
         
-        # Process government-enterprise interactions
-        interactions.extend(
-            self._process_government_enterprise_interactions(
-                government, enterprises, gov_decision, ent_decisions
-            )
+        # Look up agent ids and resident areas once per round
+        ent_ids = [getattr(enterprise, 'agent_id', 'enterprise') for enterprise in enterprises]
+        res_ids = [getattr(resident, 'agent_id', 'resident') for resident in residents]
+        res_areas = [getattr(resident, 'area', 'core_area') for resident in residents]
+        res_area_codes = np.fromiter(
+            (AREA_CODES.get(area, AREA_OTHER) for area in res_areas), dtype=np.int8, count=len(res_areas)
         )
         
-        # Process government-resident interactions
-        interactions.extend(
-            self._process_government_resident_interactions(
-                government, residents, gov_decision, res_decisions
-            )
-        )
-        
-        # Process enterprise-resident interactions
-        interactions.extend(
-            self._process_enterprise_resident_interactions(
-                enterprises, residents, ent_decisions, res_decisions
-            )
+        # Match decisions to interaction channels in one vectorized pass
+        ent_decisions = ent_decisions[:len(enterprises)]
+        res_decisions = res_decisions[:len(residents)]
+        ent_to_gov, ent_service, res_to_gov = _match_kernel(
+            _encode_decisions(ent_decisions, 'target', TARGET_CODES),
+            _encode_decisions(ent_decisions, 'action', ACTION_CODES),
+            _encode_decisions(res_decisions, 'target', TARGET_CODES),
+            _encode_decisions(res_decisions, 'action', ACTION_CODES)
         )
         
-        # Process resident-resident interactions (limited)
-        interactions.extend(
-            self._process_resident_resident_interactions(
-                residents, res_decisions
-            )
-        )
-        
-        # Store interaction history
+        # The four channels only read agent state, so they are independent
+        channels = [
+            # Government-enterprise interactions
+            (self._process_government_enterprise_interactions,
+             (government, enterprises, ent_ids, gov_decision, ent_decisions, ent_to_gov)),
+            # Government-resident interactions
+            (self._process_government_resident_interactions,
+             (government, res_ids, res_areas, res_area_codes, gov_decision, res_decisions, res_to_gov)),
+            # Enterprise-resident interactions
+            (self._process_enterprise_resident_interactions,
+             (enterprises, residents, ent_ids, res_ids, res_areas, ent_service)),
+            # Resident-resident interactions (limited)
+            (self._process_resident_resident_interactions,
+             (residents, res_ids, res_areas))
+        ]
+        if len(enterprises) + len(residents) >= PARALLEL_INTERACTION_THRESHOLD:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(channels))
+            futures = [
+                self._executor.submit(method, *args, rng)
+                for (method, args), rng in zip(channels, self._channel_rngs)
+            ]
+            channel_results = [future.result() for future in futures]
+        else:
+            channel_results = [
+                method(*args, rng) for (method, args), rng in zip(channels, self._channel_rngs)
+            ]
+        for channel_interactions in channel_results:
+            interactions.extend(channel_interactions)
+        
+        # Store interaction history (bounded to the most recent window)
         self.interaction_history.extend(interactions)
         
         # Update agent states based on interactions
-        self._update_agent_states(government, enterprises, residents, interactions)
+        self._update_agent_states(government, enterprises, residents, ent_ids, res_ids, interactions)
         
         return interactions
     
+    def get_recent(self, n: int) -> List[Interaction]:
+        """
+        Get the most recent interactions
+        
+        Args:
+            n: Number of interactions to return
+            
+        Returns:
+            Up to ``n`` latest interactions, oldest first
+        """
+        history = self.interaction_history
+        n = min(max(n, 0), len(history))
+        return list(islice(history, len(history) - n, None))
+    
     def _process_government_enterprise_interactions(
         self,
         government: Any,
         enterprises: List[Any],
+        ent_ids: List[str],
         gov_decision: Dict[str, Any], 
-        ent_decisions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        ent_decisions: List[Dict[str, Any]],
+        ent_to_gov: np.ndarray,
+        rng: np.random.Generator
+    ) -> List[Interaction]:
         """Process government-enterprise interactions"""
         interactions = []
-        rules = self.rules.get('government_enterprise', {})
+        rules = self.compiled
         
-        # Process government actions targeting enterprises
-        if gov_decision.get('target') in ['enterprises', 'enterprise']:
-            for i, enterprise in enumerate(enterprises):
-                interaction = self._create_gov_ent_interaction(
-                    government, enterprise, gov_decision, rules
-                )
-                if interaction:
-                    interactions.append(interaction)
+        # Process government actions targeting enterprises, one batch per action
+        handler = self._gov_ent_handlers.get(gov_decision.get('action', 'regulation'))
+        if handler is not None and gov_decision.get('target') in GOV_ENT_TARGETS:
+            interactions.extend(handler(
+                government, enterprises, ent_ids, rules, rng.random(len(enterprises))
+            ))
         
         # Process enterprise actions targeting government
-        for i, (enterprise, ent_decision) in enumerate(zip(enterprises, ent_decisions)):
-            if ent_decision.get('target') in ['government', 'gov']:
-                interaction = self._create_ent_gov_interaction(
-                    enterprise, government, ent_decision, rules
-                )
-                if interaction:
-                    interactions.append(interaction)
+        senders = np.flatnonzero(ent_to_gov).tolist()
+        if senders:
+            interactions.extend(self._ent_gov_batch(
+                [enterprises[i] for i in senders], [ent_ids[i] for i in senders],
+                [ent_decisions[i] for i in senders], rules, rng.random(len(senders))
+            ))
         
         return interactions
     
     def _process_government_resident_interactions(
         self,
         government: Any,
-        residents: List[Any],
+        res_ids: List[str],
+        res_areas: List[str],
+        res_area_codes: np.ndarray,
         gov_decision: Dict[str, Any],
-        res_decisions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        res_decisions: List[Dict[str, Any]],
+        res_to_gov: np.ndarray,
+        rng: np.random.Generator
+    ) -> List[Interaction]:
         """Process government-resident interactions"""
         interactions = []
-        rules = self.rules.get('government_resident', {})
+        rules = self.compiled
         
         # Process government service provision
         if gov_decision.get('action') == 'service_provision':
             # Select random subset of residents for interaction
-            num_interactions = min(20, len(residents))  # Limit interactions per round
-            selected_residents = random.sample(residents, num_interactions)
-            
-            for resident in selected_residents:
-                interaction = self._create_service_interaction(
-                    government, resident, gov_decision, rules['service_provision']
-                )
-                interactions.append(interaction)
+            num_interactions = min(20, len(res_ids))  # Limit interactions per round
+            selected = rng.choice(len(res_ids), size=num_interactions, replace=False).tolist()
+            interactions.extend(self._create_service_interactions(
+                [res_ids[j] for j in selected], [res_areas[j] for j in selected],
+                res_area_codes[selected], rules, rng
+            ))
         
         # Process resident feedback to government
-        for i, (resident, res_decision) in enumerate(zip(residents, res_decisions)):
-            if (res_decision.get('target') == 'government' and 
-                res_decision.get('action') in ['provide_feedback', 'request_service']):
-                
-                interaction = self._create_resident_gov_interaction(
-                    resident, government, res_decision, rules
-                )
-                if interaction:
-                    interactions.append(interaction)
+        senders = np.flatnonzero(res_to_gov).tolist()
+        for i, draw in zip(senders, rng.random(len(senders)).tolist()):
+            interaction = self._create_resident_gov_interaction(
+                res_ids[i], res_areas[i], government, res_decisions[i], rules, draw
+            )
+            if interaction:
+                interactions.append(interaction)
         
         return interactions
     
@@ -153,369 +519,395 @@ class InteractionEngine:
         self,
         enterprises: List[Any],
         residents: List[Any],
-        ent_decisions: List[Dict[str, Any]],
-        res_decisions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        ent_ids: List[str],
+        res_ids: List[str],
+        res_areas: List[str],
+        ent_service: np.ndarray,
+        rng: np.random.Generator
+    ) -> List[Interaction]:
         """Process enterprise-resident interactions"""
-        interactions = []
-        rules = self.rules.get('enterprise_resident', {})
-        
-        # Process enterprise service supply
-        for enterprise, ent_decision in zip(enterprises, ent_decisions):
-            if ent_decision.get('action') in ['service_development', 'service_promotion']:
-                # Select random residents for service interaction
-                num_interactions = random.randint(5, 15)
-                selected_residents = random.sample(
-                    residents, min(num_interactions, len(residents))
-                )
-                
-                for resident in selected_residents:
-                    interaction = self._create_enterprise_service_interaction(
-                        enterprise, resident, ent_decision, rules
-                    )
-                    interactions.append(interaction)
-        
-        return interactions
+        rules = self.compiled
+        suppliers = np.flatnonzero(ent_service).tolist()
+        if not suppliers:
+            return []
+        
+        # Select 5-15 random residents for each supplying enterprise
+        num_residents = len(residents)
+        sizes = np.minimum(rng.integers(5, 16, size=len(suppliers)), num_residents)
+        choice = rng.choice
+        selections = [
+            choice(num_residents, size=size, replace=False).tolist()
+            for size in sizes.tolist()
+        ]
+        
+        return self._create_enterprise_service_interactions(
+            [enterprises[i] for i in suppliers], [ent_ids[i] for i in suppliers],
+            residents, res_ids, res_areas, selections, rules, rng
+        )
+    
+    def _get_area_buckets(self, residents: List[Any], res_areas: List[str]) -> '_AreaBuckets':
+        """Area index of the residents, rebuilt when the resident list changes"""
+        cached = self._area_buckets
+        if cached is None or cached[0] is not residents or cached[1] != len(residents):
+            cached = self._area_buckets = (residents, len(residents), _AreaBuckets(res_areas))
+        return cached[2]
     
     def _process_resident_resident_interactions(
         self,
         residents: List[Any],
-        res_decisions: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        res_ids: List[str],
+        res_areas: List[str],
+        rng: np.random.Generator
+    ) -> List[Interaction]:
         """Process resident-resident interactions (information sharing)"""
-        interactions = []
-        
         # Randomly select pairs for information sharing
         num_interactions = min(10, len(residents) // 10)  # 10% of residents interact
+        if num_interactions == 0 or len(residents) < 2:
+            return []
+        
+        # A uniformly random pair is from the same area with probability
+        # p_same; such pairs share with probability 0.3, others with 0.1.
+        # Only the success counts matter, so sample them as binomials and
+        # place just the successful pairs.
+        buckets = self._get_area_buckets(residents, res_areas)
+        n_same = int(rng.binomial(num_interactions, buckets.p_same))
+        n_succ_same = int(rng.binomial(n_same, 0.3))
+        n_succ_cross = int(rng.binomial(num_interactions - n_same, 0.1))
         
-        for _ in range(num_interactions):
-            if len(residents) >= 2:
-                resident1, resident2 = random.sample(residents, 2)
-                
-                # Check if they are in same area (higher probability)
-                if (getattr(resident1, 'area', 'core_area') == 
-                    getattr(resident2, 'area', 'core_area')):
-                    probability = 0.3
-                else:
-                    probability = 0.1
-                
-                if random.random() < probability:
-                    interaction = {
-                        'type': 'information_sharing',
-                        'participants': [
-                            getattr(resident1, 'agent_id', 'resident_1'),
-                            getattr(resident2, 'agent_id', 'resident_2')
-                        ],
-                        'outcome': 'success',
-                        'effect': 'knowledge_transfer'
-                    }
-                    interactions.append(interaction)
+        interactions = []
+        for same in [True] * n_succ_same + [False] * n_succ_cross:
+            first, second = buckets.sample_pair(rng, same)
+            interactions.append(Interaction(
+                type='information_sharing',
+                participants=(res_ids[first], res_ids[second]),
+                outcome='success',
+                effect='knowledge_transfer'
+            ))
         
         return interactions
     
-    def _create_gov_ent_interaction(
-        self,
-        government: Any,
-        enterprise: Any,
-        gov_decision: Dict[str, Any],
-        rules: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Create government-enterprise interaction"""
-        action = gov_decision.get('action', 'regulation')
-        
-        if action == 'procurement_cooperation':
-            return self._create_procurement_interaction(government, enterprise, rules)
-        elif action == 'regulation':
-            return self._create_regulation_interaction(government, enterprise, rules)
-        elif action == 'data_sharing':
-            return self._create_data_sharing_interaction(government, enterprise, rules)
-        
-        return None
-    
-    def _create_ent_gov_interaction(
-        self,
-        enterprise: Any,
-        government: Any,
-        ent_decision: Dict[str, Any],
-        rules: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Create enterprise-government interaction"""
-        action = ent_decision.get('action', 'compliance_reporting')
-        
-        if action == 'project_bidding':
-            return self._create_bidding_interaction(enterprise, government, rules)
-        elif action == 'data_request':
-            return self._create_data_request_interaction(enterprise, government, rules)
-        
-        return None
-    
-    def _create_procurement_interaction(
+    def _procurement_batch(
         self,
         government: Any,
-        enterprise: Any,
-        rules: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create procurement cooperation interaction"""
-        rule = rules.get('procurement_cooperation', {})
-        probability = rule.get('probability', 0.7)
-        
+        enterprises: List[Any],
+        ent_ids: List[str],
+        rules: CompiledRules,
+        draws: np.ndarray
+    ) -> List[Interaction]:
+        """Create procurement cooperation interactions for all enterprises"""
         # Success based on probability and enterprise capability
-        enterprise_capability = enterprise.state.get('innovation_level', 50) / 100
-        success_prob = probability * enterprise_capability
-        
-        outcome = 'success' if random.random() < success_prob else 'failed'
-        
-        interaction = {
-            'type': 'procurement_cooperation',
-            'participants': ['government', getattr(enterprise, 'agent_id', 'enterprise')],
-            'outcome': outcome,
-            'effect': rule.get('effect', ''),
-            'service_type': 'digital'
-        }
-        
-        return interaction
+        enterprise_capability = _float_column(enterprises, 'state', 'innovation_level', 50) / 100
+        success = _sample_outcomes(rules.procurement_probability * enterprise_capability, draws).tolist()
+        
+        effect = rules.procurement_effect
+        return [
+            Interaction(
+                type='procurement_cooperation',
+                participants=('government', enterprise_id),
+                outcome='success' if ok else 'failed',
+                effect=effect,
+                service_type='digital'
+            )
+            for enterprise_id, ok in zip(ent_ids, success)
+        ]
     
-    def _create_regulation_interaction(
+    def _regulation_batch(
         self,
         government: Any,
-        enterprise: Any,
-        rules: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create regulation interaction"""
-        rule = rules.get('regulation', {})
-        probability = rule.get('probability', 0.9)
-        
+        enterprises: List[Any],
+        ent_ids: List[str],
+        rules: CompiledRules,
+        draws: np.ndarray
+    ) -> List[Interaction]:
+        """Create regulation interactions for all enterprises"""
         # Compliance based on enterprise compliance rate
-        compliance_rate = enterprise.attributes.get('data_usage_compliance', 90) / 100
-        compliant = random.random() < compliance_rate
-        
-        outcome = 'success' if compliant else 'violation'
-        
-        interaction = {
-            'type': 'regulation',
-            'participants': ['government', getattr(enterprise, 'agent_id', 'enterprise')],
-            'outcome': outcome,
-            'effect': rule.get('effect', ''),
-            'compliance': compliant
-        }
-        
-        return interaction
+        compliance_rate = _float_column(enterprises, 'attributes', 'data_usage_compliance', 90) / 100
+        compliant = _sample_outcomes(compliance_rate, draws).tolist()
+        
+        effect = rules.regulation_effect
+        return [
+            Interaction(
+                type='regulation',
+                participants=('government', enterprise_id),
+                outcome='success' if ok else 'violation',
+                effect=effect,
+                compliance=ok
+            )
+            for enterprise_id, ok in zip(ent_ids, compliant)
+        ]
     
-    def _create_data_sharing_interaction(
+    def _data_sharing_batch(
         self,
         government: Any,
-        enterprise: Any,
-        rules: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create data sharing interaction"""
-        rule = rules.get('data_sharing', {})
-        probability = rule.get('probability', 0.3)
-        
+        enterprises: List[Any],
+        ent_ids: List[str],
+        rules: CompiledRules,
+        draws: np.ndarray
+    ) -> List[Interaction]:
+        """Create data sharing interactions for all enterprises"""
         # Data sharing success based on trust and policy
         gov_transparency = government.attributes.get('information_transparency', 70) / 100
-        success_prob = probability * gov_transparency
-        
-        outcome = 'success' if random.random() < success_prob else 'denied'
-        
-        interaction = {
-            'type': 'data_sharing',
-            'participants': ['government', getattr(enterprise, 'agent_id', 'enterprise')],
-            'outcome': outcome,
-            'effect': rule.get('effect', '')
-        }
-        
-        return interaction
+        success = (draws < rules.data_sharing_probability * gov_transparency).tolist()
+        
+        effect = rules.data_sharing_effect
+        return [
+            Interaction(
+                type='data_sharing',
+                participants=('government', enterprise_id),
+                outcome='success' if ok else 'denied',
+                effect=effect
+            )
+            for enterprise_id, ok in zip(ent_ids, success)
+        ]
     
-    def _create_service_interaction(
+    def _create_service_interactions(
         self,
-        government: Any,
-        resident: Any,
-        gov_decision: Dict[str, Any],
-        rule: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create service provision interaction"""
-        probability = rule.get('probability', 0.8)
-        
-        # Service success based on infrastructure and government capability
-        area = getattr(resident, 'area', 'core_area')
-        # Simulate infrastructure quality impact
-        infrastructure_quality = {
-            'core_area': 0.9,
-            'urban_rural_fringe': 0.7,
-            'rural': 0.5
-        }.get(area, 0.7)
-        
-        success_prob = probability * infrastructure_quality
-        outcome = 'success' if random.random() < success_prob else 'failed'
-        
-        interaction = {
-            'type': 'service_provision',
-            'participants': ['government', getattr(resident, 'agent_id', 'resident')],
-            'outcome': outcome,
-            'effect': rule.get('effect', ''),
-            'area': area,
-            'service_type': 'digital' if random.random() > 0.3 else 'physical'
-        }
-        
-        return interaction
+        res_ids: List[str],
+        areas: List[str],
+        area_codes: np.ndarray,
+        rules: CompiledRules,
+        rng: np.random.Generator
+    ) -> List[Interaction]:
+        """Create service provision interactions for the selected residents"""
+        probability = rules.service_provision_probability
+        effect = rules.service_provision_effect
+        
+        # Service success based on infrastructure (simulated quality by area)
+        infrastructure_quality = SERVICE_INFRASTRUCTURE_QUALITY[area_codes]
+        
+        # One outcome draw and one service channel draw per resident
+        draws = rng.random((len(res_ids), 2))
+        success = _sample_outcomes(probability * infrastructure_quality, draws[:, 0]).tolist()
+        digital = (draws[:, 1] > 0.3).tolist()
+        
+        return [
+            Interaction(
+                type='service_provision',
+                participants=('government', resident_id),
+                outcome='success' if ok else 'failed',
+                effect=effect,
+                area=area,
+                service_type='digital' if is_digital else 'physical'
+            )
+            for resident_id, area, ok, is_digital in zip(res_ids, areas, success, digital)
+        ]
     
     def _create_resident_gov_interaction(
         self,
-        resident: Any,
+        resident_id: str,
+        area: str,
         government: Any,
         res_decision: Dict[str, Any],
-        rules: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Create resident-government interaction"""
+        rules: CompiledRules,
+        draw: float
+    ) -> Optional[Interaction]:
+        """Create resident-government interaction (``draw``: uniform [0, 1) sample)"""
         action = res_decision.get('action', 'provide_feedback')
         
         if action == 'provide_feedback':
-            rule = rules.get('demand_response', {})
-            probability = rule.get('probability', 0.7)
-            
             # Response success based on government transparency
             gov_transparency = government.attributes.get('information_transparency', 70) / 100
-            success_prob = probability * gov_transparency
+            success_prob = rules.demand_response_probability * gov_transparency
             
-            outcome = 'success' if random.random() < success_prob else 'ignored'
+            outcome = 'success' if draw < success_prob else 'ignored'
             
-            return {
-                'type': 'demand_response',
-                'participants': [getattr(resident, 'agent_id', 'resident'), 'government'],
-                'outcome': outcome,
-                'effect': rule.get('effect', ''),
-                'area': getattr(resident, 'area', 'core_area')
-            }
+            return Interaction(
+                type='demand_response',
+                participants=(resident_id, 'government'),
+                outcome=outcome,
+                effect=rules.demand_response_effect,
+                area=area
+            )
         
         return None
     
-    def _create_enterprise_service_interaction(
+    def _create_enterprise_service_interactions(
         self,
-        enterprise: Any,
-        resident: Any,
-        ent_decision: Dict[str, Any],
-        rules: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create enterprise-resident service interaction"""
-        rule = rules.get('service_supply', {})
-        probability = rule.get('probability', 0.8)
+        enterprises: List[Any],
+        ent_ids: List[str],
+        residents: List[Any],
+        res_ids: List[str],
+        res_areas: List[str],
+        selections: List[List[int]],
+        rules: CompiledRules,
+        rng: np.random.Generator
+    ) -> List[Interaction]:
+        """
+        Create enterprise-resident service interactions for all suppliers at once
+        
+        ``enterprises`` and ``ent_ids`` are the suppliers; ``selections`` holds
+        each supplier's resident indices into ``residents``/``res_ids``/``res_areas``.
+        """
+        probability = rules.service_supply_probability
+        effect = rules.service_supply_effect
+        
+        counts = [len(selected) for selected in selections]
+        pairs = [
+            (enterprise_id, j)
+            for enterprise_id, selected in zip(ent_ids, selections)
+            for j in selected
+        ]
         
         # Service success based on resident acceptance and enterprise capability
-        resident_acceptance = resident.attributes.get('technology_acceptance', 70) / 100
-        enterprise_capability = enterprise.state.get('innovation_level', 50) / 100
+        resident_acceptance = np.fromiter(
+            (residents[j].attributes.get('technology_acceptance', 70) for _, j in pairs),
+            dtype=np.float64, count=len(pairs)
+        ) / 100
+        enterprise_capability = np.repeat(np.fromiter(
+            (enterprise.state.get('innovation_level', 50) for enterprise in enterprises),
+            dtype=np.float64, count=len(enterprises)
+        ) / 100, counts)
         
         success_prob = probability * resident_acceptance * enterprise_capability
-        outcome = 'success' if random.random() < success_prob else 'rejected'
-        
-        interaction = {
-            'type': 'service_supply',
-            'participants': [
-                getattr(enterprise, 'agent_id', 'enterprise'),
-                getattr(resident, 'agent_id', 'resident')
-            ],
-            'outcome': outcome,
-            'effect': rule.get('effect', ''),
-            'area': getattr(resident, 'area', 'core_area')
-        }
-        
-        return interaction
-    
-    def _create_bidding_interaction(
-        self,
-        enterprise: Any,
-        government: Any,
-        rules: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create project bidding interaction"""
-        # Simple bidding success based on enterprise capabilities
-        capability = enterprise.state.get('innovation_level', 50)
-        compliance = enterprise.attributes.get('data_usage_compliance', 90)
-        
-        success_score = (capability + compliance) / 200
-        outcome = 'success' if random.random() < success_score else 'failed'
-        
-        return {
-            'type': 'project_bidding',
-            'participants': [getattr(enterprise, 'agent_id', 'enterprise'), 'government'],
-            'outcome': outcome,
-            'effect': 'contract_award' if outcome == 'success' else 'bid_rejected'
-        }
+        success = _sample_outcomes(success_prob, rng.random(len(pairs))).tolist()
+        
+        return [
+            Interaction(
+                type='service_supply',
+                participants=(enterprise_id, res_ids[j]),
+                outcome='success' if ok else 'rejected',
+                effect=effect,
+                area=res_areas[j]
+            )
+            for (enterprise_id, j), ok in zip(pairs, success)
+        ]
     
-    def _create_data_request_interaction(
+    def _ent_gov_batch(
         self,
-        enterprise: Any,
-        government: Any,
-        rules: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Create data request interaction"""
-        rule = rules.get('data_sharing', {})
-        probability = rule.get('probability', 0.3)
-        
-        # Data request success based on compliance and government policy
-        compliance = enterprise.attributes.get('data_usage_compliance', 90) / 100
-        success_prob = probability * compliance
-        
-        outcome = 'approved' if random.random() < success_prob else 'denied'
-        
-        return {
-            'type': 'data_request',
-            'participants': [getattr(enterprise, 'agent_id', 'enterprise'), 'government'],
-            'outcome': outcome,
-            'effect': 'data_access' if outcome == 'approved' else 'access_denied'
-        }
+        enterprises: List[Any],
+        ent_ids: List[str],
+        ent_decisions: List[Dict[str, Any]],
+        rules: CompiledRules,
+        draws: np.ndarray
+    ) -> List[Interaction]:
+        """Create the interactions of enterprises addressing the government, in sender order"""
+        capability = _float_column(enterprises, 'state', 'innovation_level', 50)
+        compliance = _float_column(enterprises, 'attributes', 'data_usage_compliance', 90)
+        
+        # Bidding success based on enterprise capabilities; data request
+        # success based on compliance and government policy
+        bid_won = (draws < (capability + compliance) / 200).tolist()
+        request_approved = (draws < rules.data_sharing_probability * (compliance / 100)).tolist()
+        
+        interactions = []
+        for decision, enterprise_id, won, approved in zip(ent_decisions, ent_ids, bid_won, request_approved):
+            action = decision.get('action', 'compliance_reporting')
+            if action == 'project_bidding':
+                interactions.append(Interaction(
+                    type='project_bidding',
+                    participants=(enterprise_id, 'government'),
+                    outcome='success' if won else 'failed',
+                    effect='contract_award' if won else 'bid_rejected'
+                ))
+            elif action == 'data_request':
+                interactions.append(Interaction(
+                    type='data_request',
+                    participants=(enterprise_id, 'government'),
+                    outcome='approved' if approved else 'denied',
+                    effect='data_access' if approved else 'access_denied'
+                ))
+        
+        return interactions
     
     def _update_agent_states(
         self,
         government: Any,
         enterprises: List[Any],
         residents: List[Any],
-        interactions: List[Dict[str, Any]]
+        ent_ids: List[str],
+        res_ids: List[str],
+        interactions: List[Interaction]
     ):
         """Update agent states based on interaction results"""
-        # Group interactions by participant
-        agent_interactions = {}
-        
+        # Agent id -> enterprise / resident pool row
+        ent_rows_by_id = {agent_id: i for i, agent_id in enumerate(ent_ids)}
+        ent_pooled = len(ent_rows_by_id) == len(enterprises)
+        res_rows_by_id = {agent_id: i for i, agent_id in enumerate(res_ids)}
+        res_pooled = len(res_rows_by_id) == len(residents)
+        
+        # Route each interaction to its participants in a single pass; agent
+        # events go straight into the pools' code arrays
+        gov_interactions = []
+        fallback_interactions = {}
+        ent_rows, ent_kinds = [], []
+        res_rows, res_kinds, res_results = [], [], []
         for interaction in interactions:
-            participants = interaction.get('participants', [])
-            for participant in participants:
-                if participant not in agent_interactions:
-                    agent_interactions[participant] = []
-                agent_interactions[participant].append(interaction)
+            for participant in interaction.participants:
+                if participant == 'government':
+                    gov_interactions.append(interaction)
+                
+                row = ent_rows_by_id.get(participant)
+                if row is not None:
+                    if not ent_pooled:
+                        fallback_interactions.setdefault(participant, []).append(interaction)
+                    elif interaction.outcome == 'success':
+                        kind = ENTERPRISE_KIND_CODES.get(interaction.type)
+                        if kind is not None:
+                            ent_rows.append(row)
+                            ent_kinds.append(kind)
+                
+                row = res_rows_by_id.get(participant)
+                if row is not None:
+                    if not res_pooled:
+                        fallback_interactions.setdefault(participant, []).append(interaction)
+                    else:
+                        res_rows.append(row)
+                        res_kinds.append(RESIDENT_KIND_CODES.get(interaction.type, KIND_OTHER))
+                        res_results.append(RESIDENT_RESULT_CODES.get(interaction.outcome, RESULT_OTHER))
         
         # Update government state
-        if 'government' in agent_interactions:
-            gov_interactions = agent_interactions['government']
+        if gov_interactions:
             self._update_government_state(government, gov_interactions)
         
         # Update enterprise states
-        for enterprise in enterprises:
-            agent_id = getattr(enterprise, 'agent_id', 'enterprise')
-            if agent_id in agent_interactions:
-                ent_interactions = agent_interactions[agent_id]
-                self._update_enterprise_state(enterprise, ent_interactions)
+        if ent_pooled:
+            self._apply_pool(EnterprisePool, enterprises, ent_rows, ent_kinds, [RESULT_SUCCESS] * len(ent_rows))
+        else:
+            # Enterprises without unique ids share interactions; update one by one
+            for enterprise, agent_id in zip(enterprises, ent_ids):
+                if agent_id in fallback_interactions:
+                    self._update_enterprise_state(enterprise, fallback_interactions[agent_id])
         
         # Update resident states
-        for resident in residents:
-            agent_id = getattr(resident, 'agent_id', 'resident')
-            if agent_id in agent_interactions:
-                res_interactions = agent_interactions[agent_id]
-                self._update_resident_state(resident, res_interactions)
+        if res_pooled:
+            self._apply_pool(ResidentPool, residents, res_rows, res_kinds, res_results)
+        else:
+            # Residents without unique ids share interactions; update one by one
+            for resident, agent_id in zip(residents, res_ids):
+                if agent_id in fallback_interactions:
+                    self._update_resident_state(resident, fallback_interactions[agent_id])
     
-    def _update_government_state(self, government: Any, interactions: List[Dict[str, Any]]):
+    @staticmethod
+    def _apply_pool(
+        pool_type: type,
+        agents: List[Any],
+        rows: List[int],
+        kinds: List[int],
+        results: List[int]
+    ):
+        """Apply a round's encoded events to agents through a columnar pool"""
+        if not rows:
+            return
+        
+        rows = np.array(rows, dtype=np.int64)
+        pool = pool_type(agents)
+        pool.apply_results(rows, np.array(kinds, dtype=np.int8), np.array(results, dtype=np.int8))
+        pool.write_back(rows)
+    
+    def _update_government_state(self, government: Any, interactions: List[Interaction]):
         """Update government agent state"""
-        for interaction in interactions:
-            outcome = interaction.get('outcome', 'neutral')
-            
-            if outcome == 'success':
-                # Increase effectiveness metrics
-                government.state['resource_utilization'] = min(1.0,
-                    government.state.get('resource_utilization', 0.7) + 0.01)
-            elif outcome in ['failed', 'violation']:
-                # Decrease effectiveness metrics
-                government.state['resource_utilization'] = max(0.0,
-                    government.state.get('resource_utilization', 0.7) - 0.01)
-    
-    def _update_enterprise_state(self, enterprise: Any, interactions: List[Dict[str, Any]]):
+        # Successes raise and failures/violations lower the effectiveness
+        # metrics by 0.01, applied in interaction order
+        steps = np.fromiter(
+            (GOV_STEP_CODES.get(interaction.outcome, 0) for interaction in interactions),
+            dtype=np.int8, count=len(interactions)
+        )
+        if steps.any():
+            government.state['resource_utilization'] = float(_clamped_walk(
+                float(government.state.get('resource_utilization', 0.7)), steps, 0.01, 0.0, 1.0
+            ))
+    
+    def _update_enterprise_state(self, enterprise: Any, interactions: List[Interaction]):
         """Update enterprise agent state"""
         for interaction in interactions:
             outcome = interaction.get('outcome', 'neutral')
@@ -531,7 +923,7 @@ class InteractionEngine:
                     enterprise.state['market_share'] = min(1.0,
                         enterprise.state.get('market_share', 0.1) + 0.01)
     
-    def _update_resident_state(self, resident: Any, interactions: List[Dict[str, Any]]):
+    def _update_resident_state(self, resident: Any, interactions: List[Interaction]):
         """Update resident agent state"""
         for interaction in interactions:
             outcome = interaction.get('outcome', 'neutral')
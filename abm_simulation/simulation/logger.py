@@ -5,20 +5,64 @@ import json
 import os
 import datetime
 import logging
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .interaction import Interaction
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# orjson的numpy数值按数字写出，非字符串键转为字符串（与json模块一致）
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+# 日志详细程度，由低到高：只记录轮次、加上交互、再加上每个agent的决策
+LOG_VERBOSITY_LEVELS = ('round', 'interaction', 'decision')
+
+# 两次落盘之间的最短间隔（秒）；轮次完成、模拟结束、中断和错误时立即写入
+FLUSH_INTERVAL = 0.5
+
+
+def _plain_interactions(interactions: list) -> List[Dict[str, Any]]:
+    """把Interaction记录转换为可JSON序列化的字典"""
+    return [
+        interaction.to_dict() if isinstance(interaction, Interaction) else interaction
+        for interaction in interactions
+    ]
+
+
+def _dumps_line(record: Any) -> bytes:
+    """把一条记录编码为一行NDJSON，有orjson时使用orjson"""
+    if orjson is not None:
+        return orjson.dumps(record, default=str, option=_ORJSON_OPTIONS) + b'\n'
+    return json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+
+
 class SimulationLogger:
     """实时模拟日志记录器"""
     
-    def __init__(self, city: str, filename: str = None):
+    def __init__(self, city: str, filename: str = None, verbosity: str = 'decision'):
         """
         初始化日志记录器
         
         Args:
             city: 城市名称
             filename: 自定义文件名
+            verbosity: 日志详细程度（LOG_VERBOSITY_LEVELS之一）；'round'只在
+                轮次边界写入文件，'interaction'记录交互但不记录决策
         """
+        if verbosity not in LOG_VERBOSITY_LEVELS:
+            raise ValueError(f"Unknown log verbosity: {verbosity}. Available: {list(LOG_VERBOSITY_LEVELS)}")
+        self.verbosity = verbosity
+        self._level = LOG_VERBOSITY_LEVELS.index(verbosity)
         self.city = city
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         if filename:
@@ -33,20 +77,34 @@ class SimulationLogger:
             "summary": {},
             "errors": []
         }
+        # 日志有未写入的修改时为True；写入按FLUSH_INTERVAL节流
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        # 决策时间戳先记为相对本轮开始的单调时钟纳秒数，写入文件前再格式化
+        self._round_anchor_wall = datetime.datetime.now()
+        self._round_anchor_mono = time.monotonic_ns()
+        self._unstamped = []
+        # 已完成的轮次按顺序追加到NDJSON旁路文件并移出内存，close()时拼回完整日志
+        self.rounds_filepath = os.path.splitext(self.log_filepath)[0] + '.rounds.ndjson'
+        self._rounds_fp = None
+        self._archived_rounds = 0
+        self._last_archived = None
         self._initialize_log_file()
         logger.info(f"Dynamic simulation log initialized: {self.log_filepath}")
 
     def _initialize_log_file(self):
         """初始化日志文件"""
         os.makedirs('output', exist_ok=True)
-        with open(self.log_filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.log_data, f, indent=2, ensure_ascii=False)
+        self._write_log_file()
 
     def log_round_start(self, round_num: int, agent_counts: dict):
         """记录轮次开始"""
+        self._stamp_decisions()
+        self._round_anchor_wall = datetime.datetime.now()
+        self._round_anchor_mono = time.monotonic_ns()
         round_entry = {
             "round": round_num,
-            "start_time": datetime.datetime.now().isoformat(),
+            "start_time": self._round_anchor_wall.isoformat(),
             "agent_counts": agent_counts,
             "decisions": [],
             "interactions": [],
@@ -56,38 +114,60 @@ class SimulationLogger:
         self.log_data["rounds"].append(round_entry)
         self._save_current_state()
 
+    def _round_entry(self, round_num: int):
+        """按位置取内存中的轮次记录；已归档或不存在时返回None"""
+        index = round_num - self._archived_rounds
+        if round_num >= 0 and 0 <= index < len(self.log_data["rounds"]):
+            return self.log_data["rounds"][index]
+        return None
+
+    @property
+    def logs_decisions(self) -> bool:
+        """是否记录每个agent的决策"""
+        return self._level >= 2
+    
     def log_agent_decision(self, round_num: int, agent_type: str, agent_id: str, decision: dict, is_fallback: bool = False, error: str = None):
         """记录agent决策"""
-        if round_num >= 0 and round_num < len(self.log_data["rounds"]):
+        if self._level < 2:
+            return
+        round_entry = self._round_entry(round_num)
+        if round_entry is not None:
             decision_entry = {
                 "agent_type": agent_type,
                 "agent_id": agent_id,
                 "decision": decision,
                 "is_fallback": is_fallback,
                 "error": error,
-                "timestamp": datetime.datetime.now().isoformat()
+                "timestamp": None
             }
-            self.log_data["rounds"][round_num]["decisions"].append(decision_entry)
+            self._unstamped.append((decision_entry, time.monotonic_ns()))
+            round_entry["decisions"].append(decision_entry)
             self._save_current_state()
 
     def log_interactions(self, round_num: int, interactions: list):
         """记录交互过程"""
-        if round_num >= 0 and round_num < len(self.log_data["rounds"]):
-            self.log_data["rounds"][round_num]["interactions"] = interactions
+        if self._level < 1:
+            return
+        round_entry = self._round_entry(round_num)
+        if round_entry is not None:
+            round_entry["interactions"] = _plain_interactions(interactions)
             self._save_current_state()
 
     def log_environment_update(self, round_num: int, env_state: dict):
         """记录环境更新"""
-        if round_num >= 0 and round_num < len(self.log_data["rounds"]):
-            self.log_data["rounds"][round_num]["environment_state"] = env_state
+        round_entry = self._round_entry(round_num)
+        if round_entry is not None:
+            round_entry["environment_state"] = env_state
             self._save_current_state()
 
     def log_round_complete(self, round_num: int):
         """记录轮次完成"""
-        if round_num >= 0 and round_num < len(self.log_data["rounds"]):
-            self.log_data["rounds"][round_num]["status"] = "completed"
-            self.log_data["rounds"][round_num]["end_time"] = datetime.datetime.now().isoformat()
-            self._save_current_state()
+        round_entry = self._round_entry(round_num)
+        if round_entry is not None:
+            round_entry["status"] = "completed"
+            round_entry["end_time"] = datetime.datetime.now().isoformat()
+            self._archive_completed_rounds()
+            self._save_current_state(force=True)
 
     def log_error(self, round_num: int, error_message: str, error_type: str = "general"):
         """记录错误"""
@@ -98,6 +178,11 @@ class SimulationLogger:
             "timestamp": datetime.datetime.now().isoformat()
         }
         self.log_data["errors"].append(error_entry)
+        self._save_current_state(force=True)
+
+    def log_decision_cache(self, stats: dict):
+        """记录决策缓存命中统计"""
+        self.log_data["summary"]["decision_cache"] = stats
         self._save_current_state()
 
     def log_simulation_complete(self, metrics: dict):
@@ -105,33 +190,234 @@ class SimulationLogger:
         self.log_data["summary"]["metrics"] = metrics
         self.log_data["summary"]["status"] = "completed"
         self.log_data["summary"]["end_time"] = datetime.datetime.now().isoformat()
-        self._save_current_state()
+        self.close()
 
     def interrupt_simulation(self, reason: str = "User interrupted"):
         """记录模拟中断"""
         self.log_data["summary"]["status"] = "interrupted"
         self.log_data["summary"]["interruption_reason"] = reason
         self.log_data["summary"]["end_time"] = datetime.datetime.now().isoformat()
-        self._save_current_state()
+        self.close()
 
     def get_current_status(self) -> dict:
         """获取当前状态"""
-        last_round = self.log_data["rounds"][-1] if self.log_data["rounds"] else None
+        last_round = self.log_data["rounds"][-1] if self.log_data["rounds"] else self._last_archived
         return {
             "current_round": last_round["round"] if last_round else -1,
             "summary": f"Round {last_round['round'] if last_round else 'N/A'} - {last_round['status'] if last_round else 'Not started'}",
             "errors_count": len(self.log_data["errors"])
         }
 
-    def _save_current_state(self):
-        """保存当前状态到文件"""
+    def _archive_completed_rounds(self):
+        """把内存中开头连续的已完成轮次追加到旁路文件"""
+        rounds = self.log_data["rounds"]
+        done = 0
+        while done < len(rounds) and rounds[done]["status"] == "completed":
+            done += 1
+        if not done:
+            return
+        
+        self._stamp_decisions()
         try:
-            with open(self.log_filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.log_data, f, indent=2, ensure_ascii=False)
+            if self._rounds_fp is None:
+                self._rounds_fp = open(self.rounds_filepath, 'ab', buffering=1 << 20)
+            for round_entry in rounds[:done]:
+                self._rounds_fp.write(_dumps_line(round_entry))
+            self._rounds_fp.flush()
+        except Exception as e:
+            logger.error(f"Failed to archive completed rounds: {e}")
+            return
+        
+        last = rounds[done - 1]
+        self._last_archived = {"round": last["round"], "status": last["status"]}
+        del rounds[:done]
+        self._archived_rounds += done
+        self.log_data["rounds_file"] = self.rounds_filepath
+
+    def close(self):
+        """把归档的轮次拼回日志并写入完整的JSON文件"""
+        if self._rounds_fp is not None:
+            try:
+                self._rounds_fp.close()
+                loads = orjson.loads if orjson is not None else json.loads
+                with open(self.rounds_filepath, 'rb') as f:
+                    archived = [loads(line) for line in f if line.strip()]
+                self.log_data["rounds"][:0] = archived
+                self.log_data.pop("rounds_file", None)
+                self._rounds_fp = None
+                self._archived_rounds = 0
+                self._last_archived = None
+                os.remove(self.rounds_filepath)
+            except Exception as e:
+                logger.error(f"Failed to merge archived rounds: {e}")
+        self._save_current_state(force=True)
+
+    def flush(self):
+        """立即写入尚未落盘的日志修改"""
+        if self._dirty:
+            self._save_current_state(force=True)
+    
+    def _save_current_state(self, force: bool = False):
+        """
+        保存当前状态到文件
+        
+        每次调用只标记日志已修改；距上次写入不足FLUSH_INTERVAL时推迟写入，
+        避免每条决策都重写整个日志文件。'round'详细程度下只有强制写入才落盘。
+        
+        Args:
+            force: 忽略写入间隔，立即写入
+        """
+        self._dirty = True
+        if not force and (self._level == 0 or time.monotonic() - self._last_flush < FLUSH_INTERVAL):
+            return
+        try:
+            self._write_log_file()
         except Exception as e:
             logger.error(f"Failed to save log state: {e}")
 
+    def _stamp_decisions(self):
+        """把尚未格式化的决策时间戳换算为ISO时间字符串"""
+        if not self._unstamped:
+            return
+        wall, mono, delta = self._round_anchor_wall, self._round_anchor_mono, datetime.timedelta
+        for entry, ns in self._unstamped:
+            entry["timestamp"] = (wall + delta(microseconds=(ns - mono) // 1000)).isoformat()
+        self._unstamped.clear()
+
+    def _write_log_file(self):
+        """把完整日志写入文件，有orjson时使用orjson"""
+        self._stamp_decisions()
+        if orjson is not None:
+            with open(self.log_filepath, 'wb') as f:
+                f.write(orjson.dumps(self.log_data, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2))
+        else:
+            with open(self.log_filepath, 'w', encoding='utf-8') as f:
+                json.dump(self.log_data, f, indent=2, ensure_ascii=False)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+
+def _state_dicts(fields: Tuple[str, ...], states: np.ndarray) -> List[Dict[str, Any]]:
+    """把(agent数, 字段数)的状态快照还原为每个agent一个字典"""
+    return [dict(zip(fields, row)) for row in states.tolist()]
+
+
+@dataclass(slots=True)
+class RoundRecord:
+    """
+    单轮模拟记录；兼容按键读取（get/[]），沿用原字典记录的键名
+    
+    record['agents']中的'enterprises'/'residents'由状态快照数组按
+    ent_fields/res_fields还原为字典列表，只包含被跟踪的状态字段。
+    """
+    round: int
+    interactions: List[Interaction]
+    env_state: Dict[str, Any]
+    gov_state: Dict[str, Any]
+    ent_states: np.ndarray
+    res_states: np.ndarray
+    decisions_sample: Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]
+    # ent_states/res_states最后一维对应的状态字段名
+    ent_fields: Tuple[str, ...] = ()
+    res_fields: Tuple[str, ...] = ()
+    
+    def __getitem__(self, key: str):
+        if key == 'round':
+            return self.round
+        if key == 'interactions':
+            return self.interactions
+        if key == 'environment':
+            return self.env_state
+        if key == 'agents':
+            return {
+                'government': self.gov_state,
+                'enterprises': _state_dicts(self.ent_fields, self.ent_states),
+                'residents': _state_dicts(self.res_fields, self.res_states)
+            }
+        if key == 'decisions_sample':
+            gov, ents, ress = self.decisions_sample
+            return {'government': gov, 'enterprises': ents, 'residents': ress}
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """按原字典记录的键名读取字段"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'round': self.round,
+            'interactions': _plain_interactions(self.interactions),
+            'environment': self.env_state,
+            'agents': self['agents'],
+            'decisions_sample': self['decisions_sample']
+        }
+
+
+class RecordStream:
+    """按轮次追加写入的模拟记录流（NDJSON），读取时逐行惰性解析"""
+    
+    def __init__(self, filepath: str, mode: str = 'w'):
+        """
+        初始化记录流
+        
+        Args:
+            filepath: NDJSON文件路径
+            mode: 'w' 新建并写入, 'r' 读取已有文件
+        """
+        self.filepath = filepath
+        self._fp = None
+        self._count = 0
+        
+        if mode == 'w':
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            self._fp = open(filepath, 'wb')
+        else:
+            with open(filepath, 'rb') as f:
+                self._count = sum(1 for line in f if line.strip())
+    
+    def append(self, record):
+        """追加一轮记录（字典或RoundRecord）"""
+        if isinstance(record, RoundRecord):
+            record = record.to_dict()
+        self._fp.write(_dumps_line(record))
+        self._count += 1
+    
+    def close(self):
+        """关闭写入句柄"""
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+    
+    def __iter__(self):
+        if self._fp is not None:
+            self._fp.flush()
+        loads = orjson.loads if orjson is not None else json.loads
+        with open(self.filepath, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(islice(iter(self), *index.indices(self._count)))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        return next(islice(iter(self), index, None))
+    
+    def __getstate__(self):
+        # 文件句柄不可序列化，跨进程传递时只保留路径和计数
+        return {'filepath': self.filepath, '_fp': None, '_count': self._count}
+
 
-def create_logger(city: str, filename: str = None) -> SimulationLogger:
+def create_logger(city: str, filename: str = None, verbosity: str = 'decision') -> SimulationLogger:
     """创建日志记录器实例"""
-    return SimulationLogger(city, filename)
+    return SimulationLogger(city, filename, verbosity)
@@ -2,13 +2,198 @@
 Policy intervention engine for ABM digital governance simulation
 """
 import logging
-from typing import Dict, Any, List, Optional
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional: policy updates fall back to np.clip
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+# Policy targets with a handler, encoded by position in the policy history
+POLICY_TARGETS = ('resident', 'government_enterprise', 'environment', 'government', 'enterprise')
+_TARGET_CODES = {target: code for code, target in enumerate(POLICY_TARGETS)}
+
+# Policy keys whose (possibly nested) values are change strings like "+20"
+_CHANGE_KEYS = ('attribute_change', 'behavior_change', 'rule_change')
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _apply_clamped_delta(arr, mask, delta, lo, hi):
+        """Add ``delta`` to the masked entries of ``arr`` in place, clamped to [lo, hi]"""
+        for i in range(arr.shape[0]):
+            if mask[i]:
+                v = arr[i] + delta
+                arr[i] = lo if v < lo else (hi if v > hi else v)
+else:
+    def _apply_clamped_delta(arr, mask, delta, lo, hi):
+        """Add ``delta`` to the masked entries of ``arr`` in place, clamped to [lo, hi]"""
+        np.clip(arr + delta, lo, hi, out=arr, where=mask)
+
+
+@lru_cache(maxsize=256)
+def _recommend(
+    digital_divide: float,
+    access_gini: float,
+    resource_utilization: float,
+    conflict_rate: float,
+    improvements: frozenset
+) -> Tuple[str, ...]:
+    """
+    Policies recommended for the given metric values and target improvements
+    
+    Cached on the exact values, which move slowly between rounds; applied
+    policies are filtered out by the caller.
+    """
+    recommendations = []
+    
+    # Recommend digital literacy training if digital divide is high
+    if digital_divide > 0.3 or 'digital_equity' in improvements:
+        recommendations.append('digital_literacy_training')
+    
+    # Recommend infrastructure investment if service access gaps are high
+    if access_gini > 0.4 or 'infrastructure' in improvements:
+        recommendations.append('inclusive_infrastructure')
+    
+    # Recommend data sharing if efficiency is low
+    if resource_utilization < 0.6 or 'efficiency' in improvements:
+        recommendations.append('data_open_sharing')
+    
+    # Recommend algorithm regulation if compliance issues
+    if conflict_rate > 0.2 or 'regulation' in improvements:
+        recommendations.append('algorithm_regulation')
+    
+    return tuple(recommendations)
+
+
+class AttributeStore:
+    """
+    Columnar (structure-of-arrays) copy of agents' numeric attributes
+    
+    Each attribute is gathered into one float array, rows following the
+    agent order, so a policy changes all targeted agents with one clamped
+    update (a numba kernel, or np.clip without numba). ``present`` marks
+    the agents that have the attribute at all; only those are changed.
+    ``write_back`` stores the updated rows in the agents' records.
+    
+    Policy targets are always selected as a boolean mask over the rows:
+    the update runs over the full column under the mask, and the dense
+    row indices (``np.flatnonzero``) are formed once, for the write-back.
+    """
+    
+    __slots__ = ('agents', 'attrs', 'present')
+    
+    def __init__(self, agents: Sequence[Any], names: Iterable[str] = ()):
+        """
+        Initialize AttributeStore
+        
+        Args:
+            agents: Agents exposing ``attributes``; store rows follow this order
+            names: Attributes to gather up front (others on first use)
+        """
+        self.agents = agents
+        self.attrs: Dict[str, np.ndarray] = {}
+        self.present: Dict[str, np.ndarray] = {}
+        for name in names:
+            self.column(name)
+    
+    def column(self, name: str) -> np.ndarray:
+        """Array of attribute ``name``, gathered on first use (NaN where absent)"""
+        arr = self.attrs.get(name)
+        if arr is None:
+            values = [a.attributes.get(name) for a in self.agents]
+            self.present[name] = np.array([v is not None for v in values], dtype=bool)
+            arr = self.attrs[name] = np.array(
+                [np.nan if v is None else v for v in values], dtype=np.float64
+            )
+        return arr
+    
+    def add_clipped(self, name: str, change: float, mask: np.ndarray, lo: float = 0, hi: float = 100) -> np.ndarray:
+        """
+        Add ``change`` to attribute ``name`` of the masked agents, clipped to [lo, hi]
+        
+        Returns:
+            Rows that were changed
+        """
+        arr = self.column(name)
+        mask = mask & self.present[name]
+        _apply_clamped_delta(arr, mask, float(change), float(lo), float(hi))
+        return np.flatnonzero(mask)
+    
+    def assign(self, name: str, value: float, mask: np.ndarray) -> np.ndarray:
+        """
+        Set attribute ``name`` of the masked agents, adding it where absent
+        
+        Returns:
+            Rows that were changed
+        """
+        arr = self.column(name)
+        arr[mask] = value
+        self.present[name] |= mask
+        return np.flatnonzero(mask)
+    
+    def discard(self, name: str):
+        """Drop the gathered column of ``name`` after its records changed elsewhere"""
+        self.attrs.pop(name, None)
+        self.present.pop(name, None)
+    
+    def write_back(self, name: str, rows: np.ndarray):
+        """
+        Store attribute ``name`` of the given rows in the agents' records
+        
+        Args:
+            name: Attribute to write
+            rows: Store rows to write (typically those changed by a policy)
+        """
+        agents = self.agents
+        for i, value in zip(rows.tolist(), self.attrs[name][rows].tolist()):
+            agents[i].attributes[name] = value
+
+
+class ResidentAttributeStore(AttributeStore):
+    """AttributeStore of the residents, with the literacy view used for targeting"""
+    
+    __slots__ = ()
+    
+    @property
+    def literacy(self) -> np.ndarray:
+        """Information literacy column, 60 where a resident has none"""
+        literacy = self.column('information_literacy')
+        return np.where(self.present['information_literacy'], literacy, 60.0)
+
+
+class EnterpriseAttributeStore(AttributeStore):
+    """AttributeStore of the enterprises, with their data collection strategies"""
+    
+    __slots__ = ('_strategy',)
+    
+    def __init__(self, agents: Sequence[Any], names: Iterable[str] = ()):
+        super().__init__(agents, names)
+        self._strategy = None
+    
+    @property
+    def strategy(self) -> np.ndarray:
+        """Data collection strategy of each enterprise ('compliant' by default)"""
+        if self._strategy is None:
+            self._strategy = np.array(
+                [e.attributes.get('data_collection_strategy', 'compliant') for e in self.agents], dtype=str
+            )
+        return self._strategy
+
 
 class PolicyEngine:
-    """Engine for applying policy interventions to the simulation"""
+    """
+    Engine for applying policy interventions to the simulation
+    
+    Agents passed to the engine must expose an ``attributes`` mapping.
+    """
     
     def __init__(self, policies_config: Dict[str, Any]):
         """
@@ -18,8 +203,26 @@ class PolicyEngine:
             policies_config: Policy configuration from JSON
         """
         self.policies = policies_config.copy()
+        # Applied policies with every change value parsed to a float once,
+        # on first application; read-only, shared by later applications
+        self._policies_compiled: Dict[str, Mapping[str, Any]] = {}
         self.applied_policies = []
-        self.policy_history = []
+        # Membership index of applied_policies, which keeps the order
+        self._applied_policies_set = set()
+        # Policy history as columns: name, target code (-1 when unhandled)
+        # and the apply() call (tick) it happened in
+        self._hist_names: List[str] = []
+        self._hist_target = array('b')
+        self._hist_tick = array('i')
+        self._tick = -1
+        # Policy target -> handler(policy_name, compiled_config, context)
+        self._dispatch = {
+            'resident': self._apply_resident_policy,
+            'government_enterprise': self._apply_government_enterprise_policy,
+            'environment': self._apply_environment_policy,
+            'government': self._apply_government_policy,
+            'enterprise': self._apply_enterprise_policy
+        }
     
     def apply(
         self,
@@ -32,6 +235,10 @@ class PolicyEngine:
         """
         Apply policy interventions to agents and environment
         
+        Policies are applied in the given order. The columnar attribute
+        stores are gathered at most once per call and shared by all
+        policies with the same target group.
+        
         Args:
             government: Government agent
             enterprises: List of enterprise agents
@@ -39,16 +246,21 @@ class PolicyEngine:
             environment: Environment instance
             policy_interventions: List of policy names to apply
         """
+        context = {
+            'government': government,
+            'enterprises': enterprises,
+            'residents': residents,
+            'environment': environment
+        }
+        self._tick += 1
         for policy_name in policy_interventions:
             if policy_name in self.policies:
                 policy_config = self.policies[policy_name]
-                self._apply_single_policy(
-                    policy_name, policy_config, 
-                    government, enterprises, residents, environment
-                )
+                self._apply_single_policy(policy_name, policy_config, context)
                 
                 # Track applied policies
-                if policy_name not in self.applied_policies:
+                if policy_name not in self._applied_policies_set:
+                    self._applied_policies_set.add(policy_name)
                     self.applied_policies.append(policy_name)
                     logger.info(f"Applied policy intervention: {policy_name}")
             else:
@@ -58,79 +270,75 @@ class PolicyEngine:
         self,
         policy_name: str,
         policy_config: Dict[str, Any],
-        government: Any,
-        enterprises: List[Any], 
-        residents: List[Any],
-        environment: Any
+        context: Dict[str, Any]
     ):
-        """Apply a single policy intervention"""
+        """
+        Apply a single policy intervention
+        
+        Args:
+            policy_name: Name of the policy
+            policy_config: Policy configuration from JSON
+            context: Agents and environment the handlers act on
+        """
         target = policy_config.get('target', '')
+        compiled = self._policies_compiled.get(policy_name)
+        if compiled is None:
+            compiled = self._policies_compiled[policy_name] = self._compile_policy(policy_config)
         
-        if target == 'resident':
-            self._apply_resident_policy(policy_name, policy_config, residents)
-        elif target == 'government_enterprise':
-            self._apply_government_enterprise_policy(
-                policy_name, policy_config, government, enterprises
-            )
-        elif target == 'environment':
-            self._apply_environment_policy(policy_name, policy_config, environment)
-        elif target == 'government':
-            self._apply_government_policy(policy_name, policy_config, government)
-        elif target == 'enterprise':
-            self._apply_enterprise_policy(policy_name, policy_config, enterprises)
-        
-        # Record policy application
-        self.policy_history.append({
-            'policy_name': policy_name,
-            'target': target,
-            'config': policy_config.copy()
-        })
+        handler = self._dispatch.get(target)
+        if handler is not None:
+            handler(policy_name, compiled, context)
+        
+        # Record policy application; the configuration is static, so only
+        # its name is stored and resolved when the history is read
+        self._hist_names.append(policy_name)
+        self._hist_target.append(_TARGET_CODES.get(target, -1))
+        self._hist_tick.append(self._tick)
     
     def _apply_resident_policy(
         self,
         policy_name: str,
         policy_config: Dict[str, Any],
-        residents: List[Any]
+        context: Dict[str, Any]
     ):
         """Apply policy targeting residents"""
+        residents = context['residents']
         attribute_changes = policy_config.get('attribute_change', {})
         behavior_changes = policy_config.get('behavior_change', {})
         
-        # Apply to all residents or subset based on policy
-        target_residents = residents
+        store = self._resident_store(context)
         
+        # Apply to all residents or subset based on policy
         # For digital literacy training, focus on lower literacy residents
         if policy_name == 'digital_literacy_training':
-            target_residents = [
-                r for r in residents 
-                if r.attributes.get('information_literacy', 60) < 70
-            ]
-        
-        for resident in target_residents:
-            # Apply attribute changes
-            for attr_name, change_str in attribute_changes.items():
-                if hasattr(resident, 'attributes') and attr_name in resident.attributes:
-                    change = self._parse_change_value(change_str)
-                    old_value = resident.attributes[attr_name]
-                    new_value = min(100, max(0, old_value + change))
-                    resident.attributes[attr_name] = new_value
-                    logger.debug(f"Updated {attr_name}: {old_value} -> {new_value}")
-            
-            # Apply behavior changes (modify probabilities for future decisions)
-            for behavior_name, change_str in behavior_changes.items():
-                change = self._parse_change_value(change_str)
-                if not hasattr(resident, 'behavior_modifiers'):
-                    resident.behavior_modifiers = {}
-                resident.behavior_modifiers[behavior_name] = change
+            mask = store.literacy < 70
+        else:
+            mask = np.ones(len(residents), dtype=bool)
+        
+        # Apply attribute changes
+        for attr_name, change in attribute_changes.items():
+            rows = store.add_clipped(attr_name, change, mask)
+            store.write_back(attr_name, rows)
+            logger.debug("Updated %s of %d residents by %s", attr_name, rows.size, change)
+        
+        # Apply behavior changes (modify probabilities for future decisions)
+        if behavior_changes:
+            for i in np.flatnonzero(mask).tolist():
+                resident = residents[i]
+                modifiers = getattr(resident, 'behavior_modifiers', None)
+                if modifiers is None:
+                    modifiers = resident.behavior_modifiers = {}
+                modifiers.update(behavior_changes)
     
     def _apply_government_enterprise_policy(
         self,
         policy_name: str,
         policy_config: Dict[str, Any],
-        government: Any,
-        enterprises: List[Any]
+        context: Dict[str, Any]
     ):
         """Apply policy affecting government-enterprise relationships"""
+        government = context['government']
+        enterprises = context['enterprises']
         rule_changes = policy_config.get('rule_change', {})
         
         # Store rule modifications for interaction engine
@@ -141,70 +349,110 @@ class PolicyEngine:
             if rule_name not in government.policy_modifiers:
                 government.policy_modifiers[rule_name] = {}
             
-            for param, change_str in rule_change.items():
-                change = self._parse_change_value(change_str)
+            for param, change in rule_change.items():
                 government.policy_modifiers[rule_name][param] = change
-                logger.debug(f"Modified rule {rule_name}.{param} by {change}")
+                logger.debug("Modified rule %s.%s by %s", rule_name, param, change)
         
         # Apply specific policy effects
         if policy_name == 'data_open_sharing':
-            # Increase data sharing willingness for enterprises
-            for enterprise in enterprises:
-                if hasattr(enterprise, 'attributes'):
-                    current_strategy = enterprise.attributes.get('data_collection_strategy', 'compliant')
-                    if current_strategy == 'compliant':
-                        enterprise.attributes['data_sharing_willingness'] = 0.8
+            # Increase data sharing willingness for compliant enterprises
+            store = self._enterprise_store(context)
+            rows = store.assign('data_sharing_willingness', 0.8, store.strategy == 'compliant')
+            store.write_back('data_sharing_willingness', rows)
         
         elif policy_name == 'algorithm_regulation':
-            # Increase compliance requirements
-            for enterprise in enterprises:
-                if hasattr(enterprise, 'attributes'):
-                    current_compliance = enterprise.attributes.get('data_usage_compliance', 90)
-                    enterprise.attributes['data_usage_compliance'] = min(100, current_compliance + 5)
+            # Increase compliance requirements; let NumPy infer the dtype so
+            # integer compliance levels stay integers
+            compliance = np.array([e.attributes.get('data_usage_compliance', 90) for e in enterprises])
+            for enterprise, value in zip(enterprises, np.minimum(100, compliance + 5).tolist()):
+                enterprise.attributes['data_usage_compliance'] = value
+            if 'enterprise_store' in context:
+                context['enterprise_store'].discard('data_usage_compliance')
     
     def _apply_environment_policy(
         self,
         policy_name: str,
         policy_config: Dict[str, Any],
-        environment: Any
+        context: Dict[str, Any]
     ):
         """Apply policy targeting environment"""
-        # Delegate to environment's policy application method
-        environment.apply_policy_intervention(policy_name, policy_config)
+        # Delegate to environment's policy application method, which parses
+        # its own (nested, per-area) change strings from the raw configuration
+        context['environment'].apply_policy_intervention(policy_name, self.policies[policy_name])
     
     def _apply_government_policy(
         self,
         policy_name: str,
         policy_config: Dict[str, Any],
-        government: Any
+        context: Dict[str, Any]
     ):
         """Apply policy targeting government specifically"""
         attribute_changes = policy_config.get('attribute_change', {})
+        attributes = context['government'].attributes
         
-        for attr_name, change_str in attribute_changes.items():
-            if hasattr(government, 'attributes') and attr_name in government.attributes:
-                change = self._parse_change_value(change_str)
-                old_value = government.attributes[attr_name]
+        for attr_name, change in attribute_changes.items():
+            if attr_name in attributes:
+                old_value = attributes[attr_name]
                 new_value = min(100, max(0, old_value + change))
-                government.attributes[attr_name] = new_value
-                logger.debug(f"Government {attr_name}: {old_value} -> {new_value}")
+                attributes[attr_name] = new_value
+                logger.debug("Government %s: %s -> %s", attr_name, old_value, new_value)
     
     def _apply_enterprise_policy(
         self,
         policy_name: str,
         policy_config: Dict[str, Any],
-        enterprises: List[Any]
+        context: Dict[str, Any]
     ):
         """Apply policy targeting enterprises specifically"""
+        enterprises = context['enterprises']
         attribute_changes = policy_config.get('attribute_change', {})
+        if not attribute_changes or not enterprises:
+            return
+        
+        store = self._enterprise_store(context)
+        everyone = np.ones(len(enterprises), dtype=bool)
+        for attr_name, change in attribute_changes.items():
+            store.write_back(attr_name, store.add_clipped(attr_name, change, everyone))
+    
+    def _resident_store(self, context: Dict[str, Any]) -> ResidentAttributeStore:
+        """Resident store of this apply() call, gathered on first use"""
+        store = context.get('resident_store')
+        if store is None:
+            store = context['resident_store'] = ResidentAttributeStore(context['residents'])
+        return store
+    
+    def _enterprise_store(self, context: Dict[str, Any]) -> EnterpriseAttributeStore:
+        """Enterprise store of this apply() call, gathered on first use"""
+        store = context.get('enterprise_store')
+        if store is None:
+            store = context['enterprise_store'] = EnterpriseAttributeStore(context['enterprises'])
+        return store
+    
+    def _compile_policy(self, policy_config: Dict[str, Any]) -> Mapping[str, Any]:
+        """
+        Read-only copy of a policy configuration with its change values parsed
+        
+        The compiled configuration and its change sections are frozen
+        (MappingProxyType), so handlers can share one reference per policy
+        without copying it.
         
-        for enterprise in enterprises:
-            for attr_name, change_str in attribute_changes.items():
-                if hasattr(enterprise, 'attributes') and attr_name in enterprise.attributes:
-                    change = self._parse_change_value(change_str)
-                    old_value = enterprise.attributes[attr_name]
-                    new_value = min(100, max(0, old_value + change))
-                    enterprise.attributes[attr_name] = new_value
+        Args:
+            policy_config: Policy configuration from JSON
+            
+        Returns:
+            Configuration whose _CHANGE_KEYS sections hold floats
+        """
+        compiled = dict(policy_config)
+        for key in _CHANGE_KEYS:
+            if key in compiled:
+                compiled[key] = self._compile_changes(compiled[key])
+        return MappingProxyType(compiled)
+    
+    def _compile_changes(self, changes: Any) -> Any:
+        """Parse change values, recursing into nested sections"""
+        if isinstance(changes, dict):
+            return MappingProxyType({name: self._compile_changes(value) for name, value in changes.items()})
+        return self._parse_change_value(changes)
     
     def _parse_change_value(self, change_str: str) -> float:
         """
@@ -229,17 +477,40 @@ class PolicyEngine:
             logger.warning(f"Could not parse change value: {change_str}")
             return 0.0
     
+    @property
+    def policy_history(self) -> List[Dict[str, Any]]:
+        """
+        Applied policies in order, rebuilt from the history columns
+        
+        Entries carry read-only views of the policy configurations rather
+        than copies.
+        """
+        policies = self.policies
+        history = []
+        for name, code, tick in zip(self._hist_names, self._hist_target, self._hist_tick):
+            config = policies[name]
+            history.append({
+                'policy_name': name,
+                'target': POLICY_TARGETS[code] if code >= 0 else config.get('target', ''),
+                'tick': tick,
+                'config': MappingProxyType(config)
+            })
+        return history
+    
     def get_policy_effects(self) -> Dict[str, Any]:
         """
         Get summary of applied policy effects
         
+        History entries carry read-only views of the policy configurations
+        rather than copies.
+        
         Returns:
             Dictionary summarizing policy effects
         """
         return {
             'applied_policies': self.applied_policies.copy(),
             'policy_count': len(self.applied_policies),
-            'policy_history': self.policy_history.copy()
+            'policy_history': self.policy_history
         }
     
     def simulate_policy_impact(
@@ -310,34 +581,16 @@ class PolicyEngine:
         Returns:
             List of recommended policy names
         """
-        recommendations = []
-        
-        # Analyze current metrics and recommend appropriate policies
         fairness_metrics = current_metrics.get('fairness', {})
-        efficiency_metrics = current_metrics.get('efficiency', {})
-        
-        # Recommend digital literacy training if digital divide is high
-        if (fairness_metrics.get('digital_divide_index', 0) > 0.3 or
-            'digital_equity' in target_improvements):
-            recommendations.append('digital_literacy_training')
-        
-        # Recommend infrastructure investment if service access gaps are high
-        if (fairness_metrics.get('service_access_gini', 0) > 0.4 or
-            'infrastructure' in target_improvements):
-            recommendations.append('inclusive_infrastructure')
-        
-        # Recommend data sharing if efficiency is low
-        if (efficiency_metrics.get('resource_utilization', 0) < 0.6 or
-            'efficiency' in target_improvements):
-            recommendations.append('data_open_sharing')
-        
-        # Recommend algorithm regulation if compliance issues
-        collaboration_metrics = current_metrics.get('collaboration', {})
-        if (collaboration_metrics.get('conflict_rate', 0) > 0.2 or
-            'regulation' in target_improvements):
-            recommendations.append('algorithm_regulation')
+        recommendations = _recommend(
+            fairness_metrics.get('digital_divide_index', 0),
+            fairness_metrics.get('service_access_gini', 0),
+            current_metrics.get('efficiency', {}).get('resource_utilization', 0),
+            current_metrics.get('collaboration', {}).get('conflict_rate', 0),
+            frozenset(target_improvements)
+        )
         
         # Remove already applied policies from recommendations
-        recommendations = [p for p in recommendations if p not in self.applied_policies]
+        recommendations = [p for p in recommendations if p not in self._applied_policies_set]
         
         return recommendations
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Semantic cache of LLM responses for near-identical agent prompts
+"""
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache of raw LLM responses
+    
+    Complements ResponseCache: a prompt that differs from an earlier one
+    only by small numeric drift reuses that response when the cosine
+    similarity of their embeddings exceeds ``threshold``. Entries are kept
+    per (agent type, city) so agents never receive responses written for
+    another role.
+    
+    sentence-transformers is required; faiss is used for the inner-product
+    search when installed, otherwise a NumPy flat index does the same job.
+    Both are imported lazily so the simulation does not pay for them unless
+    the cache is enabled.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.97,
+        maxsize: int = 10000,
+        model_name: str = 'all-MiniLM-L6-v2'
+    ):
+        """
+        Initialize SemanticCache
+        
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            maxsize: Maximum number of responses kept per (type, city);
+                the flat index stops growing once it is full
+            model_name: sentence-transformers embedding model
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "SemanticCache requires sentence-transformers "
+                "(pip install sentence-transformers)"
+            ) from e
+        
+        try:
+            import faiss
+        except ImportError:  # optional: fall back to a NumPy flat index
+            faiss = None
+        
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._model = SentenceTransformer(model_name)
+        self._dim = self._model.get_sentence_embedding_dimension()
+        self._faiss = faiss
+        # (agent type, city) -> (index, list of response contents)
+        self._namespaces = {}
+        self._lock = threading.Lock()
+    
+    def _new_index(self) -> Any:
+        if self._faiss is not None:
+            return self._faiss.IndexFlatIP(self._dim)
+        # Row buffer, doubled when full; rows past len(contents) are unused
+        return np.empty((min(64, self.maxsize), self._dim), dtype=np.float32)
+    
+    def _search(self, index: Any, count: int, embedding: np.ndarray) -> Tuple[float, int]:
+        """Best inner product and its row among the first ``count`` entries"""
+        if self._faiss is not None:
+            scores, rows = index.search(embedding[np.newaxis, :], 1)
+            return float(scores[0, 0]), int(rows[0, 0])
+        scores = index[:count] @ embedding
+        row = int(scores.argmax())
+        return float(scores[row]), row
+    
+    def lookup(self, agent_type: str, city: str, prompt: str) -> Tuple[np.ndarray, Optional[str]]:
+        """
+        Find the response of the most similar earlier prompt
+        
+        Args:
+            agent_type: Type of the querying agent
+            city: City of the querying agent
+            prompt: Formatted prompt text
+        
+        Returns:
+            Tuple of (prompt embedding for a later ``put``, cached content
+            or None on a miss)
+        """
+        embedding = self._model.encode(
+            prompt, normalize_embeddings=True, convert_to_numpy=True
+        ).astype(np.float32)
+        
+        with self._lock:
+            entry = self._namespaces.get((agent_type, city))
+            if entry is not None and entry[1]:
+                score, row = self._search(entry[0], len(entry[1]), embedding)
+                if score > self.threshold:
+                    self.hits += 1
+                    return embedding, entry[1][row]
+            self.misses += 1
+            return embedding, None
+    
+    def put(self, agent_type: str, city: str, embedding: np.ndarray, content: str):
+        """Add a response under the embedding of its prompt"""
+        with self._lock:
+            namespace = (agent_type, city)
+            entry = self._namespaces.get(namespace)
+            if entry is None:
+                entry = self._namespaces[namespace] = (self._new_index(), [])
+            index, contents = entry
+            if len(contents) >= self.maxsize:
+                return
+            
+            if self._faiss is not None:
+                index.add(embedding[np.newaxis, :])
+            else:
+                count = len(contents)
+                if count == len(index):
+                    grown = np.empty((min(2 * count, self.maxsize), self._dim), dtype=np.float32)
+                    grown[:count] = index
+                    index = grown
+                    self._namespaces[namespace] = (index, contents)
+                index[count] = embedding
+            contents.append(content)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss statistics"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': sum(len(contents) for _, contents in self._namespaces.values())
+            }
@@ -4,6 +4,7 @@ Test LLM response to see actual decision output
 """
 import os
 import json
+from main import load_config
 from simulation.agent import create_agents
 from simulation.environment import Environment
 
@@ -11,11 +12,8 @@ def test_single_agent_decision():
     """测试单个Agent的决策过程"""
     print("=== 测试LLM Agent决策过程 ===\n")
     
-    # 加载配置
-    with open('config/agents.json', 'r', encoding='utf-8') as f:
-        agents_config = json.load(f)
-    with open('config/environments.json', 'r', encoding='utf-8') as f:
-        env_config = json.load(f)
+    # 加载配置（按文件修改时间缓存，重复调用不会重新解析）
+    agents_config, env_config, _, _ = load_config()
     
     # 创建环境和Agent
     env = Environment(env_config['beijing'])
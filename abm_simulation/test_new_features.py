@@ -2,55 +2,93 @@
 # -*- coding: utf-8 -*-
 """
 测试新功能：可配置agent数量和实时保存
+
+两个城市配置作为参数化用例运行；
+安装pytest-xdist后可用 `pytest -n 2 test_new_features.py` 并行运行。
 """
+import os
+
+import pytest
+
+import main
+from main import calculate_metrics, run_simulation, save_results
+from run_offline_demo import mock_llm_response
+
+# (城市, 企业数量, 居民数量, 规模标签)
+SIMULATION_CASES = [
+    ('beijing', 2, 10, 'small'),
+    ('shenzhen', 3, 15, 'medium'),
+]
+
+
+@pytest.fixture(params=SIMULATION_CASES, ids=[f"{case[0]}-{case[3]}" for case in SIMULATION_CASES])
+def simulation_results(request):
+    """运行一个参数化配置的模拟"""
+    city, num_enterprises, num_residents, tag = request.param
+    results = run_simulation(
+        city=city,
+        num_rounds=3,
+        num_enterprises=num_enterprises,
+        num_residents=num_residents,
+        enable_logging=True,
+        log_file=f"test_{city}_{tag}"
+    )
+    return request.param, results
 
-from main import run_simulation, save_results
 
-def test_configurable_simulation():
+def test_configurable_simulation(simulation_results):
     """测试可配置的模拟功能"""
-    print("🚀 测试可配置agent数量和实时保存功能...")
-    
-    # 测试北京模拟 - 小规模配置
-    print("\n1. 测试北京模拟 (小规模配置)")
-    beijing_results = run_simulation(
+    (city, num_enterprises, num_residents, tag), results = simulation_results
+
+    print(f"✅ {city}模拟完成 ({tag})")
+    print(f"- 企业数量: {results['agent_history']['enterprises'].shape[1]}")
+    print(f"- 居民数量: {results['agent_history']['residents'].shape[1]}")
+
+    assert results['agent_history']['enterprises'].shape[1] == num_enterprises
+    assert results['agent_history']['residents'].shape[1] == num_residents
+
+    # 保存测试结果到 output/test_<city>_results.json
+    save_results(results, f'test_{city}_results.json')
+
+
+def test_streamed_records_metrics(monkeypatch):
+    """测试从NDJSON记录流重新计算的指标与内存中的结果一致"""
+    from simulation.agent import Agent
+
+    # 记录本次模拟创建的agent，重新计算指标时需要
+    created = {}
+    create_agents = main.create_agents
+
+    def capture_agents(*args, **kwargs):
+        created.update(create_agents(*args, **kwargs))
+        return created
+
+    monkeypatch.setattr(main, 'create_agents', capture_agents)
+    # 使用模拟决策，不调用LLM
+    monkeypatch.setattr(Agent, 'decide', Agent.decide)
+    monkeypatch.setattr(Agent, 'adecide', Agent.adecide)
+    mock_llm_response()
+
+    results = run_simulation(
         city='beijing',
-        num_rounds=3,
+        num_rounds=8,
         num_enterprises=2,
-        num_residents=10,
-        enable_logging=True,
-        log_file="test_beijing_small"
+        num_residents=6,
+        enable_logging=False,
+        stream_records=True,
+        seed=7
     )
-    
-    print("✅ 北京模拟完成")
-    print(f"- 企业数量: {len(beijing_results['raw_records'][0]['agents']['enterprises'])}")
-    print(f"- 居民数量: {len(beijing_results['raw_records'][0]['agents']['residents'])}")
-    
-    # 测试深圳模拟 - 中等规模配置
-    print("\n2. 测试深圳模拟 (中等规模配置)")
-    shenzhen_results = run_simulation(
-        city='shenzhen',
-        num_rounds=3,
-        num_enterprises=3,
-        num_residents=15,
-        enable_logging=True,
-        log_file="test_shenzhen_medium"
+    streamed = calculate_metrics(
+        results['raw_records'].filepath,
+        created['government'],
+        created['enterprises'],
+        created['residents']
     )
-    
-    print("✅ 深圳模拟完成")
-    print(f"- 企业数量: {len(shenzhen_results['raw_records'][0]['agents']['enterprises'])}")
-    print(f"- 居民数量: {len(shenzhen_results['raw_records'][0]['agents']['residents'])}")
-    
-    # 保存测试结果
-    save_results(beijing_results, 'test_beijing_results.json')
-    save_results(shenzhen_results, 'test_shenzhen_results.json')
-    
-    print("\n✅ 所有测试完成!")
-    print("📁 结果文件:")
-    print("  - output/test_beijing_results.json")
-    print("  - output/test_shenzhen_results.json")
-    print("📝 实时日志文件:")
-    print("  - output/test_beijing_small.json")
-    print("  - output/test_shenzhen_medium.json")
+    os.remove(results['raw_records'].filepath)
+
+    for category in ('efficiency', 'resilience', 'collaboration'):
+        assert streamed[category] == pytest.approx(results['metrics'][category]), category
+
 
 if __name__ == '__main__':
-    test_configurable_simulation()
+    raise SystemExit(pytest.main([__file__, '-s']))